@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/6.0/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -23,9 +24,11 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 SECRET_KEY = 'django-insecure-9ojyh9rp&pemm*h)$1jox$57%zrvhp824wmg#s9u1kd102o%d3'
 
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = True
+# On by default for local development; the Docker image sets DJANGO_DEBUG=0.
+# Static URLs are hashed (and served precompressed) only with DEBUG off.
+DEBUG = os.environ.get('DJANGO_DEBUG', '1') == '1'
 
-ALLOWED_HOSTS = []
+ALLOWED_HOSTS = [host for host in os.environ.get('DJANGO_ALLOWED_HOSTS', '').split(',') if host]
 
 
 # Application definition
@@ -44,6 +47,7 @@ AUTH_USER_MODEL = 'core.CustomUser'
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'core.serving.StaticFilesMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -75,14 +79,61 @@ WSGI_APPLICATION = 'betting_project.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/6.0/ref/settings/#databases
 
+# SQLite tuned for concurrent web and worker processes: WAL lets readers
+# run alongside the single writer, BEGIN IMMEDIATE takes the write lock up
+# front so a busy writer waits (up to "timeout" seconds) instead of failing
+# on a lock upgrade, and the pragmas trade fsyncs on every commit for
+# WAL checkpoints and keep hot pages in memory.
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'OPTIONS': {
+            'transaction_mode': 'IMMEDIATE',
+            'timeout': 5,
+            'init_command': (
+                'PRAGMA journal_mode=WAL;'
+                'PRAGMA synchronous=NORMAL;'
+                'PRAGMA cache_size=-20000;'
+                'PRAGMA mmap_size=134217728;'
+                'PRAGMA temp_store=MEMORY;'
+            ),
+        },
     }
 }
 
 
+# Cache
+# Contest data versions live here and invalidate the per-process caches
+# (odds, current contest), so every process that writes bets, pools or
+# contests must share it: the web server, the settlement worker and
+# management commands. REDIS_URL (set in docker-compose.yml) selects Redis;
+# without it the cache is per process, which only suits runserver and tests.
+
+REDIS_URL = os.environ.get('REDIS_URL')
+
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+# Per-process LRU of candidate coefficients, see core/odds.py.
+ODDS_CACHE_SIZE = 1024
+
+# Route the read-only pages to core/async_views.py. Only worth it under ASGI
+# (python manage.py bench_asgi compares both); off by default.
+ASYNC_READ_VIEWS = os.environ.get('ASYNC_READ_VIEWS') == '1'
+
+
 # Password validation
 # https://docs.djangoproject.com/en/6.0/ref/settings/#auth-password-validators
 
@@ -122,3 +173,14 @@ STATIC_ROOT = BASE_DIR / 'staticfiles'
 
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
+
+# collectstatic writes hashed names plus gzip copies to STATIC_ROOT, and
+# core.serving.StaticFilesMiddleware serves them without runserver.
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'core.serving.PrecompressedManifestStaticFilesStorage',
+    },
+}
@@ -17,11 +17,14 @@ Including another URLconf
 from django.conf import settings
 from django.conf.urls.static import static
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, include, re_path
+
+from core.serving import serve_media
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('', include('core.urls')),
+    re_path(rf"^{settings.MEDIA_URL.strip('/')}/candidates/(?P<path>.+)$", serve_media, name='candidate-media'),
 ]
 
 if settings.DEBUG:
@@ -53,6 +53,8 @@ class BetAdmin(admin.ModelAdmin):
     list_display = ("user", "candidate", "contest", "amount", "coefficient", "created_at")
     list_filter = ("created_at",)
     search_fields = ("user__email", "candidate__last_name")
+    # Skip the unfiltered COUNT over the whole table; contest audits use the staff report.
+    show_full_result_count = False
 
 
 @admin.register(Contest)
@@ -0,0 +1,133 @@
+from dataclasses import dataclass
+
+import numpy as np
+from django.db.models import F, IntegerField
+from django.db.models.functions import Cast, Round
+
+from .models import Bet, Candidate
+
+ANALYTICS_CHUNK_SIZE = 10_000
+STAKE_QUANTILES = (0.5, 0.9, 0.99)
+
+
+@dataclass
+class ContestColumns:
+    """A contest's bets as parallel arrays; ``candidate_index`` points into ``candidate_ids``."""
+
+    candidate_ids: "np.ndarray"
+    amount: "np.ndarray"
+    coefficient: "np.ndarray"
+    candidate_index: "np.ndarray"
+    timestamp: "np.ndarray"
+
+    def __len__(self):
+        return len(self.amount)
+
+
+def _cents(field):
+    # Integers from the database skip a Decimal per value; cents keep money exact.
+    return Cast(Round(F(field) * 100), IntegerField())
+
+
+def load_contest_columns(contest, chunk_size=ANALYTICS_CHUNK_SIZE):
+    """Read every bet of a contest into NumPy arrays in one pass over one query."""
+    rows = (
+        Bet.objects.filter(contest=contest)
+        .order_by("created_at", "id")
+        .values_list(_cents("amount"), _cents("coefficient"), "candidate_id", "created_at")
+    )
+    record = np.dtype([("amount", "i8"), ("coefficient", "i8"), ("candidate", "i8"), ("timestamp", "f8")])
+    table = np.fromiter(
+        (
+            (amount, coefficient, candidate_id, created_at.timestamp())
+            for amount, coefficient, candidate_id, created_at in rows.iterator(chunk_size=chunk_size)
+        ),
+        dtype=record,
+    )
+    candidate_ids, candidate_index = np.unique(table["candidate"], return_inverse=True)
+    return ContestColumns(
+        candidate_ids=candidate_ids,
+        amount=table["amount"] / 100,
+        coefficient=table["coefficient"] / 100,
+        candidate_index=candidate_index.reshape(-1),
+        timestamp=table["timestamp"],
+    )
+
+
+def candidate_totals(columns):
+    """Stake, bet count and liability (payout if she wins) per candidate, in ``candidate_ids`` order."""
+    size = len(columns.candidate_ids)
+    stake = np.bincount(columns.candidate_index, weights=columns.amount, minlength=size)
+    bets = np.bincount(columns.candidate_index, minlength=size)
+    liability = np.bincount(columns.candidate_index, weights=columns.amount * columns.coefficient, minlength=size)
+    return stake, bets, liability
+
+
+def house_exposure(columns):
+    """House result for each possible winner: total stake minus that candidate's liability."""
+    stake, _, liability = candidate_totals(columns)
+    return stake.sum() - liability
+
+
+def coefficient_drift(columns, buckets):
+    """Stake-weighted mean coefficient per candidate in ``buckets`` equal time slices.
+
+    Returns a ``(candidates, buckets)`` array with NaN where a candidate got
+    no bets in a slice.
+    """
+    size = len(columns.candidate_ids)
+    start, end = columns.timestamp.min(), columns.timestamp.max()
+    span = (end - start) or 1.0
+    bucket = np.minimum(((columns.timestamp - start) / span * buckets).astype(np.int64), buckets - 1)
+    cell = columns.candidate_index * buckets + bucket
+    weighted = np.bincount(cell, weights=columns.amount * columns.coefficient, minlength=size * buckets)
+    stake = np.bincount(cell, weights=columns.amount, minlength=size * buckets)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return (weighted / stake).reshape(size, buckets)
+
+
+def _first_and_last(drift):
+    filled = ~np.isnan(drift)
+    columns = np.arange(drift.shape[1])
+    first = np.where(filled, columns, drift.shape[1]).min(axis=1)
+    last = np.where(filled, columns, -1).max(axis=1)
+    rows = np.arange(drift.shape[0])
+    return drift[rows, np.minimum(first, drift.shape[1] - 1)], drift[rows, np.maximum(last, 0)]
+
+
+def contest_analytics(contest, buckets=10):
+    """Summary of a contest's betting computed on columnar arrays; ``None`` when it has no bets."""
+    columns = load_contest_columns(contest)
+    if not len(columns):
+        return None
+    stake, bets, liability = candidate_totals(columns)
+    exposure = stake.sum() - liability
+    opening, closing = _first_and_last(coefficient_drift(columns, buckets))
+    names = dict(
+        Candidate.objects.filter(pk__in=columns.candidate_ids.tolist()).values_list("pk", "last_name")
+    )
+    candidates = [
+        {
+            "candidate_id": int(candidate_id),
+            "name": names.get(int(candidate_id), ""),
+            "bets": int(bets[i]),
+            "stake": round(float(stake[i]), 2),
+            "liability": round(float(liability[i]), 2),
+            "house_result_if_wins": round(float(exposure[i]), 2),
+            "opening_coefficient": round(float(opening[i]), 2),
+            "closing_coefficient": round(float(closing[i]), 2),
+        }
+        for i, candidate_id in enumerate(columns.candidate_ids)
+    ]
+    candidates.sort(key=lambda row: row["house_result_if_wins"])
+    quantiles = np.quantile(columns.amount, STAKE_QUANTILES)
+    return {
+        "contest_id": contest.pk,
+        "bets": len(columns),
+        "total_stake": round(float(stake.sum()), 2),
+        "worst_case_house_result": round(float(exposure.min()), 2),
+        "stake_mean": round(float(columns.amount.mean()), 2),
+        "stake_quantiles": {f"p{round(q * 100)}": round(float(value), 2) for q, value in zip(STAKE_QUANTILES, quantiles)},
+        "stake_max": round(float(columns.amount.max()), 2),
+        "candidates": candidates,
+    }
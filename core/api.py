@@ -0,0 +1,99 @@
+from datetime import datetime, timezone as dt_timezone
+
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.core.paginator import Paginator
+from django.http import JsonResponse, StreamingHttpResponse
+from django.urls import reverse
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import condition, require_GET
+
+from .contests import contest_data_modified, contest_data_version, get_current_contest
+from .models import Candidate
+from .live import format_event, get_broadcaster, odds_events, read_odds_snapshot
+from .odds import calculate_coefficients
+
+API_PAGE_SIZE = 50
+COMPACT_JSON = {"separators": (",", ":"), "ensure_ascii": False}
+
+
+def contest_etag(request):
+    return contest_data_version()
+
+
+def contest_last_modified(request):
+    return datetime.fromtimestamp(contest_data_modified(), tz=dt_timezone.utc)
+
+
+def _serialize(candidate, coefficient):
+    return {
+        "id": candidate.pk,
+        "name": " ".join(filter(None, [candidate.last_name, candidate.first_name, candidate.patronymic])),
+        "course": candidate.course,
+        "group": candidate.group,
+        "photo": candidate.photo.url if candidate.photo else None,
+        "coefficient": coefficient,
+    }
+
+
+def _login_required_json(view):
+    def wrapper(request, *args, **kwargs):
+        if not request.user.is_authenticated:
+            return JsonResponse({"error": "Требуется вход."}, status=401)
+        return view(request, *args, **kwargs)
+
+    return wrapper
+
+
+@require_GET
+@_login_required_json
+@condition(etag_func=contest_etag, last_modified_func=contest_last_modified)
+def contest_candidates(request):
+    """Current contest with a page of its candidates and their coefficients.
+
+    Clients poll with ``If-None-Match`` / ``If-Modified-Since`` and get a
+    304 until a bet or a contest/candidate edit bumps a version.
+    """
+    current = get_current_contest()
+    contest = current.contest
+    candidates = Candidate.objects.filter(pk__in=current.participant_ids).order_by("id")
+    page = Paginator(candidates, API_PAGE_SIZE).get_page(request.GET.get("page"))
+    coefficients = calculate_coefficients([candidate.pk for candidate in page.object_list], contest)
+    url = reverse("api-contest")
+    data = {
+        "contest": contest
+        and {"id": contest.pk, "name": contest.name, "ends_at": contest.ends_at, "is_open": current.is_open},
+        "count": page.paginator.count,
+        "page": page.number,
+        "pages": page.paginator.num_pages,
+        "next": f"{url}?page={page.next_page_number()}" if page.has_next() else None,
+        "previous": f"{url}?page={page.previous_page_number()}" if page.has_previous() else None,
+        "candidates": [_serialize(candidate, coefficients[candidate.pk]) for candidate in page.object_list],
+    }
+    response = JsonResponse(data, json_dumps_params=COMPACT_JSON)
+    # Per-user session auth: keep copies private and revalidate every poll.
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+@require_GET
+async def live_odds(request):
+    """Server-sent events with the current contest's odds after every change.
+
+    Needs an ASGI server (uvicorn) to stream. A WSGI server would buffer an
+    endless response, so there one snapshot is sent and the browser's
+    EventSource reconnects after the ``retry`` delay, i.e. it polls.
+    """
+    user = await request.auser()
+    if not user.is_authenticated:
+        return JsonResponse({"error": "Требуется вход."}, status=401)
+    if isinstance(request, ASGIRequest):
+        events = odds_events(get_broadcaster())
+    else:
+        version, payload = await sync_to_async(read_odds_snapshot)()
+        events = ["retry: 3000\n\n", format_event(version, payload)]
+    response = StreamingHttpResponse(events, content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    # Stop nginx and similar proxies from buffering the stream.
+    response["X-Accel-Buffering"] = "no"
+    return response
@@ -0,0 +1,128 @@
+"""Async versions of the read-heavy views, routed in place of the sync ones by ASYNC_READ_VIEWS.
+
+They render the same templates with the same context as their counterparts
+in ``views``, but query through the async ORM so a request waiting on the
+database does not hold a worker thread for its whole duration.
+"""
+import asyncio
+import functools
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.decorators import login_required
+from django.core.paginator import Paginator
+from django.http import Http404
+from django.shortcuts import aget_object_or_404, render
+
+from . import views
+from .betslip import BET_LIMIT
+from .contests import contest_catalog_version, get_current_contest
+from .fragments import acached_fragment
+from .models import Bet, Candidate
+from .odds import get_coefficient
+from .pagination import akeyset_paginate
+
+
+def _login_required(view):
+    @functools.wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        # Templates read request.user; resolve it here so rendering never queries synchronously.
+        request.user = await request.auser()
+        return await view(request, *args, **kwargs)
+
+    return login_required(wrapper)
+
+
+async def _get_page(queryset, number, per_page):
+    """``Paginator.get_page`` with the COUNT and the requested rows queried concurrently."""
+    paginator = Paginator(queryset, per_page)
+    guess = max(int(number), 1) if str(number).isdigit() else 1
+    bottom = (guess - 1) * per_page
+
+    async def rows(bottom):
+        return [obj async for obj in queryset[bottom : bottom + per_page]]
+
+    paginator.count, object_list = await asyncio.gather(queryset.acount(), rows(bottom))
+    page = paginator.get_page(number)
+    # Out-of-range numbers fall back to another page: read that one instead.
+    page.object_list = object_list if page.number == guess else await rows((page.number - 1) * per_page)
+    return page
+
+
+@_login_required
+async def contest_view(request):
+    current = await sync_to_async(get_current_contest)()
+    contest = current.contest
+    search_query = views._search_query(request.GET.get("q"))
+    version = await sync_to_async(contest_catalog_version)()
+    page_number, count = await sync_to_async(views._grid_page)(contest, search_query, request.GET.get("page"), version)
+
+    async def render_grid():
+        # The full-text lookup checks the schema once per process with a plain cursor.
+        candidates_qs = await sync_to_async(views._contest_candidates)(contest, search_query)
+        page_obj = await _get_page(candidates_qs, page_number, views.CANDIDATES_PER_PAGE)
+        candidates = [views._serialize_candidate(c) for c in page_obj.object_list]
+        return views._render_candidate_grid(candidates, page_obj, search_query)
+
+    if search_query and not count:
+        candidate_grid = await render_grid()
+    else:
+        candidate_grid = await acached_fragment("candidate-grid", (version, page_number, search_query), render_grid)
+    return render(
+        request,
+        "MainPage.html",
+        {
+            "candidate_grid": candidate_grid,
+            "search_query": search_query,
+            "contest": contest,
+            "contest_is_open": current.is_open,
+        },
+    )
+
+
+@_login_required
+async def bet_view(request):
+    cursor = request.GET.get("cursor")
+
+    async def render_table():
+        bets_qs = Bet.objects.filter(user=request.user).select_related("candidate", "contest")
+        page_obj = await akeyset_paginate(bets_qs, cursor, 10)
+        return views._render_bet_table([views._serialize_bet(bet) for bet in page_obj.object_list], page_obj)
+
+    parts = await sync_to_async(views._bet_table_parts)(request.user.pk, cursor)
+    bet_table = await acached_fragment("bet-table", parts, render_table)
+    return render(request, "BetPage.html", {"bet_table": bet_table})
+
+
+@_login_required
+async def candidate_list(request):
+    candidates_qs = Candidate.objects.all().order_by("id")
+    page_obj = await _get_page(candidates_qs, request.GET.get("page") or 1, 12)
+    return render(request, "candidates/list.html", {"page_obj": page_obj})
+
+
+@_login_required
+async def candidate_detail(request, pk):
+    if request.method not in ("GET", "HEAD"):
+        # Placing a bet is one write transaction; it stays in the sync view.
+        return await sync_to_async(views.candidate_detail)(request, pk)
+    current, candidate = await asyncio.gather(
+        sync_to_async(get_current_contest)(), aget_object_or_404(Candidate, pk=pk)
+    )
+    contest = current.contest
+    if contest and pk not in current.participant_ids:
+        raise Http404
+    coefficient = await sync_to_async(get_coefficient)(candidate, contest)
+    return render(
+        request,
+        "candidates/detail.html",
+        {
+            "candidate": candidate,
+            "error": None,
+            "message": None,
+            "amount_value": "",
+            "coefficient": coefficient,
+            "bet_limit": BET_LIMIT,
+            "contest": contest,
+            "contest_is_open": current.is_open,
+        },
+    )
@@ -0,0 +1,331 @@
+import asyncio
+import math
+import random
+import threading
+import time
+import tracemalloc
+from collections import defaultdict
+from datetime import timedelta
+from decimal import Decimal
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.handlers.asgi import ASGIHandler
+from django.db import connection, connections
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from .betslip import place_slip
+from .ledger import open_accounts
+from .live import get_broadcaster
+from .models import Bet, Candidate, Contest
+from .pools import rebuild_pools
+from .stats import reconcile_user_stats
+
+BENCH_PASSWORD = "bench-pass-1234"
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, math.ceil(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+class RouteStats:
+    """Thread-safe latency and query-count samples per route."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._samples = defaultdict(list)
+        self._errors = defaultdict(int)
+
+    def record(self, route, seconds, queries, ok=True):
+        with self._lock:
+            self._samples[route].append((seconds, queries))
+            if not ok:
+                self._errors[route] += 1
+
+    def summary(self, wall_time):
+        routes = {}
+        for route, samples in sorted(self._samples.items()):
+            latencies = sorted(seconds for seconds, _ in samples)
+            routes[route] = {
+                "requests": len(samples),
+                "errors": self._errors[route],
+                "throughput_rps": round(len(samples) / wall_time, 2) if wall_time else 0.0,
+                "p50_ms": round(percentile(latencies, 0.50) * 1000, 2),
+                "p95_ms": round(percentile(latencies, 0.95) * 1000, 2),
+                "p99_ms": round(percentile(latencies, 0.99) * 1000, 2),
+                "queries_per_request": round(sum(queries for _, queries in samples) / len(samples), 2),
+            }
+        return routes
+
+
+def seed_bench_data(users, candidates, bets, seed=0):
+    """Create an open contest with bench users, candidates and historical bets."""
+    rng = random.Random(seed)
+    User = get_user_model()
+    password = make_password(BENCH_PASSWORD)
+    user_objs = User.objects.bulk_create(
+        [
+            User(
+                email=f"bench-{i}@example.com",
+                username=f"bench-{i}@example.com",
+                first_name="Bench",
+                last_name=f"User {i}",
+                password=password,
+                balance=Decimal("1000000"),
+            )
+            for i in range(users)
+        ],
+        batch_size=500,
+    )
+    open_accounts(user_objs)
+    candidate_objs = Candidate.objects.bulk_create(
+        [
+            Candidate(first_name=f"Участница {i}", last_name=f"Тестовая {i}", course=1 + i % 4, group=f"БН-{i % 10}")
+            for i in range(candidates)
+        ],
+        batch_size=500,
+    )
+    contest = Contest.objects.create(name="Бенчмарк", ends_at=timezone.now() + timedelta(days=7))
+    contest.participants.add(*candidate_objs)
+    Bet.objects.bulk_create(
+        (
+            Bet(
+                user=rng.choice(user_objs),
+                candidate=rng.choice(candidate_objs),
+                contest=contest,
+                amount=Decimal(rng.randint(1, 100)),
+                coefficient=Decimal("1.50"),
+            )
+            for _ in range(bets)
+        ),
+        batch_size=1000,
+    )
+    rebuild_pools([contest.pk])
+    reconcile_user_stats([user.pk for user in user_objs], fix=True)
+    return user_objs, candidate_objs, contest
+
+
+def _timed(stats, route, call):
+    with CaptureQueriesContext(connection) as queries:
+        started = time.perf_counter()
+        response = call()
+        elapsed = time.perf_counter() - started
+    stats.record(route, elapsed, len(queries.captured_queries), response.status_code < 400)
+
+
+def simulate_user(stats, email, candidate_ids, iterations, seed, scenario="mixed"):
+    """Drive one user through login, browsing, betting and history pages.
+
+    The ``bets`` scenario only places bets, to measure write throughput.
+    """
+    rng = random.Random(seed)
+    client = Client(HTTP_HOST="localhost", raise_request_exception=False)
+    try:
+        _timed(stats, "login", lambda: client.post(reverse("login"), {"email": email, "password": BENCH_PASSWORD}))
+        for _ in range(iterations):
+            if scenario == "bets":
+                detail_url = reverse("candidate-detail", args=[rng.choice(candidate_ids)])
+                _timed(stats, "bet", lambda: client.post(detail_url, {"amount": str(rng.randint(1, 50))}))
+                continue
+            candidate_id = rng.choice(candidate_ids)
+            detail_url = reverse("candidate-detail", args=[candidate_id])
+            _timed(stats, "contest", lambda: client.get(reverse("contest")))
+            _timed(stats, "contest_search", lambda: client.get(reverse("contest"), {"q": "тест"}))
+            _timed(stats, "candidate_detail", lambda: client.get(detail_url))
+            _timed(stats, "bet", lambda: client.post(detail_url, {"amount": str(rng.randint(1, 50))}))
+            _timed(stats, "bet_history", lambda: client.get(reverse("bet")))
+            _timed(stats, "profile", lambda: client.get(reverse("profile")))
+    finally:
+        connections.close_all()
+
+
+def run_load(users, candidate_ids, concurrency, iterations, seed=0, scenario="mixed"):
+    """Run ``users`` simulated users on ``concurrency`` threads; return ``(stats, wall_time)``."""
+    stats = RouteStats()
+    queue = list(enumerate(users))
+    lock = threading.Lock()
+
+    def worker():
+        while True:
+            with lock:
+                if not queue:
+                    return
+                index, user = queue.pop()
+            simulate_user(stats, user.email, candidate_ids, iterations, seed + index, scenario)
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return stats, time.perf_counter() - started
+
+
+def _http_scope(path, cookie, query_string=""):
+    return {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": query_string.encode(),
+        "root_path": "",
+        "headers": [(b"host", b"localhost"), (b"cookie", cookie.encode())],
+        "client": ("127.0.0.1", 0),
+        "server": ("localhost", 80),
+    }
+
+
+class _SseSubscriber:
+    """One EventSource-like client talking to the ASGI app in-process."""
+
+    def __init__(self, app, path, cookie):
+        self.app = app
+        self.path = path
+        self.cookie = cookie
+        self.events = []
+        self.received = asyncio.Event()
+        self.disconnected = asyncio.Event()
+        self._requested = False
+
+    async def _receive(self):
+        if not self._requested:
+            self._requested = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await self.disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    async def _send(self, message):
+        if message["type"] == "http.response.body" and message.get("body", b"").startswith(b"event: odds"):
+            self.events.append(time.perf_counter())
+            self.received.set()
+
+    async def run(self):
+        await self.app(_http_scope(self.path, self.cookie), self._receive, self._send)
+
+
+def _first_event_after(subscriber, since):
+    return min(received for received in subscriber.events if received >= since)
+
+
+async def _wait_all(subscribers, since, timeout):
+    """Wait until every subscriber got a snapshot at or after ``since``; return their delays."""
+    deadline = time.perf_counter() + timeout
+    while any(not subscriber.events or subscriber.events[-1] < since for subscriber in subscribers):
+        if time.perf_counter() > deadline:
+            raise TimeoutError(f"Not every subscriber got a snapshot within {timeout}s")
+        await asyncio.sleep(0.005)
+    return [_first_event_after(subscriber, since) - since for subscriber in subscribers]
+
+
+async def run_live_load(cookie, contest, candidate_ids, user_id, subscribers, changes, poll_interval, seed=0):
+    """Connect ``subscribers`` SSE clients to one ASGI app and time odds fan-out.
+
+    Returns a dict with connect time, per-change delivery latencies (from
+    the committed bet to each client receiving the snapshot), memory per
+    subscriber and how often the shared loop read the odds.
+    """
+    rng = random.Random(seed)
+    app = ASGIHandler()
+    broadcaster = get_broadcaster()
+    broadcaster.poll_interval = poll_interval
+    path = reverse("api-contest-live")
+    clients = [_SseSubscriber(app, path, cookie) for _ in range(subscribers)]
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    started = time.perf_counter()
+    tasks = [asyncio.create_task(client.run()) for client in clients]
+    await _wait_all(clients, started, timeout=60 + subscribers / 100)
+    connect_time = time.perf_counter() - started
+    memory = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    latencies = []
+    for change in range(changes):
+        amount = Decimal(rng.randint(1, 50))
+        await sync_to_async(place_slip)(user_id, contest, {rng.choice(candidate_ids): amount})
+        committed = time.perf_counter()
+        latencies += await _wait_all(clients, committed, timeout=30 + poll_interval * 2)
+    for client in clients:
+        client.disconnected.set()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    latencies.sort()
+    return {
+        "subscribers": subscribers,
+        "connect_s": round(connect_time, 3),
+        "memory_per_subscriber_kb": round(memory / subscribers / 1024, 1),
+        "changes": changes,
+        "fanout_p50_ms": round(percentile(latencies, 0.50) * 1000, 1),
+        "fanout_p95_ms": round(percentile(latencies, 0.95) * 1000, 1),
+        "fanout_p99_ms": round(percentile(latencies, 0.99) * 1000, 1),
+        "odds_reads": broadcaster.published,
+        "skipped_snapshots": broadcaster.skipped,
+    }
+
+
+async def _asgi_get(app, path, cookie, query_string=""):
+    """One GET through the ASGI app; return the status code."""
+    status = None
+    requested = False
+    finished = asyncio.Event()
+
+    async def receive():
+        nonlocal requested
+        if not requested:
+            requested = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await finished.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+        elif not message.get("more_body"):
+            finished.set()
+
+    await app(_http_scope(path, cookie, query_string), receive, send)
+    return status
+
+
+def asgi_read_routes(candidate_ids):
+    """``(route, path, query_string)`` for the pages served by the async read views."""
+    return [
+        ("contest", reverse("contest"), ""),
+        ("contest_page_2", reverse("contest"), "page=2"),
+        ("bet_history", reverse("bet"), ""),
+        ("candidate_list", reverse("candidate-list"), ""),
+    ] + [("candidate_detail", reverse("candidate-detail", args=[pk]), "") for pk in candidate_ids[:5]]
+
+
+async def run_asgi_reads(cookie, routes, concurrency, requests):
+    """Issue ``requests`` GETs over ``routes`` from ``concurrency`` tasks on one ASGI app.
+
+    Returns ``(stats, wall_time)``. The app serves whichever views the URLconf
+    routes to, so comparing sync and async views takes one run per setting
+    of ``ASYNC_READ_VIEWS``.
+    """
+    app = ASGIHandler()
+    stats = RouteStats()
+    remaining = iter(range(requests))
+
+    async def worker():
+        for index in remaining:
+            route, path, query_string = routes[index % len(routes)]
+            started = time.perf_counter()
+            status = await _asgi_get(app, path, cookie, query_string)
+            stats.record(route, time.perf_counter() - started, 0, ok=status == 200)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return stats, time.perf_counter() - started
@@ -0,0 +1,110 @@
+from decimal import Decimal, InvalidOperation
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .db import retry_on_lock
+from .ledger import record_bets
+from .models import Bet, Contest
+from .odds import calculate_coefficients
+from .pools import add_stakes_to_pools, check_exposure
+from .stats import add_bets
+from .versions import bump_user_bets_version
+
+BET_LIMIT = Decimal("1000")
+
+
+class BettingClosed(Exception):
+    """Raised inside the placement transaction when the contest has ended or a leg's candidate left it.
+
+    The message is shown to the user.
+    """
+
+
+def parse_slip(values, bet_limit=BET_LIMIT):
+    """Validate the amounts of a bet slip, a mapping of candidate id to the raw input.
+
+    Returns ``(legs, errors)``: the filled-in amounts by candidate id and an
+    error message per invalid leg. Empty inputs are skipped; a slip with any
+    error must be rejected as a whole.
+    """
+    legs, errors = {}, {}
+    for candidate_id, raw in values.items():
+        raw = (raw or "").strip()
+        if not raw:
+            continue
+        try:
+            amount = Decimal(raw)
+        except (InvalidOperation, ValueError):
+            errors[candidate_id] = "Неверный формат суммы."
+            continue
+        if not amount.is_finite():
+            errors[candidate_id] = "Неверный формат суммы."
+        elif amount <= 0:
+            errors[candidate_id] = "Сумма должна быть больше 0."
+        elif amount > bet_limit:
+            errors[candidate_id] = f"Сумма превышает допустимый лимит ({bet_limit} BYN)."
+        else:
+            legs[candidate_id] = amount
+    return legs, errors
+
+
+@retry_on_lock
+def place_slip(user_pk, contest, legs):
+    """Place every leg of a slip, a mapping of candidate id to amount, or none of them.
+
+    The whole stake is debited with one conditional UPDATE, odds come from
+    one pool query and the bets are inserted with one ``bulk_create``, all
+    in a single transaction. Returns the bets, or ``None`` when the balance
+    does not cover the slip; raises ``BettingClosed`` when the contest has
+    ended or a leg's candidate is no longer in it, and ``BettingSuspended``
+    when the slip would take a candidate past the contest's exposure limit.
+
+    ``contest`` usually comes from the cached current contest, which another
+    process may have changed since, so it is checked again in the database.
+    """
+    total = sum(legs.values(), Decimal("0"))
+    with transaction.atomic():
+        debited = (
+            get_user_model()
+            .objects.filter(pk=user_pk, balance__gte=total)
+            .update(balance=F("balance") - total)
+        )
+        if not debited:
+            return None
+        # After the debit the transaction holds the write lock, so the contest
+        # cannot close between this check and the insert.
+        exposure_limit = _check_open(contest, legs)
+        coefficients = calculate_coefficients(list(legs), contest)
+        bets = Bet.objects.bulk_create(
+            [
+                Bet(
+                    user_id=user_pk,
+                    candidate_id=candidate_id,
+                    contest=contest,
+                    amount=amount,
+                    coefficient=coefficients[candidate_id],
+                )
+                for candidate_id, amount in legs.items()
+            ]
+        )
+        liabilities = {candidate_id: amount * coefficients[candidate_id] for candidate_id, amount in legs.items()}
+        add_stakes_to_pools(contest, legs, liabilities)
+        check_exposure(contest, legs, exposure_limit)
+        add_bets(user_pk, bets)
+        record_bets(bets)
+        bump_user_bets_version(user_pk)
+    return bets
+
+
+def _check_open(contest, legs):
+    """Return the contest's current exposure limit, or raise ``BettingClosed``."""
+    limits = list(Contest.objects.filter(pk=contest.pk, ends_at__gt=timezone.now()).values_list("exposure_limit", flat=True))
+    if not limits:
+        raise BettingClosed("Приём ставок завершён.")
+    participants = Contest.participants.through.objects.filter(contest_id=contest.pk, candidate_id__in=list(legs))
+    if participants.count() != len(legs):
+        raise BettingClosed("Участница больше не участвует в конкурсе, ставки не оформлены.")
+    return limits[0]
@@ -0,0 +1,86 @@
+import threading
+from dataclasses import dataclass
+
+from django.core.cache import cache
+from django.utils import timezone
+
+from .models import Contest
+from .versions import bump_version_on_commit, contest_version_key, get_version, get_version_modified
+
+CURRENT_CONTEST_KEY = "current-contest"
+CURRENT_CONTEST_TIMEOUT = 60 * 60
+
+
+@dataclass(frozen=True)
+class CurrentContest:
+    contest: Contest | None
+    participant_ids: frozenset
+
+    @property
+    def is_open(self):
+        return bool(self.contest and self.contest.ends_at > timezone.now())
+
+
+_local_lock = threading.Lock()
+_local_snapshot = None
+
+
+def _load_current_contest():
+    contest = Contest.objects.order_by("-ends_at").first()
+    if not contest:
+        return CurrentContest(None, frozenset())
+    return CurrentContest(contest, frozenset(contest.participants.values_list("id", flat=True)))
+
+
+def get_current_contest():
+    """Return the latest contest with its participant ids.
+
+    The snapshot is kept in process and in the shared cache under the
+    current version, so a request normally costs one cache lookup.
+    """
+    global _local_snapshot
+    version = get_version(CURRENT_CONTEST_KEY)
+    snapshot = _local_snapshot
+    if snapshot and snapshot[0] == version:
+        return snapshot[1]
+    data_key = f"{CURRENT_CONTEST_KEY}:{version}"
+    current = cache.get(data_key)
+    if current is None:
+        current = _load_current_contest()
+        cache.set(data_key, current, CURRENT_CONTEST_TIMEOUT)
+    with _local_lock:
+        _local_snapshot = (version, current)
+    return current
+
+
+def invalidate_current_contest():
+    bump_version_on_commit(CURRENT_CONTEST_KEY)
+
+
+def contest_catalog_version():
+    """Version of contests, participants and candidate fields; bets do not change it."""
+    return get_version(CURRENT_CONTEST_KEY)
+
+
+def _data_version_keys():
+    contest = get_current_contest().contest
+    return [CURRENT_CONTEST_KEY] + ([contest_version_key(contest.pk)] if contest else [])
+
+
+def contest_data_version():
+    """Version of everything shown about the current contest: its data, participants, pools and whether it is open.
+
+    Read from the cache only, so it is cheap enough to check on every poll.
+    Closing by time bumps no counter, so the open state is part of the version.
+    """
+    versions = "-".join(str(get_version(key)) for key in _data_version_keys())
+    return f"{versions}-{'open' if get_current_contest().is_open else 'closed'}"
+
+
+def contest_data_modified():
+    """Unix time of the last change covered by ``contest_data_version``, including the contest ending."""
+    modified = max(get_version_modified(key) for key in _data_version_keys())
+    current = get_current_contest()
+    if current.contest and not current.is_open:
+        modified = max(modified, current.contest.ends_at.timestamp())
+    return modified
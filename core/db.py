@@ -0,0 +1,36 @@
+import functools
+import random
+import time
+
+from django.db import OperationalError, connection
+
+LOCK_RETRY_ATTEMPTS = 5
+LOCK_RETRY_BASE_DELAY = 0.05
+
+
+def is_lock_error(exc):
+    """True for SQLite's "database is locked" / "database table is locked" errors."""
+    return isinstance(exc, OperationalError) and "locked" in str(exc)
+
+
+def retry_on_lock(func=None, *, attempts=LOCK_RETRY_ATTEMPTS, base_delay=LOCK_RETRY_BASE_DELAY):
+    """Rerun a write transaction that failed on a SQLite lock, with jittered exponential backoff.
+
+    The wrapped function must open its own ``transaction.atomic()`` so a
+    retry starts from a clean transaction. Inside an outer atomic block the
+    error is re-raised at once: only the outermost transaction can retry.
+    """
+    if func is None:
+        return functools.partial(retry_on_lock, attempts=attempts, base_delay=base_delay)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        for attempt in range(1, attempts + 1):
+            try:
+                return func(*args, **kwargs)
+            except OperationalError as exc:
+                if not is_lock_error(exc) or attempt == attempts or connection.in_atomic_block:
+                    raise
+            time.sleep(base_delay * 2 ** (attempt - 1) * random.uniform(0.5, 1.5))
+
+    return wrapper
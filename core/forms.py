@@ -129,12 +129,16 @@ class AdminUserForm(forms.ModelForm):
 class ContestForm(forms.ModelForm):
     class Meta:
         model = Contest
-        fields = ["name", "ends_at", "participants", "winner"]
+        fields = ["name", "ends_at", "participants", "winner", "exposure_limit"]
         labels = {
             "name": "Название",
             "ends_at": "Окончание",
             "participants": "Участницы",
             "winner": "Победитель",
+            "exposure_limit": "Лимит риска, BYN",
+        }
+        help_texts = {
+            "exposure_limit": "Ставки на участницу приостанавливаются, когда выплата при её победе за вычетом пула конкурса достигает лимита. Пусто — без лимита.",
         }
         widgets = {
             "ends_at": forms.DateTimeInput(format="%Y-%m-%dT%H:%M", attrs={"type": "datetime-local"}),
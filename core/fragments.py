@@ -0,0 +1,81 @@
+import hashlib
+
+from django.core.cache import cache
+from django.utils.safestring import mark_safe
+
+FRAGMENT_TIMEOUT = 60 * 60
+FRAGMENT_NAMES = ("candidate-grid", "bet-table")
+
+
+def fragment_key(name, *parts):
+    """Cache key of a rendered fragment; ``parts`` are the versions and request values it depends on."""
+    digest = hashlib.md5(repr(parts).encode(), usedforsecurity=False).hexdigest()
+    return f"fragment:{name}:{digest}"
+
+
+def _stats_key(name, outcome):
+    return f"fragment-stats:{name}:{outcome}"
+
+
+def _count(name, outcome):
+    # Counted in the shared cache so fragment_stats sees every worker.
+    key = _stats_key(name, outcome)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, 0, timeout=None)
+        cache.incr(key)
+
+
+async def _acount(name, outcome):
+    key = _stats_key(name, outcome)
+    try:
+        await cache.aincr(key)
+    except ValueError:
+        await cache.aadd(key, 0, timeout=None)
+        await cache.aincr(key)
+
+
+def cached_fragment(name, parts, render):
+    """Return the HTML of a fragment, calling ``render()`` only on a miss.
+
+    Entries are never invalidated directly: bumping a version that is part
+    of ``parts`` makes readers look up a new key, and the old one expires.
+    """
+    key = fragment_key(name, *parts)
+    html = cache.get(key)
+    if html is None:
+        _count(name, "misses")
+        html = render()
+        cache.set(key, html, FRAGMENT_TIMEOUT)
+    else:
+        _count(name, "hits")
+    return mark_safe(html)
+
+
+async def acached_fragment(name, parts, render):
+    """``cached_fragment`` for async views; ``render`` is a coroutine function."""
+    key = fragment_key(name, *parts)
+    html = await cache.aget(key)
+    if html is None:
+        await _acount(name, "misses")
+        html = await render()
+        await cache.aset(key, html, FRAGMENT_TIMEOUT)
+    else:
+        await _acount(name, "hits")
+    return mark_safe(html)
+
+
+def fragment_stats():
+    """``{name: {"hits", "misses", "hit_ratio"}}`` across all workers since the last reset."""
+    stats = {}
+    for name in FRAGMENT_NAMES:
+        hits = cache.get(_stats_key(name, "hits")) or 0
+        misses = cache.get(_stats_key(name, "misses")) or 0
+        total = hits + misses
+        stats[name] = {"hits": hits, "misses": misses, "hit_ratio": round(hits / total, 3) if total else 0.0}
+    return stats
+
+
+def reset_fragment_stats():
+    cache.delete_many([_stats_key(name, outcome) for name in FRAGMENT_NAMES for outcome in ("hits", "misses")])
@@ -0,0 +1,85 @@
+import logging
+from io import BytesIO
+from pathlib import PurePosixPath
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps
+
+THUMBNAIL_WIDTHS = (320, 640, 960)
+THUMBNAIL_FORMATS = {
+    "webp": ("WEBP", {"quality": 80, "method": 4}),
+    "jpg": ("JPEG", {"quality": 82, "optimize": True, "progressive": True}),
+}
+
+logger = logging.getLogger(__name__)
+
+
+def variant_name(photo_name, width, ext):
+    path = PurePosixPath(photo_name)
+    return str(path.parent / "thumbs" / f"{path.stem}-{width}.{ext}")
+
+
+def render_variants(photo_name, storage=default_storage):
+    """Write resized WebP and JPEG copies of a photo.
+
+    Returns ``(original_width, widths)`` with the widths that were produced.
+    Only widths narrower than the original are rendered, so small photos
+    get no variants and are served as they are.
+    """
+    with storage.open(photo_name, "rb") as source:
+        image = ImageOps.exif_transpose(Image.open(source))
+        image = image.convert("RGB")
+    widths = [width for width in THUMBNAIL_WIDTHS if width < image.width]
+    for width in widths:
+        height = round(image.height * width / image.width)
+        resized = image.resize((width, height), Image.Resampling.LANCZOS)
+        for ext, (image_format, save_options) in THUMBNAIL_FORMATS.items():
+            buffer = BytesIO()
+            resized.save(buffer, image_format, **save_options)
+            name = variant_name(photo_name, width, ext)
+            if storage.exists(name):
+                storage.delete(name)
+            storage.save(name, ContentFile(buffer.getvalue()))
+    return image.width, widths
+
+
+def delete_variants(photo_name, widths, storage=default_storage):
+    for width in widths:
+        for ext in THUMBNAIL_FORMATS:
+            storage.delete(variant_name(photo_name, width, ext))
+
+
+def srcset(photo_name, widths, ext, storage=default_storage):
+    return ", ".join(f"{storage.url(variant_name(photo_name, width, ext))} {width}w" for width in widths)
+
+
+def photo_variants_for(photo_name, storage=default_storage):
+    """Render variants of a photo and describe them for ``Candidate.photo_variants``."""
+    original_width, widths = render_variants(photo_name, storage)
+    return {"source": photo_name, "width": original_width, "widths": widths}
+
+
+def update_photo_variants(candidate, force=False):
+    """Regenerate a candidate's variants when its photo changed since they were made.
+
+    Runs on every candidate save, so a missing or unreadable photo is logged
+    and leaves ``photo_variants`` empty instead of failing the save; the page
+    then serves the original and ``generate_thumbnails`` retries it.
+    The row is written with ``update()``, so the caller invalidates the
+    contest cache afterwards.
+    """
+    previous = candidate.photo_variants or {}
+    current_name = candidate.photo.name if candidate.photo else ""
+    if (previous.get("source") or "") == current_name and not force:
+        return False
+    storage = candidate.photo.storage
+    if previous.get("source") and previous["source"] != current_name:
+        delete_variants(previous["source"], previous.get("widths", []), storage)
+    try:
+        candidate.photo_variants = photo_variants_for(current_name, storage) if current_name else {}
+    except (OSError, ValueError, Image.DecompressionBombError):
+        logger.warning("Could not render variants of %s", current_name, exc_info=True)
+        candidate.photo_variants = {}
+    type(candidate).objects.filter(pk=candidate.pk).update(photo_variants=candidate.photo_variants)
+    return True
@@ -0,0 +1,94 @@
+import os
+import socket
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .db import retry_on_lock
+from .models import SettlementJob
+from .settlement import SETTLEMENT_CHUNK_SIZE, is_settleable, settle_chunk
+
+ACTIVE_STATUSES = (SettlementJob.Status.PENDING, SettlementJob.Status.RUNNING)
+LEASE_TIMEOUT = timedelta(minutes=5)
+RETRY_BASE_DELAY = timedelta(seconds=10)
+MAX_ATTEMPTS = 5
+
+
+def worker_name():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def enqueue_settlement(contest):
+    """Queue settlement of a finished contest unless a job is already active."""
+    if not is_settleable(contest):
+        return None
+    with transaction.atomic():
+        job = SettlementJob.objects.filter(contest=contest, status__in=ACTIVE_STATUSES).first()
+        if job:
+            return job
+        return SettlementJob.objects.create(contest=contest)
+
+
+def claim_job(worker, lease_timeout=LEASE_TIMEOUT):
+    """Atomically take the next due job, or a running job whose worker stopped heartbeating."""
+    now = timezone.now()
+    claimable = Q(status=SettlementJob.Status.PENDING, run_at__lte=now) | Q(
+        status=SettlementJob.Status.RUNNING, locked_at__lt=now - lease_timeout
+    )
+    for job_id, status, locked_at in (
+        SettlementJob.objects.filter(claimable).order_by("run_at", "id").values_list("id", "status", "locked_at")[:10]
+    ):
+        # Compare-and-set on the state we read, so two workers never claim the same job.
+        claimed = SettlementJob.objects.filter(pk=job_id, status=status, locked_at=locked_at).update(
+            status=SettlementJob.Status.RUNNING,
+            locked_by=worker,
+            locked_at=now,
+            attempts=F("attempts") + 1,
+        )
+        if claimed:
+            return SettlementJob.objects.select_related("contest").get(pk=job_id)
+    return None
+
+
+@retry_on_lock
+def _settle_next_chunk(job, chunk_size):
+    """Settle one chunk and checkpoint it in the same transaction; ``False`` when done."""
+    with transaction.atomic():
+        last_id, settled, credits = settle_chunk(job.contest, job.last_bet_id, chunk_size)
+        if last_id is None:
+            return False
+        progress = {
+            "last_bet_id": last_id,
+            "bets_settled": job.bets_settled + settled,
+            "total_paid": job.total_paid + sum(credits.values()),
+            "locked_at": timezone.now(),
+        }
+        SettlementJob.objects.filter(pk=job.pk).update(**progress)
+    # Only a committed checkpoint moves the job forward, so a retry resumes from it.
+    for field, value in progress.items():
+        setattr(job, field, value)
+    return True
+
+
+def run_job(job, chunk_size=SETTLEMENT_CHUNK_SIZE):
+    """Settle the job's contest from its checkpoint, saving progress after every chunk."""
+    while _settle_next_chunk(job, chunk_size):
+        pass
+    job.status = SettlementJob.Status.DONE
+    job.finished_at = timezone.now()
+    job.error = ""
+    job.save(update_fields=["status", "finished_at", "error"])
+
+
+def fail_job(job, error, max_attempts=MAX_ATTEMPTS):
+    """Reschedule the job with exponential backoff, or mark it failed after ``max_attempts``."""
+    job.error = error
+    if job.attempts >= max_attempts:
+        job.status = SettlementJob.Status.FAILED
+        job.finished_at = timezone.now()
+    else:
+        job.status = SettlementJob.Status.PENDING
+        job.run_at = timezone.now() + RETRY_BASE_DELAY * 2 ** (job.attempts - 1)
+    job.save(update_fields=["error", "status", "finished_at", "run_at"])
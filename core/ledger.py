@@ -0,0 +1,138 @@
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import F, Max, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+from .models import BalanceSnapshot, BalanceTransaction
+
+Kind = BalanceTransaction.Kind
+
+
+def record_bets(bets):
+    """Log the stakes of new bets; call inside the transaction that debits them."""
+    BalanceTransaction.objects.bulk_create(
+        [BalanceTransaction(user_id=bet.user_id, kind=Kind.BET, amount=-bet.amount, bet=bet) for bet in bets]
+    )
+
+
+def record_payouts(payouts):
+    """Log settled payouts, ``(bet_id, user_id, amount)`` triples, in one bulk insert."""
+    BalanceTransaction.objects.bulk_create(
+        [
+            BalanceTransaction(user_id=user_id, kind=Kind.PAYOUT, amount=amount, bet_id=bet_id)
+            for bet_id, user_id, amount in payouts
+        ],
+        batch_size=500,
+    )
+
+
+def open_accounts(users):
+    """Log the starting balance of new users; ``post_save`` does this for single creates."""
+    BalanceTransaction.objects.bulk_create(
+        [BalanceTransaction(user_id=user.pk, kind=Kind.OPENING, amount=user.balance) for user in users if user.balance],
+        batch_size=500,
+    )
+
+
+def adjust_balance(user, amount, note=""):
+    """Credit a user, or debit with a negative ``amount``, outside of betting.
+
+    Returns ``False`` and changes nothing when a debit exceeds the balance.
+    """
+    users = get_user_model().objects.filter(pk=user.pk)
+    if amount < 0:
+        users = users.filter(balance__gte=-amount)
+    with transaction.atomic():
+        if not users.update(balance=F("balance") + amount):
+            return False
+        BalanceTransaction.objects.create(user=user, kind=Kind.ADJUSTMENT, amount=amount, note=note)
+    user.refresh_from_db(fields=["balance"])
+    return True
+
+
+def _snapshot_cutoff():
+    return Coalesce(
+        Subquery(
+            BalanceSnapshot.objects.filter(user_id=OuterRef("user_id"))
+            .order_by("-last_transaction_id")
+            .values("last_transaction_id")[:1]
+        ),
+        Value(0),
+    )
+
+
+def _latest_snapshots(user_ids):
+    latest = BalanceSnapshot.objects.filter(user_id=OuterRef("user_id")).order_by("-last_transaction_id").values("pk")[:1]
+    snapshots = BalanceSnapshot.objects.filter(pk=Subquery(latest))
+    if user_ids is not None:
+        snapshots = snapshots.filter(user_id__in=user_ids)
+    return {user_id: balance for user_id, balance in snapshots.values_list("user_id", "balance")}
+
+
+def _deltas_since_snapshot(user_ids):
+    """``{user_id: (delta, last_transaction_id)}`` for ledger rows after each user's latest snapshot."""
+    rows = BalanceTransaction.objects.alias(cutoff=_snapshot_cutoff()).filter(id__gt=F("cutoff"))
+    if user_ids is not None:
+        rows = rows.filter(user_id__in=user_ids)
+    rows = rows.values("user_id").annotate(delta=Sum("amount"), last_id=Max("id")).values_list("user_id", "delta", "last_id")
+    return {user_id: (delta, last_id) for user_id, delta, last_id in rows}
+
+
+def ledger_balances(user_ids):
+    """Balance per user according to the ledger: latest snapshot plus the deltas after it."""
+    snapshots = _latest_snapshots(user_ids)
+    deltas = _deltas_since_snapshot(user_ids)
+    return {
+        user_id: snapshots.get(user_id, Decimal("0.00")) + deltas.get(user_id, (Decimal("0.00"), None))[0]
+        for user_id in user_ids
+    }
+
+
+def take_snapshots(user_ids=None):
+    """Fold new ledger rows into a fresh snapshot for every user that has some; return the count."""
+    with transaction.atomic():
+        deltas = _deltas_since_snapshot(user_ids)
+        snapshots = _latest_snapshots(list(deltas))
+        BalanceSnapshot.objects.bulk_create(
+            [
+                BalanceSnapshot(
+                    user_id=user_id,
+                    balance=snapshots.get(user_id, Decimal("0.00")) + delta,
+                    last_transaction_id=last_id,
+                )
+                for user_id, (delta, last_id) in deltas.items()
+            ],
+            batch_size=500,
+        )
+    return len(deltas)
+
+
+def reconcile_balances(user_ids, fix=False):
+    """Compare ``CustomUser.balance`` with the ledger; return ``(user_id, stored, expected)`` mismatches.
+
+    With ``fix=True`` each difference is booked as an adjustment, so the
+    ledger explains the stored balance again and the correction itself
+    stays on record.
+    """
+    User = get_user_model()
+    with transaction.atomic():
+        expected = ledger_balances(user_ids)
+        stored = dict(User.objects.filter(pk__in=user_ids).values_list("pk", "balance"))
+        mismatches = [
+            (user_id, stored[user_id], expected[user_id])
+            for user_id in user_ids
+            if user_id in stored and stored[user_id] != expected[user_id]
+        ]
+        if fix:
+            BalanceTransaction.objects.bulk_create(
+                [
+                    BalanceTransaction(
+                        user_id=user_id, kind=Kind.ADJUSTMENT, amount=balance - ledger, note="Сверка с журналом"
+                    )
+                    for user_id, balance, ledger in mismatches
+                ],
+                batch_size=500,
+            )
+    return mismatches
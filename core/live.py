@@ -0,0 +1,116 @@
+import asyncio
+import json
+import logging
+import weakref
+
+from asgiref.sync import sync_to_async
+
+from .contests import contest_data_version, get_current_contest
+from .odds import calculate_coefficients
+
+POLL_INTERVAL = 1.0
+HEARTBEAT_INTERVAL = 15.0
+
+logger = logging.getLogger(__name__)
+
+
+def read_odds_snapshot(last_version=None):
+    """Return ``(version, payload)`` for the current contest, or ``None`` if ``last_version`` is still current."""
+    version = contest_data_version()
+    if version == last_version:
+        return None
+    current = get_current_contest()
+    contest = current.contest
+    odds = calculate_coefficients(sorted(current.participant_ids), contest)
+    payload = {
+        "contest": contest.pk if contest else None,
+        "is_open": current.is_open,
+        "odds": {str(candidate_id): str(coefficient) for candidate_id, coefficient in odds.items()},
+    }
+    return version, payload
+
+
+def format_event(version, payload):
+    data = json.dumps(payload, separators=(",", ":"))
+    return f"event: odds\nid: {version}\ndata: {data}\n\n"
+
+
+class OddsBroadcaster:
+    """Fans the current contest's odds out to every subscriber of one event loop.
+
+    A single task polls the cached contest version and reads the odds only
+    when it changes, however many clients are connected. Each subscriber
+    has a one-slot queue holding the newest snapshot: a slow client skips
+    intermediate snapshots instead of buffering them.
+    """
+
+    def __init__(self, poll_interval=POLL_INTERVAL):
+        self.poll_interval = poll_interval
+        self.subscribers = set()
+        self.latest = None
+        self.published = 0
+        self.skipped = 0
+        self._task = None
+
+    def subscribe(self):
+        queue = asyncio.Queue(maxsize=1)
+        if self.latest:
+            queue.put_nowait(self.latest)
+        self.subscribers.add(queue)
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+        return queue
+
+    def unsubscribe(self, queue):
+        self.subscribers.discard(queue)
+
+    def publish(self, event):
+        self.latest = event
+        self.published += 1
+        for queue in self.subscribers:
+            if queue.full():
+                queue.get_nowait()
+                self.skipped += 1
+            queue.put_nowait(event)
+
+    async def _run(self):
+        version = None
+        while self.subscribers:
+            try:
+                snapshot = await sync_to_async(read_odds_snapshot)(version)
+            except Exception:
+                # Keep streaming; the next poll retries the read.
+                logger.exception("Reading live odds failed")
+                snapshot = None
+            if snapshot:
+                version, payload = snapshot
+                self.publish(format_event(version, payload))
+            await asyncio.sleep(self.poll_interval)
+        # Stale once nobody is listening; the next subscriber waits for a fresh read.
+        self.latest = None
+
+
+_broadcasters = weakref.WeakKeyDictionary()
+
+
+def get_broadcaster():
+    """The broadcaster of the running event loop (one per ASGI worker)."""
+    loop = asyncio.get_running_loop()
+    broadcaster = _broadcasters.get(loop)
+    if broadcaster is None:
+        broadcaster = _broadcasters[loop] = OddsBroadcaster()
+    return broadcaster
+
+
+async def odds_events(broadcaster, heartbeat=HEARTBEAT_INTERVAL):
+    """Server-sent events for one client: odds snapshots and comment heartbeats."""
+    queue = broadcaster.subscribe()
+    try:
+        yield f"retry: {int(broadcaster.poll_interval * 3000)}\n\n"
+        while True:
+            try:
+                yield await asyncio.wait_for(queue.get(), heartbeat)
+            except TimeoutError:
+                yield ": heartbeat\n\n"
+    finally:
+        broadcaster.unsubscribe(queue)
@@ -0,0 +1,28 @@
+from decimal import Decimal, InvalidOperation
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from core.ledger import adjust_balance
+
+
+class Command(BaseCommand):
+    help = "Credit or debit a user's balance and record it in the ledger"
+
+    def add_arguments(self, parser):
+        parser.add_argument("email")
+        parser.add_argument("amount", help="Positive to credit, negative to debit")
+        parser.add_argument("--note", default="", help="Reason shown in the ledger")
+
+    def handle(self, *args, **options):
+        try:
+            amount = Decimal(options["amount"]).quantize(Decimal("0.01"))
+        except InvalidOperation:
+            raise CommandError(f"Invalid amount: {options['amount']}")
+        try:
+            user = get_user_model().objects.get(email=options["email"])
+        except get_user_model().DoesNotExist:
+            raise CommandError(f"No user with email {options['email']}")
+        if not adjust_balance(user, amount, options["note"]):
+            raise CommandError(f"Balance {user.balance} is too low to debit {-amount}")
+        self.stdout.write(self.style.SUCCESS(f"Balance of {user.email} is now {user.balance}"))
@@ -0,0 +1,77 @@
+import json
+import logging
+import tempfile
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.utils import timezone
+
+from core.bench import run_load, seed_bench_data
+
+
+class Command(BaseCommand):
+    help = "Load-test the betting flows on a seeded throwaway database"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=20, help="Simulated (and seeded) users")
+        parser.add_argument("--candidates", type=int, default=24)
+        parser.add_argument("--bets", type=int, default=5000, help="Historical bets to seed")
+        parser.add_argument("--concurrency", type=int, default=4)
+        parser.add_argument("--iterations", type=int, default=5, help="Browse-bet-history loops per user")
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--scenario", choices=["mixed", "bets"], default="mixed", help="Browse and bet, or only place bets"
+        )
+        parser.add_argument(
+            "--plain-sqlite",
+            action="store_true",
+            help="Drop the tuned SQLite OPTIONS (WAL, BEGIN IMMEDIATE, pragmas) to compare against",
+        )
+        parser.add_argument("--output", default="bench_output.json", help="JSON results file")
+        parser.add_argument("--keepdb", action="store_true", help="Keep the bench database afterwards")
+
+    def handle(self, *args, **options):
+        if connection.vendor == "sqlite":
+            # A file database, so concurrent writers behave as they do in production.
+            connection.settings_dict["TEST"]["NAME"] = str(Path(tempfile.gettempdir()) / "betting_bench.sqlite3")
+            if options["plain_sqlite"]:
+                connection.close()
+                connection.settings_dict["OPTIONS"] = {}
+        old_name = connection.settings_dict["NAME"]
+        test_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, keepdb=options["keepdb"])
+        # Failed requests are counted per route instead of logging a traceback each.
+        request_logger = logging.getLogger("django.request")
+        request_logger.disabled = True
+        try:
+            users, candidates, _ = seed_bench_data(
+                options["users"], options["candidates"], options["bets"], seed=options["seed"]
+            )
+            stats, wall_time = run_load(
+                users,
+                [candidate.pk for candidate in candidates],
+                options["concurrency"],
+                options["iterations"],
+                seed=options["seed"],
+                scenario=options["scenario"],
+            )
+        finally:
+            request_logger.disabled = False
+            connection.creation.destroy_test_db(old_name, verbosity=0, keepdb=options["keepdb"])
+        routes = stats.summary(wall_time)
+        result = {
+            "started_at": timezone.now().isoformat(),
+            "database": connection.vendor,
+            "test_database": str(test_name),
+            "options": {key: options[key] for key in ("users", "candidates", "bets", "concurrency", "iterations", "seed", "scenario", "plain_sqlite")},
+            "wall_time_s": round(wall_time, 3),
+            "routes": routes,
+        }
+        Path(options["output"]).write_text(json.dumps(result, ensure_ascii=False, indent=2))
+        self.stdout.write(f"{'route':<18}{'reqs':>6}{'err':>5}{'rps':>9}{'p50':>9}{'p95':>9}{'p99':>9}{'q/req':>7}")
+        for route, row in routes.items():
+            self.stdout.write(
+                f"{route:<18}{row['requests']:>6}{row['errors']:>5}{row['throughput_rps']:>9}"
+                f"{row['p50_ms']:>9}{row['p95_ms']:>9}{row['p99_ms']:>9}{row['queries_per_request']:>7}"
+            )
+        self.stdout.write(self.style.SUCCESS(f"Results written to {options['output']}"))
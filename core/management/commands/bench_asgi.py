@@ -0,0 +1,56 @@
+import asyncio
+import json
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import Client
+
+from core.bench import asgi_read_routes, run_asgi_reads, seed_bench_data
+
+
+class Command(BaseCommand):
+    help = "Measure read-page throughput through the ASGI entry point"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=2000)
+        parser.add_argument("--concurrency", type=int, default=50, help="Requests in flight at once")
+        parser.add_argument("--candidates", type=int, default=60)
+        parser.add_argument("--bets", type=int, default=2000, help="Historical bets to seed")
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--output", default="bench_asgi_output.json", help="JSON results file")
+
+    def handle(self, *args, **options):
+        if connection.vendor == "sqlite":
+            connection.settings_dict["TEST"]["NAME"] = str(Path(tempfile.gettempdir()) / "betting_bench.sqlite3")
+        old_name = connection.settings_dict["NAME"]
+        connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            users, candidates, _ = seed_bench_data(1, options["candidates"], options["bets"], seed=options["seed"])
+            client = Client()
+            client.force_login(users[0])
+            cookie = f"{settings.SESSION_COOKIE_NAME}={client.cookies[settings.SESSION_COOKIE_NAME].value}"
+            routes = asgi_read_routes([candidate.pk for candidate in candidates])
+            stats, wall_time = asyncio.run(
+                run_asgi_reads(cookie, routes, options["concurrency"], options["requests"])
+            )
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+        views = "async" if settings.ASYNC_READ_VIEWS else "sync"
+        result = {
+            "views": views,
+            "options": {key: options[key] for key in ("requests", "concurrency", "candidates", "bets", "seed")},
+            "wall_time_s": round(wall_time, 3),
+            "throughput_rps": round(options["requests"] / wall_time, 2),
+            "routes": stats.summary(wall_time),
+        }
+        Path(options["output"]).write_text(json.dumps(result, indent=2))
+        self.stdout.write(f"{views} views: {result['throughput_rps']} req/s over {result['wall_time_s']} s")
+        self.stdout.write(f"{'route':<18}{'reqs':>6}{'err':>5}{'p50':>9}{'p95':>9}{'p99':>9}")
+        for route, row in result["routes"].items():
+            self.stdout.write(
+                f"{route:<18}{row['requests']:>6}{row['errors']:>5}{row['p50_ms']:>9}{row['p95_ms']:>9}{row['p99_ms']:>9}"
+            )
+        self.stdout.write(self.style.SUCCESS(f"Results written to {options['output']}"))
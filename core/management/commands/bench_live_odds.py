@@ -0,0 +1,52 @@
+import asyncio
+import json
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import Client
+
+from core.bench import run_live_load, seed_bench_data
+
+
+class Command(BaseCommand):
+    help = "Measure how many live-odds SSE subscribers one ASGI worker serves"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--subscribers", type=int, default=1000)
+        parser.add_argument("--changes", type=int, default=10, help="Bets placed while everyone listens")
+        parser.add_argument("--candidates", type=int, default=24)
+        parser.add_argument("--poll-interval", type=float, default=0.2, help="Seconds between version checks")
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--output", default="bench_live_output.json", help="JSON results file")
+
+    def handle(self, *args, **options):
+        if connection.vendor == "sqlite":
+            connection.settings_dict["TEST"]["NAME"] = str(Path(tempfile.gettempdir()) / "betting_bench.sqlite3")
+        old_name = connection.settings_dict["NAME"]
+        connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            users, candidates, contest = seed_bench_data(1, options["candidates"], 0, seed=options["seed"])
+            client = Client()
+            client.force_login(users[0])
+            cookie = f"{settings.SESSION_COOKIE_NAME}={client.cookies[settings.SESSION_COOKIE_NAME].value}"
+            result = asyncio.run(
+                run_live_load(
+                    cookie,
+                    contest,
+                    [candidate.pk for candidate in candidates],
+                    users[0].pk,
+                    options["subscribers"],
+                    options["changes"],
+                    options["poll_interval"],
+                    seed=options["seed"],
+                )
+            )
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+        Path(options["output"]).write_text(json.dumps(result, indent=2))
+        for key, value in result.items():
+            self.stdout.write(f"{key:<26}{value}")
+        self.stdout.write(self.style.SUCCESS(f"Results written to {options['output']}"))
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.models import Contest
+from core.pools import check_pools
+
+
+class Command(BaseCommand):
+    help = "Compare contest bet pool totals with the Bet table"
+
+    def add_arguments(self, parser):
+        parser.add_argument("contest_ids", nargs="*", type=int, help="Contest ids (all contests by default)")
+
+    def handle(self, *args, **options):
+        contest_ids = options["contest_ids"] or list(Contest.objects.values_list("id", flat=True))
+        mismatches = check_pools(contest_ids)
+        for contest_id, candidate_id, field, stored, expected in mismatches:
+            target = f"candidate {candidate_id}" if candidate_id else "total"
+            self.stderr.write(f"Contest {contest_id}, {target} {field}: stored {stored}, expected {expected}")
+        if mismatches:
+            raise CommandError(f"{len(mismatches)} pool rows are out of sync, run rebuild_pools")
+        self.stdout.write(self.style.SUCCESS(f"Pools are consistent for {len(contest_ids)} contests"))
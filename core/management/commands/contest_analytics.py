@@ -0,0 +1,41 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core import analytics
+from core.models import Contest
+
+
+class Command(BaseCommand):
+    help = "Print per-candidate stake, liability, house exposure, odds drift and stake quantiles of a contest"
+
+    def add_arguments(self, parser):
+        parser.add_argument("contest_id", type=int)
+        parser.add_argument("--buckets", type=int, default=10, help="Time slices for the odds drift")
+        parser.add_argument("--json", action="store_true", help="Print the summary as JSON")
+
+    def handle(self, *args, **options):
+        if options["buckets"] < 1:
+            raise CommandError("--buckets must be positive")
+        contest = Contest.objects.filter(pk=options["contest_id"]).first()
+        if not contest:
+            raise CommandError(f"Contest {options['contest_id']} does not exist")
+        summary = analytics.contest_analytics(contest, buckets=options["buckets"])
+        if summary is None:
+            raise CommandError("Contest has no bets")
+        if options["json"]:
+            self.stdout.write(json.dumps(summary, ensure_ascii=False, indent=2))
+            return
+        quantiles = " ".join(f"{name}={value}" for name, value in summary["stake_quantiles"].items())
+        self.stdout.write(
+            f"Contest {summary['contest_id']}: {summary['bets']} bets, stake {summary['total_stake']}, "
+            f"worst case house result {summary['worst_case_house_result']}"
+        )
+        self.stdout.write(f"Stake: mean={summary['stake_mean']} {quantiles} max={summary['stake_max']}")
+        self.stdout.write(f"{'candidate':<24} {'bets':>8} {'stake':>12} {'liability':>12} {'house if wins':>14} {'odds':>13}")
+        for row in summary["candidates"]:
+            odds = f"{row['opening_coefficient']}→{row['closing_coefficient']}"
+            self.stdout.write(
+                f"{row['candidate_id']:>5} {row['name'][:18]:<18} {row['bets']:>8} {row['stake']:>12} "
+                f"{row['liability']:>12} {row['house_result_if_wins']:>14} {odds:>13}"
+            )
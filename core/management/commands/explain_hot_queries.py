@@ -0,0 +1,95 @@
+import re
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import OuterRef, Q, Subquery, Sum
+from django.utils import timezone
+
+from core.models import Bet, BetPool, Candidate, Contest, CustomUser, SettlementJob, UserBetStats
+from core.search import search_candidates
+
+# "SCAN core_bet" on SQLite ("SCAN TABLE core_bet" before 3.36) and "Seq Scan
+# on core_bet" on PostgreSQL read the whole table; "SCAN core_bet USING INDEX
+# ..." walks an index and is fine.
+FULL_SCAN_PATTERNS = [
+    re.compile(r"\bSCAN (?:TABLE )?(?P<table>\w+)(?: AS \w+)?\s*$", re.MULTILINE),
+    re.compile(r"Seq Scan on (?P<table>\w+)"),
+]
+
+# Paging a whole table in primary key order walks the rowid and stops at the
+# LIMIT, which SQLite also prints as a plain SCAN.
+BOUNDED_SCANS = {"candidate list": {"core_candidate"}}
+
+
+def _first_id(model):
+    return model.objects.order_by("pk").values_list("pk", flat=True).first() or 1
+
+
+def hot_queries():
+    """The querysets behind the request paths, in the shape the views build them."""
+    contest_id = _first_id(Contest)
+    candidate_id = _first_id(Candidate)
+    user_id = _first_id(CustomUser)
+    now = timezone.now()
+    participants = Candidate.objects.filter(contests=contest_id).order_by("id")
+    latest_job = SettlementJob.objects.filter(contest=OuterRef("pk")).order_by("-id").values("id")[:1]
+    return [
+        ("current contest", Contest.objects.order_by("-ends_at")[:1]),
+        ("contest participants", participants[:12]),
+        ("candidate search", search_candidates(participants, "Анна")[:12]),
+        ("candidate list", Candidate.objects.order_by("id")[:12]),
+        ("candidate detail", Candidate.objects.filter(pk=candidate_id)),
+        (
+            "pool totals",
+            BetPool.objects.filter(Q(candidate__isnull=True) | Q(candidate=candidate_id), contest=contest_id),
+        ),
+        (
+            "bet history",
+            Bet.objects.filter(user=user_id)
+            .select_related("candidate", "contest")
+            .order_by("-created_at", "-id")[:11],
+        ),
+        (
+            "bet history next page",
+            Bet.objects.filter(Q(created_at__lt=now) | Q(created_at=now, id__lt=1), user=user_id)
+            .select_related("candidate", "contest")
+            .order_by("-created_at", "-id")[:11],
+        ),
+        ("profile stats", UserBetStats.objects.select_related("last_bet").filter(user=user_id)[:1]),
+        (
+            "contest list",
+            Contest.objects.select_related("winner").annotate(latest_job_id=Subquery(latest_job)).order_by("-ends_at"),
+        ),
+        (
+            "settlement chunk",
+            Bet.objects.filter(contest=contest_id, candidate=candidate_id, paid_out=False, id__gt=0).order_by("id")[:500],
+        ),
+        ("pool rebuild", Bet.objects.filter(contest=contest_id).values("candidate_id").annotate(total=Sum("amount"))),
+        (
+            "settlement job claim",
+            SettlementJob.objects.filter(
+                Q(status=SettlementJob.Status.PENDING, run_at__lte=now)
+                | Q(status=SettlementJob.Status.RUNNING, locked_at__lt=now)
+            ).order_by("run_at", "id")[:10],
+        ),
+    ]
+
+
+def full_scans(plan):
+    return sorted({match.group("table") for pattern in FULL_SCAN_PATTERNS for match in pattern.finditer(plan)})
+
+
+class Command(BaseCommand):
+    help = "Print query plans of the hot request queries and fail on full table scans"
+
+    def handle(self, *args, **options):
+        failures = []
+        for name, queryset in hot_queries():
+            plan = queryset.explain()
+            scans = [table for table in full_scans(plan) if table not in BOUNDED_SCANS.get(name, ())]
+            self.stdout.write(f"== {name}")
+            self.stdout.write(plan)
+            if scans:
+                failures.append(f"{name}: full scan of {', '.join(scans)}")
+        if failures:
+            raise CommandError("Full table scans found:\n" + "\n".join(failures))
+        self.stdout.write(self.style.SUCCESS("No full table scans in hot queries"))
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from core.fragments import fragment_stats, reset_fragment_stats
+
+
+class Command(BaseCommand):
+    help = "Show hit/miss counts of the cached page fragments"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--reset", action="store_true", help="Zero the counters after printing them")
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"{'fragment':<16}{'hits':>10}{'misses':>10}{'hit ratio':>11}")
+        for name, row in fragment_stats().items():
+            self.stdout.write(f"{name:<16}{row['hits']:>10}{row['misses']:>10}{row['hit_ratio']:>11}")
+        if options["reset"]:
+            reset_fragment_stats()
+            self.stdout.write(self.style.SUCCESS("Counters reset."))
@@ -0,0 +1,56 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import django
+from django.core.management.base import BaseCommand
+
+from core.contests import invalidate_current_contest
+from core.images import photo_variants_for
+from core.models import Candidate
+
+
+def _init_worker():
+    # Spawned workers (macOS, Windows) start without configured Django.
+    django.setup()
+
+
+def _render(pk, photo_name):
+    return pk, photo_variants_for(photo_name)
+
+
+class Command(BaseCommand):
+    help = "Generate resized WebP/JPEG variants for candidate photos"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+        parser.add_argument("--force", action="store_true", help="Regenerate variants that are up to date")
+
+    def handle(self, *args, **options):
+        pending = [
+            (candidate.pk, candidate.photo.name)
+            for candidate in Candidate.objects.exclude(photo="").exclude(photo__isnull=True).only("photo", "photo_variants")
+            if options["force"] or (candidate.photo_variants or {}).get("source") != candidate.photo.name
+        ]
+        results, failed = [], 0
+        if options["workers"] > 1 and len(pending) > 1:
+            with ProcessPoolExecutor(max_workers=options["workers"], initializer=_init_worker) as pool:
+                futures = {pool.submit(_render, pk, name): name for pk, name in pending}
+                for future in as_completed(futures):
+                    try:
+                        results.append(future.result())
+                    except Exception as exc:
+                        failed += 1
+                        self.stderr.write(f"Failed to process {futures[future]}: {exc!r}")
+        else:
+            for pk, name in pending:
+                try:
+                    results.append(_render(pk, name))
+                except Exception as exc:
+                    failed += 1
+                    self.stderr.write(f"Failed to process {name}: {exc!r}")
+        for pk, variants in results:
+            Candidate.objects.filter(pk=pk).update(photo_variants=variants)
+        if results:
+            # update() sends no signals; cached cards would keep serving the old srcset.
+            invalidate_current_contest()
+        self.stdout.write(self.style.SUCCESS(f"Generated variants for {len(results)} photos, {failed} failed"))
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from core.models import Contest
+from core.pools import rebuild_pools
+
+
+class Command(BaseCommand):
+    help = "Rebuild contest bet pool totals from the Bet table"
+
+    def add_arguments(self, parser):
+        parser.add_argument("contest_ids", nargs="*", type=int, help="Contest ids (all contests by default)")
+
+    def handle(self, *args, **options):
+        contest_ids = options["contest_ids"] or list(Contest.objects.values_list("id", flat=True))
+        rebuild_pools(contest_ids)
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt pools for {len(contest_ids)} contests"))
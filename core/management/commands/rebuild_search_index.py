@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from core.search import rebuild_search_index
+
+
+class Command(BaseCommand):
+    help = "Rebuild the full-text index of candidates"
+
+    def handle(self, *args, **options):
+        if rebuild_search_index():
+            self.stdout.write(self.style.SUCCESS("Candidate search index rebuilt"))
+        else:
+            self.stdout.write(self.style.WARNING("Full-text search is not available, search uses LIKE"))
@@ -0,0 +1,25 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from core.ledger import reconcile_balances
+
+
+class Command(BaseCommand):
+    help = "Compare user balances with the balance ledger"
+
+    def add_arguments(self, parser):
+        parser.add_argument("user_ids", nargs="*", type=int, help="User ids (all users by default)")
+        parser.add_argument("--fix", action="store_true", help="Book each difference as an adjustment in the ledger")
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        user_ids = options["user_ids"] or list(get_user_model().objects.order_by("id").values_list("id", flat=True))
+        batch_size = options["batch_size"]
+        mismatches = []
+        for start in range(0, len(user_ids), batch_size):
+            mismatches += reconcile_balances(user_ids[start:start + batch_size], fix=options["fix"])
+        for user_id, stored, expected in mismatches:
+            self.stderr.write(f"User {user_id}: balance {stored}, ledger {expected}")
+        if mismatches and not options["fix"]:
+            raise CommandError(f"{len(mismatches)} balances differ from the ledger, rerun with --fix")
+        self.stdout.write(self.style.SUCCESS(f"Checked balances of {len(user_ids)} users"))
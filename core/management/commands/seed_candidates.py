@@ -1,3 +1,4 @@
+import time
 from pathlib import Path
 
 from django.conf import settings
@@ -5,12 +6,25 @@ from django.core.files import File
 from django.core.management.base import BaseCommand
 
 from core.models import Candidate
+from core.seeding import generate_dataset
 
 
 class Command(BaseCommand):
-    help = "Seed the database with demo candidates"
+    help = "Seed the database with demo candidates, or generate a large synthetic dataset"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--generate", action="store_true", help="Generate users, contests and bets in bulk")
+        parser.add_argument("--users", type=int, default=5000)
+        parser.add_argument("--candidates", type=int, default=300)
+        parser.add_argument("--contests", type=int, default=6)
+        parser.add_argument("--participants", type=int, default=40, help="Candidates per contest")
+        parser.add_argument("--bets", type=int, default=1_000_000)
+        parser.add_argument("--seed", type=int, default=0, help="Random seed, the same seed gives the same data")
+        parser.add_argument("--batch-size", type=int, default=5000)
 
     def handle(self, *args, **options):
+        if options["generate"]:
+            return self._generate(options)
         media_dir = Path(__file__).parent / "media_seed"
         data = [
             {
@@ -67,3 +81,27 @@ class Command(BaseCommand):
             created += 1 if was_created else 0
 
         self.stdout.write(self.style.SUCCESS(f"Seeded {created} candidates"))
+
+    def _generate(self, options):
+        reported = {}
+
+        def progress(stage, done, total):
+            # About ten lines per stage, however large it is.
+            step = max(total // 10, 1)
+            if done == total or done // step != reported.get(stage, -1):
+                reported[stage] = done // step
+                self.stdout.write(f"{stage}: {done}/{total}")
+
+        started = time.monotonic()
+        counts = generate_dataset(
+            users=options["users"],
+            candidates=options["candidates"],
+            contests=options["contests"],
+            participants=options["participants"],
+            bets=options["bets"],
+            seed=options["seed"],
+            batch_size=options["batch_size"],
+            progress=progress,
+        )
+        summary = ", ".join(f"{count} {name}" for name, count in counts.items())
+        self.stdout.write(self.style.SUCCESS(f"Generated {summary} in {time.monotonic() - started:.1f}s"))
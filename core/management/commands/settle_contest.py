@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.models import Contest
+from core.settlement import SETTLEMENT_CHUNK_SIZE, is_settleable, settle_contest
+
+
+class Command(BaseCommand):
+    help = "Pay out winning bets of a finished contest and print a settlement report"
+
+    def add_arguments(self, parser):
+        parser.add_argument("contest_id", type=int)
+        parser.add_argument("--chunk-size", type=int, default=SETTLEMENT_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        contest = Contest.objects.filter(pk=options["contest_id"]).first()
+        if not contest:
+            raise CommandError(f"Contest {options['contest_id']} does not exist")
+        if not is_settleable(contest):
+            raise CommandError("Contest has no winner yet or has not ended")
+        report = settle_contest(contest, chunk_size=options["chunk_size"])
+        self.stdout.write(self.style.SUCCESS(str(report)))
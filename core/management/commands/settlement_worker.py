@@ -0,0 +1,39 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.jobs import MAX_ATTEMPTS, claim_job, fail_job, run_job, worker_name
+from core.settlement import SETTLEMENT_CHUNK_SIZE
+
+
+class Command(BaseCommand):
+    help = "Process queued contest settlement jobs"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true", help="Exit when the queue is empty")
+        parser.add_argument("--poll-interval", type=float, default=2.0)
+        parser.add_argument("--chunk-size", type=int, default=SETTLEMENT_CHUNK_SIZE)
+        parser.add_argument("--max-attempts", type=int, default=MAX_ATTEMPTS)
+
+    def handle(self, *args, **options):
+        worker = worker_name()
+        self.stdout.write(f"Settlement worker {worker} started")
+        while True:
+            job = claim_job(worker)
+            if job is None:
+                if options["once"]:
+                    break
+                time.sleep(options["poll_interval"])
+                continue
+            try:
+                run_job(job, chunk_size=options["chunk_size"])
+            except Exception as exc:
+                fail_job(job, repr(exc), max_attempts=options["max_attempts"])
+                self.stderr.write(f"Job {job.pk} for contest {job.contest_id} failed: {exc!r}")
+            else:
+                self.stdout.write(
+                    self.style.SUCCESS(
+                        f"Job {job.pk}: contest {job.contest_id} settled, "
+                        f"{job.bets_settled} bets, {job.total_paid} paid"
+                    )
+                )
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from core.ledger import take_snapshots
+
+
+class Command(BaseCommand):
+    help = "Fold recent balance ledger rows into per-user snapshots"
+
+    def add_arguments(self, parser):
+        parser.add_argument("user_ids", nargs="*", type=int, help="User ids (all users by default)")
+
+    def handle(self, *args, **options):
+        count = take_snapshots(options["user_ids"] or None)
+        self.stdout.write(self.style.SUCCESS(f"Snapshotted balances of {count} users"))
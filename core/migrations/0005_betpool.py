@@ -0,0 +1,65 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def backfill_pools(apps, schema_editor):
+    Bet = apps.get_model("core", "Bet")
+    BetPool = apps.get_model("core", "BetPool")
+    contest_totals = {}
+    pools = []
+    rows = (
+        Bet.objects.filter(contest__isnull=False)
+        .values("contest_id", "candidate_id")
+        .annotate(total=models.Sum("amount"))
+    )
+    for row in rows:
+        pools.append(BetPool(contest_id=row["contest_id"], candidate_id=row["candidate_id"], total=row["total"]))
+        contest_totals[row["contest_id"]] = contest_totals.get(row["contest_id"], 0) + row["total"]
+    for contest_id, total in contest_totals.items():
+        pools.append(BetPool(contest_id=contest_id, candidate_id=None, total=total))
+    BetPool.objects.bulk_create(pools)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0004_bet_paid_out"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="BetPool",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("total", models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                (
+                    "candidate",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="pools",
+                        to="core.candidate",
+                    ),
+                ),
+                (
+                    "contest",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="pools",
+                        to="core.contest",
+                    ),
+                ),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(fields=("contest", "candidate"), name="bet_pool_contest_candidate_uniq"),
+                    models.UniqueConstraint(
+                        condition=models.Q(("candidate__isnull", True)),
+                        fields=("contest",),
+                        name="bet_pool_contest_total_uniq",
+                    ),
+                ],
+            },
+        ),
+        migrations.RunPython(backfill_pools, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,52 @@
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0005_betpool"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SettlementJob",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "В очереди"),
+                            ("running", "Выполняется"),
+                            ("done", "Завершено"),
+                            ("failed", "Ошибка"),
+                        ],
+                        default="pending",
+                        max_length=16,
+                    ),
+                ),
+                ("attempts", models.PositiveIntegerField(default=0)),
+                ("run_at", models.DateTimeField(default=django.utils.timezone.now)),
+                ("locked_by", models.CharField(blank=True, max_length=200)),
+                ("locked_at", models.DateTimeField(blank=True, null=True)),
+                ("last_bet_id", models.BigIntegerField(default=0)),
+                ("bets_settled", models.PositiveIntegerField(default=0)),
+                ("total_paid", models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ("error", models.TextField(blank=True)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("finished_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "contest",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="settlement_jobs",
+                        to="core.contest",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [models.Index(fields=["status", "run_at"], name="settlement_job_queue_idx")],
+            },
+        ),
+    ]
@@ -0,0 +1,22 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0006_settlementjob"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="contest",
+            index=models.Index(fields=["-ends_at"], name="contest_ends_at_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="bet",
+            index=models.Index(fields=["contest", "candidate", "paid_out"], name="bet_contest_candidate_paid_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="bet",
+            index=models.Index(fields=["user", "-created_at"], name="bet_user_created_idx"),
+        ),
+    ]
@@ -0,0 +1,18 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0007_hot_query_indexes"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="bet",
+            name="bet_user_created_idx",
+        ),
+        migrations.AddIndex(
+            model_name="bet",
+            index=models.Index(fields=["user", "created_at", "id"], name="bet_user_created_id_idx"),
+        ),
+    ]
@@ -0,0 +1,60 @@
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def backfill_stats(apps, schema_editor):
+    Bet = apps.get_model("core", "Bet")
+    UserBetStats = apps.get_model("core", "UserBetStats")
+    stats = {}
+    rows = Bet.objects.order_by("user_id", "created_at", "id").values_list(
+        "id", "user_id", "amount", "coefficient", "paid_out"
+    )
+    for bet_id, user_id, amount, coefficient, paid_out in rows.iterator(chunk_size=2000):
+        row = stats.setdefault(user_id, UserBetStats(user_id=user_id, total_staked=Decimal("0"), total_won=Decimal("0")))
+        row.bet_count += 1
+        row.total_staked += amount
+        if paid_out:
+            row.total_won += (amount * coefficient).quantize(Decimal("0.01"))
+        row.last_bet_id = bet_id
+    UserBetStats.objects.bulk_create(stats.values(), batch_size=500)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0008_bet_user_created_id_idx"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="UserBetStats",
+            fields=[
+                (
+                    "user",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="bet_stats",
+                        serialize=False,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                ("bet_count", models.PositiveIntegerField(default=0)),
+                ("total_staked", models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ("total_won", models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                (
+                    "last_bet",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to="core.bet",
+                    ),
+                ),
+            ],
+        ),
+        migrations.RunPython(backfill_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,14 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0010_candidate_photo_variants"),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name="customuser",
+            constraint=models.CheckConstraint(condition=models.Q(balance__gte=0), name="user_balance_non_negative"),
+        ),
+    ]
@@ -0,0 +1,91 @@
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def open_existing_accounts(apps, schema_editor):
+    # Earlier history is unknown, so the ledger starts from today's balances.
+    CustomUser = apps.get_model("core", "CustomUser")
+    BalanceTransaction = apps.get_model("core", "BalanceTransaction")
+    rows = CustomUser.objects.exclude(balance=0).values_list("id", "balance")
+    BalanceTransaction.objects.bulk_create(
+        (
+            BalanceTransaction(user_id=user_id, kind="opening", amount=balance, note="Перенос баланса")
+            for user_id, balance in rows.iterator(chunk_size=2000)
+        ),
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0011_user_balance_non_negative"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="BalanceTransaction",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[
+                            ("opening", "Начальный баланс"),
+                            ("bet", "Ставка"),
+                            ("payout", "Выигрыш"),
+                            ("adjustment", "Корректировка"),
+                        ],
+                        max_length=16,
+                    ),
+                ),
+                ("amount", models.DecimalField(decimal_places=2, max_digits=14)),
+                ("note", models.CharField(blank=True, max_length=200)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "bet",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to="core.bet",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="balance_transactions",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [models.Index(fields=["user", "id"], name="balance_tx_user_id_idx")],
+            },
+        ),
+        migrations.CreateModel(
+            name="BalanceSnapshot",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("balance", models.DecimalField(decimal_places=2, max_digits=14)),
+                ("last_transaction_id", models.BigIntegerField()),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="balance_snapshots",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(fields=["user", "last_transaction_id"], name="balance_snapshot_unique")
+                ],
+            },
+        ),
+        migrations.RunPython(open_existing_accounts, migrations.RunPython.noop),
+    ]
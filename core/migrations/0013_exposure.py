@@ -0,0 +1,39 @@
+from django.db import migrations, models
+
+
+def backfill_liability(apps, schema_editor):
+    Bet = apps.get_model("core", "Bet")
+    BetPool = apps.get_model("core", "BetPool")
+    payout = models.ExpressionWrapper(
+        models.F("amount") * models.F("coefficient"),
+        output_field=models.DecimalField(max_digits=18, decimal_places=4),
+    )
+    rows = (
+        Bet.objects.filter(contest__isnull=False)
+        .values("contest_id", "candidate_id")
+        .annotate(liability=models.Sum(payout))
+    )
+    for row in rows:
+        BetPool.objects.filter(contest_id=row["contest_id"], candidate_id=row["candidate_id"]).update(
+            liability=row["liability"]
+        )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0012_balance_ledger"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="contest",
+            name="exposure_limit",
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=14, null=True),
+        ),
+        migrations.AddField(
+            model_name="betpool",
+            name="liability",
+            field=models.DecimalField(decimal_places=4, default=0, max_digits=18),
+        ),
+        migrations.RunPython(backfill_liability, migrations.RunPython.noop),
+    ]
@@ -1,5 +1,8 @@
 from django.db import models
 from django.contrib.auth.models import AbstractUser
+from django.utils import timezone
+
+from .images import srcset
 
 class CustomUser(AbstractUser):
     email = models.EmailField(unique=True)
@@ -11,6 +14,11 @@ class CustomUser(AbstractUser):
     USERNAME_FIELD = 'email'
     REQUIRED_FIELDS = ['username', 'first_name', 'last_name']
 
+    class Meta(AbstractUser.Meta):
+        constraints = [
+            models.CheckConstraint(condition=models.Q(balance__gte=0), name="user_balance_non_negative"),
+        ]
+
     def __str__(self):
         return self.email
 
@@ -22,10 +30,28 @@ class Candidate(models.Model):
     group = models.CharField(max_length=50)
     info = models.TextField(blank=True, null=True)
     photo = models.ImageField(upload_to='candidates/', blank=True, null=True)
+    photo_variants = models.JSONField(default=dict, blank=True, editable=False)
 
     def __str__(self):
         return f"{self.last_name} {self.first_name}"
 
+    def _photo_srcset(self, ext):
+        variants = self.photo_variants or {}
+        if not self.photo or variants.get("source") != self.photo.name or not variants.get("widths"):
+            return ""
+        entries = srcset(self.photo.name, variants["widths"], ext, self.photo.storage)
+        if ext == "jpg":
+            entries += f", {self.photo.url} {variants['width']}w"
+        return entries
+
+    @property
+    def photo_webp_srcset(self):
+        return self._photo_srcset("webp")
+
+    @property
+    def photo_jpeg_srcset(self):
+        return self._photo_srcset("jpg")
+
 class Contest(models.Model):
     name = models.CharField(max_length=200)
     ends_at = models.DateTimeField()
@@ -37,8 +63,15 @@ class Contest(models.Model):
         blank=True,
         null=True,
     )
+    # Betting on a candidate stops once her payout minus the contest pool reaches this.
+    exposure_limit = models.DecimalField(max_digits=14, decimal_places=2, blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["-ends_at"], name="contest_ends_at_idx"),
+        ]
+
     def __str__(self):
         return self.name
 
@@ -58,5 +91,116 @@ class Bet(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     paid_out = models.BooleanField(default=False)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["contest", "candidate", "paid_out"], name="bet_contest_candidate_paid_idx"),
+            models.Index(fields=["user", "created_at", "id"], name="bet_user_created_id_idx"),
+        ]
+
     def __str__(self):
         return f"{self.user} - {self.candidate} - {self.amount}"
+
+class BetPool(models.Model):
+    """Running stake totals of a contest; the row with an empty candidate holds the contest-wide total.
+
+    Candidate rows also hold ``liability``, the sum of stake × odds of her
+    bets: what the house pays out if she wins.
+    """
+
+    contest = models.ForeignKey(Contest, on_delete=models.CASCADE, related_name="pools")
+    candidate = models.ForeignKey(Candidate, on_delete=models.CASCADE, related_name="pools", null=True, blank=True)
+    total = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    liability = models.DecimalField(max_digits=18, decimal_places=4, default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["contest", "candidate"], name="bet_pool_contest_candidate_uniq"),
+            models.UniqueConstraint(
+                fields=["contest"],
+                condition=models.Q(candidate__isnull=True),
+                name="bet_pool_contest_total_uniq",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.contest} - {self.candidate or 'всего'} - {self.total}"
+
+class SettlementJob(models.Model):
+    class Status(models.TextChoices):
+        PENDING = "pending", "В очереди"
+        RUNNING = "running", "Выполняется"
+        DONE = "done", "Завершено"
+        FAILED = "failed", "Ошибка"
+
+    contest = models.ForeignKey(Contest, on_delete=models.CASCADE, related_name="settlement_jobs")
+    status = models.CharField(max_length=16, choices=Status.choices, default=Status.PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    run_at = models.DateTimeField(default=timezone.now)
+    locked_by = models.CharField(max_length=200, blank=True)
+    locked_at = models.DateTimeField(blank=True, null=True)
+    last_bet_id = models.BigIntegerField(default=0)
+    bets_settled = models.PositiveIntegerField(default=0)
+    total_paid = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "run_at"], name="settlement_job_queue_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.contest} - {self.status}"
+
+class UserBetStats(models.Model):
+    user = models.OneToOneField(CustomUser, on_delete=models.CASCADE, primary_key=True, related_name="bet_stats")
+    bet_count = models.PositiveIntegerField(default=0)
+    total_staked = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    total_won = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    last_bet = models.ForeignKey(Bet, on_delete=models.SET_NULL, related_name="+", null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.user} - {self.bet_count}"
+
+
+class BalanceTransaction(models.Model):
+    """Append-only record of every change to a user's balance."""
+
+    class Kind(models.TextChoices):
+        OPENING = "opening", "Начальный баланс"
+        BET = "bet", "Ставка"
+        PAYOUT = "payout", "Выигрыш"
+        ADJUSTMENT = "adjustment", "Корректировка"
+
+    user = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name="balance_transactions")
+    kind = models.CharField(max_length=16, choices=Kind.choices)
+    amount = models.DecimalField(max_digits=14, decimal_places=2)
+    bet = models.ForeignKey(Bet, on_delete=models.SET_NULL, related_name="+", null=True, blank=True)
+    note = models.CharField(max_length=200, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["user", "id"], name="balance_tx_user_id_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.user} {self.get_kind_display()} {self.amount}"
+
+
+class BalanceSnapshot(models.Model):
+    """A user's ledger balance folded up to ``last_transaction_id``."""
+
+    user = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name="balance_snapshots")
+    balance = models.DecimalField(max_digits=14, decimal_places=2)
+    last_transaction_id = models.BigIntegerField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["user", "last_transaction_id"], name="balance_snapshot_unique"),
+        ]
+
+    def __str__(self):
+        return f"{self.user} {self.balance} @ {self.last_transaction_id}"
@@ -0,0 +1,93 @@
+import threading
+from collections import OrderedDict
+from decimal import Decimal
+
+from django.conf import settings
+
+from .pools import get_candidate_pool_totals, get_pool_totals
+from .versions import get_contest_version
+
+
+def coefficient_from_pools(pool_total, candidate_total):
+    # Smoothing to reduce volatility and avoid huge odds for empty pools.
+    smoothing = Decimal("200")
+    smoothed_coeff = (pool_total + smoothing) / (candidate_total + smoothing)
+    coeff = max(Decimal("1.10"), min(smoothed_coeff, Decimal("10.00")))
+    return coeff.quantize(Decimal("0.01"))
+
+
+def calculate_coefficient(candidate, contest):
+    """Calculate a simple dynamic coefficient based on the bet pool."""
+    if not contest:
+        return Decimal("1.10")
+    return coefficient_from_pools(*get_pool_totals(contest, candidate))
+
+
+def calculate_coefficients(candidate_ids, contest):
+    """``calculate_coefficient`` for several candidates from one pool query."""
+    if not contest:
+        return {candidate_id: Decimal("1.10") for candidate_id in candidate_ids}
+    pool_total, candidate_totals = get_candidate_pool_totals(contest, candidate_ids)
+    return {
+        candidate_id: coefficient_from_pools(pool_total, candidate_total)
+        for candidate_id, candidate_total in candidate_totals.items()
+    }
+
+
+class OddsCache:
+    """Bounded LRU of coefficients keyed by ``(contest_id, candidate_id)``.
+
+    Each entry remembers the contest version it was computed at and is
+    served only while that version is still current.
+    """
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, candidate, contest):
+        if not contest:
+            return calculate_coefficient(candidate, contest)
+        key = (contest.pk, candidate.pk)
+        version = get_contest_version(contest.pk)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] == version:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+        coefficient = calculate_coefficient(candidate, contest)
+        with self._lock:
+            self._entries[key] = (version, coefficient)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return coefficient
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+odds_cache = OddsCache(getattr(settings, "ODDS_CACHE_SIZE", 1024))
+
+
+def get_coefficient(candidate, contest):
+    return odds_cache.get(candidate, contest)
@@ -0,0 +1,99 @@
+from dataclasses import dataclass
+
+from django.core import signing
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+CURSOR_SALT = "core.pagination.cursor"
+
+
+@dataclass
+class KeysetPage:
+    object_list: list
+    next_cursor: str | None
+    previous_cursor: str | None
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    @property
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    @property
+    def has_other_pages(self):
+        return self.has_next or self.has_previous
+
+
+def _encode(obj, direction):
+    return signing.dumps([obj.created_at.isoformat(), obj.pk, direction], salt=CURSOR_SALT, compress=True)
+
+
+def _decode(cursor):
+    try:
+        created_at, pk, direction = signing.loads(cursor, salt=CURSOR_SALT)
+    except (signing.BadSignature, TypeError, ValueError):
+        return None
+    created_at = parse_datetime(created_at) if isinstance(created_at, str) else None
+    if created_at is None or direction not in ("next", "prev"):
+        return None
+    return created_at, pk, direction
+
+
+def cursor_position(cursor):
+    """``(created_at, id, direction)`` of a cursor; ``None`` for a missing or invalid one."""
+    return _decode(cursor) if cursor else None
+
+
+def _page_query(queryset, position, per_page):
+    """The rows of one page plus one extra row that tells whether another page follows."""
+    if position is None:
+        return queryset.order_by("-created_at", "-id")[: per_page + 1]
+    created_at, pk, direction = position
+    if direction == "next":
+        return queryset.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk)).order_by(
+            "-created_at", "-id"
+        )[: per_page + 1]
+    return queryset.filter(Q(created_at__gt=created_at) | Q(created_at=created_at, id__gt=pk)).order_by(
+        "created_at", "id"
+    )[: per_page + 1]
+
+
+def _make_page(rows, position, per_page):
+    more = len(rows) > per_page
+    rows = rows[:per_page]
+    if position is None:
+        has_next, has_previous = more, False
+    elif position[2] == "next":
+        has_next, has_previous = more, True
+    else:
+        has_next, has_previous = True, more
+        rows = rows[::-1]
+    return KeysetPage(
+        object_list=rows,
+        next_cursor=_encode(rows[-1], "next") if rows and has_next else None,
+        previous_cursor=_encode(rows[0], "prev") if rows and has_previous else None,
+    )
+
+
+def keyset_paginate(queryset, cursor, per_page):
+    """Page a queryset newest first on ``(created_at, id)`` without COUNT or OFFSET.
+
+    ``cursor`` is an opaque token from a previous page's ``next_cursor`` or
+    ``previous_cursor``; a missing or invalid one gives the first page.
+    """
+    position = cursor_position(cursor)
+    rows = list(_page_query(queryset, position, per_page))
+    if position is not None and not rows:
+        return keyset_paginate(queryset, None, per_page)
+    return _make_page(rows, position, per_page)
+
+
+async def akeyset_paginate(queryset, cursor, per_page):
+    """Async ``keyset_paginate``."""
+    position = cursor_position(cursor)
+    rows = [row async for row in _page_query(queryset, position, per_page)]
+    if position is not None and not rows:
+        return await akeyset_paginate(queryset, None, per_page)
+    return _make_page(rows, position, per_page)
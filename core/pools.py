@@ -0,0 +1,221 @@
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Case, DecimalField, ExpressionWrapper, F, Q, Sum, Value, When
+
+from .models import Bet, BetPool
+from .versions import bump_contest_version
+
+# Share of a contest's exposure limit at which the contest list flags a candidate.
+EXPOSURE_WARNING_SHARE = Decimal("0.8")
+LIABILITY_FIELD = DecimalField(max_digits=18, decimal_places=4)
+
+
+class BettingSuspended(Exception):
+    """Raised inside the placement transaction when a slip would take a candidate's exposure to the contest limit."""
+
+    def __init__(self, candidate_ids):
+        super().__init__(f"Betting is suspended on candidates {sorted(candidate_ids)}")
+        self.candidate_ids = candidate_ids
+
+
+def _bump(contest_id, candidate_id, amount, liability):
+    pools = BetPool.objects.filter(contest_id=contest_id, candidate_id=candidate_id)
+    if pools.update(total=F("total") + amount, liability=F("liability") + liability):
+        return
+    pool, _ = BetPool.objects.get_or_create(contest_id=contest_id, candidate_id=candidate_id)
+    BetPool.objects.filter(pk=pool.pk).update(total=F("total") + amount, liability=F("liability") + liability)
+
+
+def add_stakes_to_pools(contest, stakes, liabilities):
+    """Add stakes and their potential payouts, mappings of candidate id to amount, to the pools.
+
+    Must be called inside the transaction that creates the bets; the
+    contest version is bumped now and once that transaction commits.
+    Liability is kept on candidate rows only; the contest row holds just
+    the stake total.
+    """
+    if not contest or not stakes:
+        return
+    amounts = {None: sum(stakes.values(), Decimal("0")), **stakes}
+    pools = BetPool.objects.filter(Q(candidate__isnull=True) | Q(candidate__in=stakes), contest_id=contest.pk)
+    # One grouped UPDATE covers every existing row; only first stakes on a
+    # candidate fall back to creating the row.
+    updated = pools.update(
+        total=F("total")
+        + Case(
+            When(candidate__isnull=True, then=Value(amounts[None])),
+            *[When(candidate_id=candidate_id, then=Value(amount)) for candidate_id, amount in stakes.items()],
+            output_field=DecimalField(max_digits=14, decimal_places=2),
+        ),
+        liability=F("liability")
+        + Case(
+            *[When(candidate_id=candidate_id, then=Value(payout)) for candidate_id, payout in liabilities.items()],
+            default=Value(Decimal("0")),
+            output_field=LIABILITY_FIELD,
+        ),
+    )
+    if updated < len(amounts):
+        existing = set(pools.values_list("candidate_id", flat=True))
+        for candidate_id, amount in amounts.items():
+            if candidate_id not in existing:
+                _bump(contest.pk, candidate_id, amount, liabilities.get(candidate_id, Decimal("0")))
+    bump_contest_version(contest.pk)
+
+
+def remove_stakes_from_pools(contest_id, stakes, liabilities):
+    """Take the stakes and payouts of deleted bets back out of the pools.
+
+    Call inside the transaction that deletes the bets. Rows already gone
+    with their candidate are skipped; the contest row always loses the
+    whole stake.
+    """
+    if not contest_id or not stakes:
+        return
+    total = sum(stakes.values(), Decimal("0"))
+    BetPool.objects.filter(Q(candidate__isnull=True) | Q(candidate__in=stakes), contest_id=contest_id).update(
+        total=F("total")
+        - Case(
+            When(candidate__isnull=True, then=Value(total)),
+            *[When(candidate_id=candidate_id, then=Value(amount)) for candidate_id, amount in stakes.items()],
+            output_field=DecimalField(max_digits=14, decimal_places=2),
+        ),
+        liability=F("liability")
+        - Case(
+            *[When(candidate_id=candidate_id, then=Value(payout)) for candidate_id, payout in liabilities.items()],
+            default=Value(Decimal("0")),
+            output_field=LIABILITY_FIELD,
+        ),
+    )
+    bump_contest_version(contest_id)
+
+
+def exposure_status(exposure, limit):
+    """``suspended`` once the exposure reaches the limit, ``warning`` from ``EXPOSURE_WARNING_SHARE`` of it."""
+    if limit is None:
+        return "ok"
+    if exposure >= limit:
+        return "suspended"
+    return "warning" if exposure >= limit * EXPOSURE_WARNING_SHARE else "ok"
+
+
+def check_exposure(contest, stakes, limit):
+    """Reject a slip that takes any of its candidates' exposure to ``limit`` or past it.
+
+    Call after ``add_stakes_to_pools`` in the same transaction, with the
+    limit read from the database in it: the pool rows are then
+    write-locked, so two slips cannot both fit under the limit. Raises
+    ``BettingSuspended``, which rolls the slip back.
+    """
+    if not contest or limit is None or not stakes:
+        return
+    pools = {
+        candidate_id: (total, liability)
+        for candidate_id, total, liability in BetPool.objects.filter(
+            Q(candidate__isnull=True) | Q(candidate__in=stakes), contest_id=contest.pk
+        ).values_list("candidate_id", "total", "liability")
+    }
+    pool_total = pools[None][0]
+    over = [candidate_id for candidate_id in stakes if exposure_status(pools[candidate_id][1] - pool_total, limit) == "suspended"]
+    if over:
+        raise BettingSuspended(over)
+
+
+def contest_exposures(contests):
+    """Attach ``exposures`` to each contest: per-candidate rows read from the pools, worst first.
+
+    Each row has the candidate, stake, liability (payout if she wins),
+    exposure (liability minus the contest pool, the house loss) and its
+    status against the contest limit. One query for all contests.
+    """
+    pools = list(BetPool.objects.filter(contest__in=contests).select_related("candidate"))
+    totals = {pool.contest_id: pool.total for pool in pools if pool.candidate_id is None}
+    by_contest = {}
+    for pool in pools:
+        if pool.candidate_id is not None:
+            by_contest.setdefault(pool.contest_id, []).append(pool)
+    for contest in contests:
+        pool_total = totals.get(contest.pk) or Decimal("0")
+        rows = []
+        for pool in by_contest.get(contest.pk, []):
+            exposure = pool.liability - pool_total
+            rows.append(
+                {
+                    "candidate": pool.candidate,
+                    "stake": pool.total,
+                    "liability": pool.liability.quantize(Decimal("0.01")),
+                    "exposure": exposure.quantize(Decimal("0.01")),
+                    "status": exposure_status(exposure, contest.exposure_limit),
+                }
+            )
+        rows.sort(key=lambda row: row["exposure"], reverse=True)
+        contest.exposures = rows
+    return contests
+
+
+def get_pool_totals(contest, candidate):
+    """Return ``(pool_total, candidate_total)`` for the contest in one query."""
+    rows = BetPool.objects.filter(
+        Q(candidate__isnull=True) | Q(candidate=candidate), contest=contest
+    ).values_list("candidate_id", "total")
+    totals = dict(rows)
+    return totals.get(None) or Decimal("0"), totals.get(candidate.pk) or Decimal("0")
+
+
+def get_candidate_pool_totals(contest, candidate_ids):
+    """Return ``(pool_total, {candidate_id: total})`` for several candidates in one query."""
+    rows = BetPool.objects.filter(
+        Q(candidate__isnull=True) | Q(candidate__in=candidate_ids), contest=contest
+    ).values_list("candidate_id", "total")
+    totals = dict(rows)
+    pool_total = totals.pop(None, None) or Decimal("0")
+    return pool_total, {candidate_id: totals.get(candidate_id) or Decimal("0") for candidate_id in candidate_ids}
+
+
+def _totals_from_bets(contest_id):
+    """``{candidate_id: (total, liability)}`` from the ``Bet`` table, with the contest row under ``None``."""
+    expected = {None: (Decimal("0"), Decimal("0"))}
+    rows = (
+        Bet.objects.filter(contest_id=contest_id)
+        .values("candidate_id")
+        .annotate(total=Sum("amount"), liability=Sum(ExpressionWrapper(F("amount") * F("coefficient"), output_field=LIABILITY_FIELD)))
+    )
+    for row in rows:
+        # SQLite sums the products as floats; round them back to the column's scale.
+        expected[row["candidate_id"]] = (row["total"], row["liability"].quantize(Decimal("0.0001")))
+        expected[None] = (expected[None][0] + row["total"], Decimal("0"))
+    return expected
+
+
+def rebuild_pools(contest_ids):
+    """Recompute pool rows of the given contests from the ``Bet`` table."""
+    for contest_id in contest_ids:
+        with transaction.atomic():
+            expected = _totals_from_bets(contest_id)
+            BetPool.objects.filter(contest_id=contest_id).delete()
+            BetPool.objects.bulk_create(
+                BetPool(contest_id=contest_id, candidate_id=candidate_id, total=total, liability=liability)
+                for candidate_id, (total, liability) in expected.items()
+            )
+            bump_contest_version(contest_id)
+
+
+def check_pools(contest_ids):
+    """Return ``(contest_id, candidate_id, field, stored, expected)`` for every pool value that drifted."""
+    mismatches = []
+    empty = (Decimal("0"), Decimal("0"))
+    for contest_id in contest_ids:
+        expected = _totals_from_bets(contest_id)
+        stored = {
+            candidate_id: (total, liability)
+            for candidate_id, total, liability in BetPool.objects.filter(contest_id=contest_id).values_list(
+                "candidate_id", "total", "liability"
+            )
+        }
+        for candidate_id in expected.keys() | stored.keys():
+            for field, stored_value, expected_value in zip(
+                ("total", "liability"), stored.get(candidate_id, empty), expected.get(candidate_id, empty)
+            ):
+                if stored_value != expected_value:
+                    mismatches.append((contest_id, candidate_id, field, stored_value, expected_value))
+    return mismatches
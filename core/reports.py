@@ -0,0 +1,96 @@
+from decimal import Decimal
+from itertools import chain
+
+from django.db.models import Count, DecimalField, ExpressionWrapper, F, Sum
+from django.utils import timezone
+
+from .exports import EXPORT_CHUNK_SIZE, csv_lines, jsonl_lines
+from .models import Bet
+
+REPORT_BET_FIELDS = ["bet_id", "created_at", "user", "candidate", "amount", "coefficient", "potential_payout", "paid_out"]
+REPORT_SUMMARY_FIELDS = ["candidate_id", "candidate", "bets", "pool", "liability"]
+
+
+def contest_bet_rows(contest):
+    """Every bet of a contest with its user and candidate, read in chunks from one joined query."""
+    bets = (
+        Bet.objects.filter(contest=contest)
+        .order_by("id")
+        .values_list(
+            "id", "created_at", "user__email", "candidate__last_name", "candidate__first_name",
+            "amount", "coefficient", "paid_out",
+        )
+    )
+    for bet_id, created_at, email, last_name, first_name, amount, coefficient, paid_out in bets.iterator(
+        chunk_size=EXPORT_CHUNK_SIZE
+    ):
+        yield {
+            "bet_id": bet_id,
+            "created_at": timezone.localtime(created_at).isoformat(timespec="seconds"),
+            "user": email,
+            "candidate": f"{last_name} {first_name}",
+            "amount": amount,
+            "coefficient": coefficient,
+            "potential_payout": (amount * coefficient).quantize(Decimal("0.01")),
+            "paid_out": paid_out,
+        }
+
+
+def contest_summary(contest):
+    """Bet count, pool and liability (total payout if she wins) per candidate, from one grouped query.
+
+    Liability sums the unrounded stake × odds products, so it can differ by
+    cents from the sum of per-bet payouts.
+    """
+    liability = ExpressionWrapper(F("amount") * F("coefficient"), output_field=DecimalField(max_digits=16, decimal_places=4))
+    rows = (
+        Bet.objects.filter(contest=contest)
+        .values("candidate_id", "candidate__last_name", "candidate__first_name")
+        .annotate(bets=Count("id"), pool=Sum("amount"), liability=Sum(liability))
+        .order_by("-liability", "candidate_id")
+    )
+    return [
+        {
+            "candidate_id": row["candidate_id"],
+            "candidate": f"{row['candidate__last_name']} {row['candidate__first_name']}",
+            "bets": row["bets"],
+            "pool": row["pool"].quantize(Decimal("0.01")),
+            "liability": row["liability"].quantize(Decimal("0.01")),
+        }
+        for row in rows
+    ]
+
+
+def _footer(contest):
+    """``(kind, row)`` pairs: a ``summary`` row per candidate, then the ``total``.
+
+    A generator, so the grouped query runs only after the bets have streamed.
+    The total's liability is the worst case, as only one candidate can win.
+    """
+    rows = contest_summary(contest)
+    for row in rows:
+        yield "summary", row
+    yield "total", {
+        "candidate_id": "",
+        "candidate": "Итого",
+        "bets": sum(row["bets"] for row in rows),
+        "pool": sum((row["pool"] for row in rows), Decimal("0.00")),
+        "liability": max((row["liability"] for row in rows), default=Decimal("0.00")),
+    }
+
+
+def contest_report_lines(contest, export_format):
+    """Export lines of a contest report: every bet, then the per-candidate summary as a footer.
+
+    In CSV the footer is a second table after a blank line; in JSONL every
+    object has a ``type`` of ``bet``, ``summary`` or ``total``.
+    """
+    if export_format == "csv":
+        return chain(
+            csv_lines(REPORT_BET_FIELDS, contest_bet_rows(contest)),
+            ["\r\n"],
+            csv_lines(REPORT_SUMMARY_FIELDS, (row for _, row in _footer(contest)), bom=False),
+        )
+    bets = ({"type": "bet", **row} for row in contest_bet_rows(contest))
+    footer = ({"type": kind, **row} for kind, row in _footer(contest))
+    return jsonl_lines(chain(bets, footer))
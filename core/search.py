@@ -0,0 +1,116 @@
+import re
+
+from django.db import DEFAULT_DB_ALIAS, OperationalError, connections
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+FTS_TABLE = "core_candidate_fts"
+FTS_COLUMNS = ("first_name", "last_name", "patronymic", "info", "group")
+# bm25 weights in FTS_COLUMNS order: a hit in a name outranks repeats in the description.
+FTS_WEIGHTS = (10.0, 10.0, 5.0, 1.0, 5.0)
+
+_columns = ", ".join(f'"{column}"' for column in FTS_COLUMNS)
+_new_values = ", ".join(f'new."{column}"' for column in FTS_COLUMNS)
+_old_values = ", ".join(f'old."{column}"' for column in FTS_COLUMNS)
+
+# External-content FTS5 table over core_candidate, kept in sync by triggers so
+# that bulk inserts and queryset updates are indexed too.
+FTS_SCHEMA = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        {_columns}, content='core_candidate', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON core_candidate BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, {_columns}) VALUES (new.id, {_new_values});
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON core_candidate BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {_columns}) VALUES ('delete', old.id, {_old_values});
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE ON core_candidate BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {_columns}) VALUES ('delete', old.id, {_old_values});
+        INSERT INTO {FTS_TABLE}(rowid, {_columns}) VALUES (new.id, {_new_values});
+    END""",
+]
+
+_available = {}
+
+
+def _schema_objects(cursor):
+    cursor.execute(
+        "SELECT name FROM sqlite_master WHERE name = %s OR (type = 'trigger' AND tbl_name = 'core_candidate')",
+        [FTS_TABLE],
+    )
+    return {name for (name,) in cursor.fetchall()}
+
+
+def ensure_search_index(using=DEFAULT_DB_ALIAS):
+    """Create the FTS table and triggers if missing; return True when anything was created.
+
+    SQLite drops triggers when Django remakes ``core_candidate`` during a
+    migration, so this runs after every ``migrate``.
+    """
+    connection = connections[using]
+    if connection.vendor != "sqlite":
+        return False
+    with connection.cursor() as cursor:
+        existing = _schema_objects(cursor)
+        expected = {FTS_TABLE, f"{FTS_TABLE}_ai", f"{FTS_TABLE}_ad", f"{FTS_TABLE}_au"}
+        if expected <= existing:
+            return False
+        try:
+            for statement in FTS_SCHEMA:
+                cursor.execute(statement)
+        except OperationalError:
+            # SQLite built without FTS5: search keeps using LIKE.
+            return False
+    _available.pop(using, None)
+    return True
+
+
+def rebuild_search_index(using=DEFAULT_DB_ALIAS):
+    """Re-read every candidate into the FTS table; return False when FTS5 is unavailable."""
+    ensure_search_index(using)
+    if not fts_available(using):
+        return False
+    with connections[using].cursor() as cursor:
+        cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+    return True
+
+
+def fts_available(using=DEFAULT_DB_ALIAS):
+    if using not in _available:
+        connection = connections[using]
+        if connection.vendor != "sqlite":
+            _available[using] = False
+        else:
+            with connection.cursor() as cursor:
+                _available[using] = FTS_TABLE in _schema_objects(cursor)
+    return _available[using]
+
+
+def _match_expression(query):
+    # Every word must match as a prefix; quoting keeps FTS operators in user input literal.
+    return " ".join(f'"{word}"*' for word in re.findall(r"\w+", query))
+
+
+def search_candidates(queryset, query):
+    """Filter candidates by a search query, best matches first.
+
+    Uses the FTS5 index with prefix matching and weighted bm25 ranking when the
+    database has it, and falls back to ``icontains`` over the same fields.
+    """
+    match = _match_expression(query)
+    if match and fts_available(queryset.db):
+        rank = RawSQL(
+            f"SELECT bm25({FTS_TABLE}, {', '.join(map(str, FTS_WEIGHTS))}) FROM {FTS_TABLE} "
+            f"WHERE {FTS_TABLE} MATCH %s AND rowid = core_candidate.id",
+            [match],
+        )
+        matched_ids = RawSQL(f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", [match])
+        return queryset.filter(id__in=matched_ids).annotate(search_rank=rank).order_by("search_rank", "id")
+    return queryset.filter(
+        Q(first_name__icontains=query)
+        | Q(last_name__icontains=query)
+        | Q(patronymic__icontains=query)
+        | Q(info__icontains=query)
+        | Q(group__icontains=query)
+    )
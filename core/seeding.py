@@ -0,0 +1,177 @@
+import itertools
+import random
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .ledger import open_accounts
+from .models import Bet, Candidate, Contest
+from .pools import rebuild_pools
+from .stats import rebuild_user_stats
+
+SEED_PASSWORD = "seed-pass-1234"
+FIRST_NAMES = ("Анна", "Мария", "Екатерина", "Дарья", "Полина", "Алиса", "Софья", "Виктория", "Ксения", "Елизавета")
+LAST_NAMES = ("Иванова", "Петрова", "Смирнова", "Кузнецова", "Попова", "Соколова", "Лебедева", "Козлова", "Новикова", "Морозова")
+PATRONYMICS = ("Сергеевна", "Андреевна", "Игоревна", "Дмитриевна", "Алексеевна", "Павловна")
+GROUPS = ("КН", "ПМИ", "ИС", "БИ", "ФИТ", "МО")
+INFOS = ("активистка", "волонтёр", "спортсменка", "участница олимпиад", "староста группы", "танцует", "поёт в хоре")
+STAKES = (10, 20, 50, 100, 200, 500, 1000)
+STAKE_WEIGHTS = (25, 25, 20, 15, 8, 5, 2)
+
+
+def zipf_weights(count, exponent):
+    """Cumulative weights where the item of rank ``r`` is ``1 / r**exponent`` as popular."""
+    return list(itertools.accumulate(1 / rank**exponent for rank in range(1, count + 1)))
+
+
+def batched(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(itertools.islice(iterator, size)):
+        yield batch
+
+
+def _insert_bets(batch):
+    """Insert generated bets, keeping their ``created_at``.
+
+    ``bulk_create`` stamps ``auto_now_add`` fields with the current time, so
+    the generated times are written back by primary key in the same
+    transaction; the shared model field is left alone. A plain
+    ``executemany`` costs a fraction of ``bulk_update`` here.
+    """
+    created_at = [bet.created_at for bet in batch]
+    field = Bet._meta.get_field("created_at")
+    quote = connection.ops.quote_name
+    sql = f"UPDATE {quote(Bet._meta.db_table)} SET {quote(field.column)} = %s WHERE {quote(Bet._meta.pk.column)} = %s"
+    with transaction.atomic():
+        Bet.objects.bulk_create(batch)
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                sql, [(field.get_db_prep_value(value, connection), bet.pk) for bet, value in zip(batch, created_at)]
+            )
+
+
+def _noop_progress(stage, done, total):
+    pass
+
+
+def _create_users(rng, count, batch_size, progress):
+    User = get_user_model()
+    offset = User.objects.count()
+    password = make_password(SEED_PASSWORD)
+    created = []
+    for batch in batched(range(offset, offset + count), batch_size):
+        users = []
+        for i in batch:
+            first_name, last_name = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            users.append(
+                User(
+                    email=f"seed-{i}@example.com",
+                    username=f"seed-{i}@example.com",
+                    first_name=first_name,
+                    last_name=last_name,
+                    patronymic=rng.choice(PATRONYMICS),
+                    course=rng.randint(1, 4),
+                    group=f"{rng.choice(GROUPS)}-{rng.randint(1, 4)}{rng.randint(1, 3)}",
+                    password=password,
+                    balance=Decimal(rng.choice((0, 100, 500, 1000, 1000, 5000))),
+                )
+            )
+        with transaction.atomic():
+            created += User.objects.bulk_create(users)
+            open_accounts(users)
+        progress("users", len(created), count)
+    return created
+
+
+def _create_candidates(rng, count, batch_size, progress):
+    created = []
+    for batch in batched(range(count), batch_size):
+        candidates = [
+            Candidate(
+                first_name=rng.choice(FIRST_NAMES),
+                last_name=rng.choice(LAST_NAMES),
+                patronymic=rng.choice(PATRONYMICS),
+                course=rng.randint(1, 4),
+                group=f"{rng.choice(GROUPS)}-{rng.randint(1, 4)}{rng.randint(1, 3)}",
+                info=", ".join(rng.sample(INFOS, 2)).capitalize(),
+            )
+            for _ in batch
+        ]
+        with transaction.atomic():
+            created += Candidate.objects.bulk_create(candidates)
+        progress("candidates", len(created), count)
+    return created
+
+
+def _create_contests(rng, candidates, count, participants):
+    """Past contests with a winner, then one open contest."""
+    now = timezone.now()
+    contests = []
+    for index in range(count):
+        is_open = index == count - 1
+        ends_at = now + timedelta(days=7) if is_open else now - timedelta(days=30 * (count - 1 - index) + 1)
+        lineup = rng.sample(candidates, min(participants, len(candidates)))
+        contest = Contest.objects.create(name=f"Конкурс {index + 1}", ends_at=ends_at)
+        contest.participants.add(*lineup)
+        contests.append((contest, lineup, ends_at - timedelta(days=30)))
+        if not is_open:
+            # The most popular candidate usually wins; keep some upsets.
+            contest.winner = lineup[0] if rng.random() < 0.6 else rng.choice(lineup)
+            Contest.objects.filter(pk=contest.pk).update(winner=contest.winner)
+    return contests
+
+
+def _bets(rng, users, contests, count):
+    # Plain ids keep the per-row cost of building Bet objects low.
+    user_ids = [user.pk for user in users]
+    user_weights = zipf_weights(len(user_ids), 1.1)
+    now = timezone.now()
+    per_contest = [
+        (contest.pk, contest.winner_id, [candidate.pk for candidate in lineup], zipf_weights(len(lineup), 1.2), opened_at, min(contest.ends_at, now) - opened_at)
+        for contest, lineup, opened_at in contests
+    ]
+    for _ in range(count):
+        contest_id, winner_id, candidate_ids, candidate_weights, opened_at, duration = rng.choice(per_contest)
+        candidate_id = rng.choices(candidate_ids, cum_weights=candidate_weights)[0]
+        yield Bet(
+            user_id=rng.choices(user_ids, cum_weights=user_weights)[0],
+            candidate_id=candidate_id,
+            contest_id=contest_id,
+            amount=Decimal(rng.choices(STAKES, weights=STAKE_WEIGHTS)[0]),
+            coefficient=Decimal(rng.randint(110, 1000)) / 100,
+            created_at=opened_at + duration * rng.random(),
+            paid_out=winner_id == candidate_id,
+        )
+
+
+def generate_dataset(users=5000, candidates=300, contests=6, participants=40, bets=1_000_000, seed=0, batch_size=5000, progress=None):
+    """Fill the database with a production-size synthetic dataset.
+
+    Bets are streamed in ``batch_size`` chunks and favour popular users and
+    candidates (Zipf-like), so a few rows dominate as on the live site.
+    Past contests get a winner and their winning bets are already marked
+    paid out. Pools and per-user stats are rebuilt at the end. The same
+    ``seed`` on an empty database produces the same data.
+    """
+    progress = progress or _noop_progress
+    rng = random.Random(seed)
+    user_objs = _create_users(rng, users, batch_size, progress)
+    candidate_objs = _create_candidates(rng, candidates, batch_size, progress)
+    contest_rows = _create_contests(rng, candidate_objs, contests, participants)
+    created = 0
+    for batch in batched(_bets(rng, user_objs, contest_rows, bets), batch_size):
+        _insert_bets(batch)
+        created += len(batch)
+        progress("bets", created, bets)
+    contest_ids = [contest.pk for contest, _, _ in contest_rows]
+    rebuild_pools(contest_ids)
+    progress("pools", len(contest_ids), len(contest_ids))
+    user_ids = [user.pk for user in user_objs]
+    for start in range(0, len(user_ids), 1000):
+        rebuild_user_stats(user_ids[start:start + 1000])
+        progress("stats", min(start + 1000, len(user_ids)), len(user_ids))
+    return {"users": len(user_objs), "candidates": len(candidate_objs), "contests": len(contest_ids), "bets": created}
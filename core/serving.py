@@ -0,0 +1,193 @@
+import gzip
+import mimetypes
+import os
+import re
+import stat
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage, staticfiles_storage
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404, HttpResponse, HttpResponseNotModified, StreamingHttpResponse
+from django.utils._os import safe_join
+from django.utils.cache import patch_vary_headers
+from django.utils.http import http_date, parse_http_date_safe
+from django.views.decorators.http import require_safe
+
+COMPRESSIBLE_EXTENSIONS = {".css", ".js", ".mjs", ".map", ".json", ".svg", ".txt", ".html", ".xml", ".ico"}
+# Below this, the gzip header and the extra file are not worth it.
+MIN_COMPRESS_SIZE = 256
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+STATIC_CACHE_CONTROL = "public, max-age=300"
+# Thumbnails are re-rendered under the same name, so photos are revalidated daily.
+MEDIA_CACHE_CONTROL = "public, max-age=86400"
+RANGE_BLOCK_SIZE = 64 * 1024
+
+_RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def compress_file(path):
+    """Write ``path.gz`` next to a file when it is compressible and gzip makes it smaller.
+
+    Returns whether the compressed copy was written.
+    """
+    path = Path(path)
+    if path.suffix.lower() not in COMPRESSIBLE_EXTENSIONS:
+        return False
+    data = path.read_bytes()
+    if len(data) < MIN_COMPRESS_SIZE:
+        return False
+    # mtime=0 keeps the output identical across builds.
+    compressed = gzip.compress(data, compresslevel=9, mtime=0)
+    if len(compressed) >= len(data) * 0.95:
+        return False
+    Path(f"{path}.gz").write_bytes(compressed)
+    return True
+
+
+class PrecompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """Manifest storage whose ``collectstatic`` also writes gzip copies of the hashed files."""
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run, **options)
+        if dry_run:
+            return
+        for hashed_name in set(self.hashed_files.values()):
+            compress_file(self.path(hashed_name))
+
+
+def _etag(st):
+    return f'"{st.st_size:x}-{st.st_mtime_ns:x}"'
+
+
+def _not_modified(request, etag, mtime):
+    if_none_match = request.headers.get("If-None-Match")
+    if if_none_match is not None:
+        return etag in [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")] or if_none_match.strip() == "*"
+    since = parse_http_date_safe(request.headers.get("If-Modified-Since") or "")
+    return since is not None and int(mtime) <= since
+
+
+def _requested_range(request, size, etag):
+    """``(start, end)`` of a single satisfiable byte range, ``None`` for the whole file, or ``False``."""
+    header = request.headers.get("Range")
+    if not header or size == 0:
+        return None
+    if_range = request.headers.get("If-Range")
+    if if_range and if_range.strip() != etag:
+        return None
+    match = _RANGE.match(header.strip())
+    if not match or match.groups() == ("", ""):
+        # Several ranges or another unit: answering with the whole file is allowed.
+        return None
+    first, last = match.groups()
+    if not first:
+        start, end = max(size - int(last), 0), size - 1
+    else:
+        start, end = int(first), min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        return False
+    return start, end
+
+
+def _read_range(path, start, length):
+    with open(path, "rb") as handle:
+        handle.seek(start)
+        while length > 0:
+            block = handle.read(min(RANGE_BLOCK_SIZE, length))
+            if not block:
+                break
+            length -= len(block)
+            yield block
+
+
+def file_response(request, path, cache_control, content_type=None, encoding=None):
+    """Serve a file with validators, conditional GET and single byte-range support.
+
+    ``path`` must already be resolved inside a served directory.
+    """
+    st = os.stat(path)
+    etag = _etag(st)
+    if content_type is None:
+        content_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+    if _not_modified(request, etag, st.st_mtime):
+        response = HttpResponseNotModified()
+    else:
+        byte_range = _requested_range(request, st.st_size, etag)
+        if byte_range is False:
+            response = HttpResponse(status=416)
+            response["Content-Range"] = f"bytes */{st.st_size}"
+        elif byte_range:
+            start, end = byte_range
+            response = StreamingHttpResponse(_read_range(path, start, end - start + 1), status=206, content_type=content_type)
+            response["Content-Range"] = f"bytes {start}-{end}/{st.st_size}"
+            response["Content-Length"] = str(end - start + 1)
+        else:
+            # Under ASGI Django reads the file in chunks; a WSGI server may use wsgi.file_wrapper.
+            response = FileResponse(open(path, "rb"), content_type=content_type)
+        if encoding and response.status_code != 416:
+            response["Content-Encoding"] = encoding
+        response["Accept-Ranges"] = "bytes"
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(st.st_mtime)
+    response["Cache-Control"] = cache_control
+    return response
+
+
+def _resolve(root, name):
+    try:
+        path = safe_join(root, name)
+    except (SuspiciousFileOperation, ValueError):
+        return None
+    try:
+        st = os.stat(path)
+    except (OSError, ValueError):
+        return None
+    return path if stat.S_ISREG(st.st_mode) else None
+
+
+class StaticFilesMiddleware:
+    """Serve ``STATIC_ROOT`` in front of the app, as built by ``collectstatic``.
+
+    Hashed names from the manifest are cached as immutable; a gzip copy is
+    sent instead of the file when the client accepts it. Requests for
+    files that do not exist fall through to the views.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.prefix = "/" + settings.STATIC_URL.lstrip("/")
+        self.root = settings.STATIC_ROOT
+        hashed_files = getattr(staticfiles_storage, "hashed_files", {})
+        self.immutable = set(hashed_files.values())
+
+    def __call__(self, request):
+        if request.method in ("GET", "HEAD") and self.root and request.path.startswith(self.prefix):
+            response = self.serve(request, request.path[len(self.prefix) :])
+            if response is not None:
+                return response
+        return self.get_response(request)
+
+    def serve(self, request, name):
+        path = _resolve(self.root, name)
+        if path is None or name.endswith(".gz"):
+            return None
+        cache_control = IMMUTABLE_CACHE_CONTROL if name in self.immutable else STATIC_CACHE_CONTROL
+        content_type = mimetypes.guess_type(path)[0]
+        compressed = _resolve(self.root, f"{name}.gz")
+        if compressed and "gzip" in request.headers.get("Accept-Encoding", ""):
+            response = file_response(request, compressed, cache_control, content_type, encoding="gzip")
+        else:
+            response = file_response(request, path, cache_control, content_type)
+        if compressed:
+            patch_vary_headers(response, ["Accept-Encoding"])
+        return response
+
+
+@require_safe
+def serve_media(request, path):
+    """Serve an uploaded candidate photo or thumbnail with range support."""
+    resolved = _resolve(Path(settings.MEDIA_ROOT) / "candidates", path)
+    if resolved is None:
+        raise Http404
+    return file_response(request, resolved, MEDIA_CACHE_CONTROL)
@@ -0,0 +1,100 @@
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Case, DecimalField, F, Value, When
+from django.utils import timezone
+
+from .db import retry_on_lock
+from .ledger import record_payouts
+from .models import Bet
+from .stats import add_winnings
+
+SETTLEMENT_CHUNK_SIZE = 500
+
+
+@dataclass
+class SettlementReport:
+    contest_id: int
+    bets_settled: int = 0
+    users_credited: int = 0
+    total_paid: Decimal = Decimal("0.00")
+    duration: float = 0.0
+
+    def __str__(self):
+        return (
+            f"Contest {self.contest_id}: {self.bets_settled} bets settled, "
+            f"{self.users_credited} users credited, {self.total_paid} paid in {self.duration:.2f}s"
+        )
+
+
+def is_settleable(contest):
+    return bool(contest and contest.winner_id and contest.ends_at <= timezone.now())
+
+
+@retry_on_lock
+def settle_chunk(contest, after_id=0, chunk_size=SETTLEMENT_CHUNK_SIZE):
+    """Pay out the next chunk of unpaid winning bets with ``id > after_id``.
+
+    Bets are flagged and users credited in one short transaction: one
+    UPDATE for the bets, grouped UPDATEs for the balances and stats and a
+    bulk insert of the ledger credits.
+    Returns ``(last_bet_id, bets_settled, credits_by_user)``; ``last_bet_id``
+    is ``None`` when nothing is left to settle.
+    """
+    User = get_user_model()
+    with transaction.atomic():
+        rows = list(
+            Bet.objects.select_for_update()
+            .filter(contest=contest, candidate_id=contest.winner_id, paid_out=False, id__gt=after_id)
+            .order_by("id")
+            .values_list("id", "user_id", "amount", "coefficient")[:chunk_size]
+        )
+        if not rows:
+            return None, 0, {}
+        bet_ids = [bet_id for bet_id, _, _, _ in rows]
+        payouts = [
+            (bet_id, user_id, (amount * coefficient).quantize(Decimal("0.01")))
+            for bet_id, user_id, amount, coefficient in rows
+        ]
+        credits = defaultdict(Decimal)
+        for _, user_id, payout in payouts:
+            credits[user_id] += payout
+        settled = Bet.objects.filter(pk__in=bet_ids, paid_out=False).update(paid_out=True)
+        User.objects.filter(pk__in=credits).update(
+            balance=F("balance")
+            + Case(
+                *[When(pk=user_id, then=Value(total)) for user_id, total in credits.items()],
+                output_field=DecimalField(max_digits=10, decimal_places=2),
+            )
+        )
+        add_winnings(credits)
+        record_payouts(payouts)
+    return bet_ids[-1], settled, dict(credits)
+
+
+def settle_contest(contest, chunk_size=SETTLEMENT_CHUNK_SIZE):
+    """Pay out every unpaid winning bet of a finished contest.
+
+    Safe to run repeatedly: only bets with ``paid_out=False`` are credited,
+    so a second run settles nothing.
+    """
+    report = SettlementReport(contest_id=contest.pk if contest else None)
+    if not is_settleable(contest):
+        return report
+    started = time.monotonic()
+    credited_users = set()
+    last_id = 0
+    while True:
+        last_id, settled, credits = settle_chunk(contest, last_id, chunk_size)
+        if last_id is None:
+            break
+        report.bets_settled += settled
+        report.total_paid += sum(credits.values(), Decimal("0.00"))
+        credited_users.update(credits)
+    report.users_credited = len(credited_users)
+    report.duration = time.monotonic() - started
+    return report
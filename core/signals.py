@@ -0,0 +1,62 @@
+from django.db.models.signals import m2m_changed, post_delete, post_migrate, post_save
+from django.dispatch import receiver
+
+from .contests import invalidate_current_contest
+from .images import update_photo_variants
+from .ledger import open_accounts
+from .models import Bet, Candidate, Contest, CustomUser
+from .pools import remove_stakes_from_pools
+from .search import ensure_search_index, rebuild_search_index
+from .stats import remove_bet
+from .versions import bump_user_bets_version
+
+
+@receiver(post_save, sender=Contest)
+@receiver(post_delete, sender=Contest)
+@receiver(m2m_changed, sender=Contest.participants.through)
+def contest_changed(sender, **kwargs):
+    invalidate_current_contest()
+
+
+@receiver(post_save, sender=Candidate)
+def candidate_saved(sender, instance, raw=False, **kwargs):
+    if not raw:
+        update_photo_variants(instance)
+    # The contest API serves candidate fields under the current contest version.
+    invalidate_current_contest()
+
+
+@receiver(post_delete, sender=Candidate)
+def candidate_deleted(sender, **kwargs):
+    # Participant rows go away with the candidate without an m2m_changed signal.
+    invalidate_current_contest()
+
+
+@receiver(post_save, sender=Bet)
+@receiver(post_delete, sender=Bet)
+def bet_changed(sender, instance, **kwargs):
+    # Bets placed through a slip are bulk-created and bump the version in place_slip.
+    bump_user_bets_version(instance.user_id)
+
+
+@receiver(post_delete, sender=Bet)
+def bet_deleted(sender, instance, **kwargs):
+    # Also sent for bets cascading with their candidate or user.
+    remove_stakes_from_pools(
+        instance.contest_id,
+        {instance.candidate_id: instance.amount},
+        {instance.candidate_id: instance.amount * instance.coefficient},
+    )
+    remove_bet(instance)
+
+
+@receiver(post_save, sender=CustomUser)
+def user_saved(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        open_accounts([instance])
+
+
+@receiver(post_migrate)
+def search_index_after_migrate(sender, using, **kwargs):
+    if sender.name == "core" and ensure_search_index(using):
+        rebuild_search_index(using)
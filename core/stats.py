@@ -0,0 +1,116 @@
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Case, DecimalField, F, OuterRef, Subquery, Value, When
+
+from .models import Bet, UserBetStats
+
+STAT_FIELDS = ("bet_count", "total_staked", "total_won", "last_bet_id")
+
+
+def _ensure_rows(user_ids):
+    missing = set(user_ids) - set(UserBetStats.objects.filter(user_id__in=user_ids).values_list("user_id", flat=True))
+    if missing:
+        UserBetStats.objects.bulk_create(
+            [UserBetStats(user_id=user_id) for user_id in missing], ignore_conflicts=True
+        )
+
+
+def add_bets(user_id, bets):
+    """Count newly created bets of one user; ``bets`` must be ordered oldest first.
+
+    Call inside the transaction that creates the bets.
+    """
+    if not bets:
+        return
+    values = {
+        "bet_count": F("bet_count") + len(bets),
+        "total_staked": F("total_staked") + sum((bet.amount for bet in bets), Decimal("0")),
+        "last_bet": bets[-1],
+    }
+    if not UserBetStats.objects.filter(user_id=user_id).update(**values):
+        _ensure_rows([user_id])
+        UserBetStats.objects.filter(user_id=user_id).update(**values)
+
+
+def remove_bet(bet):
+    """Take a deleted bet out of its user's stats, inside the deleting transaction.
+
+    The row's ``last_bet`` was already nulled by the delete; it moves back
+    to the user's latest remaining bet.
+    """
+    won = (bet.amount * bet.coefficient).quantize(Decimal("0.01")) if bet.paid_out else Decimal("0")
+    rows = UserBetStats.objects.filter(user_id=bet.user_id)
+    rows.update(
+        bet_count=F("bet_count") - 1,
+        total_staked=F("total_staked") - bet.amount,
+        total_won=F("total_won") - won,
+    )
+    latest = Bet.objects.filter(user_id=OuterRef("user_id")).order_by("-created_at", "-id").values("id")[:1]
+    rows.filter(last_bet__isnull=True).update(last_bet=Subquery(latest))
+
+
+def add_winnings(credits):
+    """Add settled payouts, a mapping of user id to amount, in one grouped UPDATE."""
+    if not credits:
+        return
+    _ensure_rows(credits)
+    UserBetStats.objects.filter(user_id__in=credits).update(
+        total_won=F("total_won")
+        + Case(
+            *[When(user_id=user_id, then=Value(total)) for user_id, total in credits.items()],
+            output_field=DecimalField(max_digits=14, decimal_places=2),
+        )
+    )
+
+
+def get_user_stats(user):
+    stats = UserBetStats.objects.select_related("last_bet").filter(user=user).first()
+    return stats or UserBetStats(user=user)
+
+
+def _expected_stats(user_ids):
+    expected = defaultdict(lambda: {"bet_count": 0, "total_staked": Decimal("0"), "total_won": Decimal("0"), "last_bet_id": None})
+    rows = (
+        Bet.objects.filter(user_id__in=user_ids)
+        .order_by("user_id", "created_at", "id")
+        .values_list("id", "user_id", "amount", "coefficient", "paid_out")
+    )
+    for bet_id, user_id, amount, coefficient, paid_out in rows.iterator(chunk_size=2000):
+        stats = expected[user_id]
+        stats["bet_count"] += 1
+        stats["total_staked"] += amount
+        if paid_out:
+            stats["total_won"] += (amount * coefficient).quantize(Decimal("0.01"))
+        stats["last_bet_id"] = bet_id
+    return expected
+
+
+def reconcile_user_stats(user_ids, fix=False):
+    """Compare stats rows with the raw bets; return ``(user_id, field, stored, expected)`` mismatches.
+
+    With ``fix=True`` the drifted rows are rewritten from the bets.
+    """
+    expected = _expected_stats(user_ids)
+    stored = {stats.user_id: stats for stats in UserBetStats.objects.filter(user_id__in=user_ids)}
+    mismatches = []
+    for user_id in user_ids:
+        row = stored.get(user_id) or UserBetStats(user_id=user_id)
+        wanted = expected[user_id]
+        drifted = [field for field in STAT_FIELDS if getattr(row, field) != wanted[field]]
+        mismatches.extend((user_id, field, getattr(row, field), wanted[field]) for field in drifted)
+        if fix and drifted:
+            with transaction.atomic():
+                UserBetStats.objects.update_or_create(user_id=user_id, defaults=wanted)
+    return mismatches
+
+
+def rebuild_user_stats(user_ids):
+    """Replace the stats rows of the given users with ones recomputed from their bets."""
+    expected = _expected_stats(user_ids)
+    with transaction.atomic():
+        UserBetStats.objects.filter(user_id__in=user_ids).delete()
+        UserBetStats.objects.bulk_create(
+            [UserBetStats(user_id=user_id, **expected[user_id]) for user_id in user_ids], batch_size=1000
+        )
@@ -0,0 +1,65 @@
+import io
+import json
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from core import analytics
+from core.models import Bet, Candidate, Contest, CustomUser
+
+
+class ContestAnalyticsTests(TestCase):
+    def setUp(self):
+        user = CustomUser.objects.create_user(email="user@example.com", username="user@example.com", password="pass1234")
+        self.ann = Candidate.objects.create(first_name="Ann", last_name="Smith", course=1, group="A-1")
+        self.eve = Candidate.objects.create(first_name="Eve", last_name="Jones", course=1, group="A-1")
+        self.contest = Contest.objects.create(name="Осень", ends_at=timezone.now() + timedelta(days=1))
+        other = Contest.objects.create(name="Зима", ends_at=timezone.now() + timedelta(days=2))
+        start = timezone.now() - timedelta(hours=10)
+        bets = [
+            (self.ann, "10.00", "2.00", 0),
+            (self.ann, "30.00", "3.00", 9),
+            (self.eve, "40.00", "1.50", 1),
+            (self.eve, "20.00", "1.20", 10),
+        ]
+        for candidate, amount, coefficient, hour in bets:
+            bet = Bet.objects.create(user=user, candidate=candidate, contest=self.contest, amount=Decimal(amount), coefficient=Decimal(coefficient))
+            Bet.objects.filter(pk=bet.pk).update(created_at=start + timedelta(hours=hour))
+        Bet.objects.create(user=user, candidate=self.eve, contest=other, amount=Decimal("99.00"), coefficient=Decimal("2.00"))
+
+    def test_per_candidate_stake_liability_and_exposure(self):
+        summary = analytics.contest_analytics(self.contest, buckets=2)
+        self.assertEqual(summary["bets"], 4)
+        self.assertEqual(summary["total_stake"], 100.0)
+        rows = {row["candidate_id"]: row for row in summary["candidates"]}
+        self.assertEqual((rows[self.ann.pk]["stake"], rows[self.ann.pk]["liability"]), (40.0, 110.0))
+        self.assertEqual((rows[self.eve.pk]["stake"], rows[self.eve.pk]["liability"]), (60.0, 84.0))
+        self.assertEqual(rows[self.ann.pk]["house_result_if_wins"], -10.0)
+        self.assertEqual(summary["worst_case_house_result"], -10.0)
+        # Worst outcome for the house comes first.
+        self.assertEqual(summary["candidates"][0]["candidate_id"], self.ann.pk)
+        self.assertEqual(summary["stake_max"], 40.0)
+        self.assertEqual(summary["stake_quantiles"]["p50"], 25.0)
+
+    def test_coefficient_drift_by_time_slice(self):
+        columns = analytics.load_contest_columns(self.contest)
+        drift = analytics.coefficient_drift(columns, buckets=2)
+        ann = list(columns.candidate_ids).index(self.ann.pk)
+        self.assertEqual(drift.shape, (2, 2))
+        self.assertEqual(list(drift[ann]), [2.0, 3.0])
+        summary = analytics.contest_analytics(self.contest, buckets=2)
+        eve = next(row for row in summary["candidates"] if row["candidate_id"] == self.eve.pk)
+        self.assertEqual((eve["opening_coefficient"], eve["closing_coefficient"]), (1.5, 1.2))
+
+    def test_command(self):
+        out = io.StringIO()
+        call_command("contest_analytics", self.contest.pk, "--json", stdout=out)
+        self.assertEqual(json.loads(out.getvalue())["total_stake"], 100.0)
+        empty = Contest.objects.create(name="Весна", ends_at=timezone.now() + timedelta(days=3))
+        with self.assertRaisesMessage(CommandError, "no bets"):
+            call_command("contest_analytics", empty.pk)
+        with self.assertRaisesMessage(CommandError, "does not exist"):
+            call_command("contest_analytics", 999)
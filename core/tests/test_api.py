@@ -0,0 +1,67 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from core.models import Candidate, Contest, CustomUser
+
+
+class ContestApiTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = CustomUser.objects.create_user(email="user@example.com", username="user@example.com", password="pass1234")
+        self.candidates = [
+            Candidate.objects.create(first_name=f"Ann{i}", last_name="Smith", course=1, group="A-1") for i in range(3)
+        ]
+        self.contest = Contest.objects.create(name="Miss Test", ends_at=timezone.now() + timedelta(days=1))
+        self.contest.participants.add(*self.candidates)
+        self.client.force_login(self.user)
+        self.url = reverse("api-contest")
+
+    def test_lists_candidates_with_odds(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data["contest"]["id"], self.contest.pk)
+        self.assertEqual(data["count"], 3)
+        self.assertEqual([row["id"] for row in data["candidates"]], [candidate.pk for candidate in self.candidates])
+        self.assertEqual(data["candidates"][0]["coefficient"], "1.10")
+        self.assertNotIn(b", ", response.content)
+        self.assertTrue(response["ETag"])
+        self.assertTrue(response["Last-Modified"])
+
+    def test_unchanged_poll_is_not_modified_without_reading_bets(self):
+        etag = self.client.get(self.url)["ETag"]
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url, headers={"if-none-match": etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertFalse([q for q in queries.captured_queries if "core_bet" in q["sql"]])
+
+        self.client.post(reverse("candidate-detail", args=[self.candidates[0].pk]), {"amount": "50"})
+        response = self.client.get(self.url, headers={"if-none-match": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_contest_ending_changes_etag_without_any_write(self):
+        response = self.client.get(self.url)
+        etag, last_modified = response["ETag"], response["Last-Modified"]
+        later = timezone.now() + timedelta(days=2)
+        with mock.patch("django.utils.timezone.now", return_value=later):
+            response = self.client.get(self.url, headers={"if-none-match": etag, "if-modified-since": last_modified})
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.json()["contest"]["is_open"])
+        self.assertNotEqual(response["Last-Modified"], last_modified)
+
+    def test_candidate_edit_changes_etag_and_login_is_required(self):
+        etag = self.client.get(self.url)["ETag"]
+        self.candidates[1].first_name = "Eve"
+        self.candidates[1].save()
+        self.assertEqual(self.client.get(self.url, headers={"if-none-match": etag}).status_code, 200)
+
+        self.client.logout()
+        self.assertEqual(self.client.get(self.url).status_code, 401)
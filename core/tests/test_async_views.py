@@ -0,0 +1,75 @@
+import re
+from datetime import timedelta
+from decimal import Decimal
+from urllib.parse import unquote
+
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.http import Http404
+from django.test import RequestFactory, TestCase
+from django.utils import timezone
+
+from core import async_views, views
+from core.models import Bet, Candidate, Contest, CustomUser
+
+CSRF_INPUT = re.compile(rb'name="csrfmiddlewaretoken" value="[^"]*"')
+
+
+class AsyncReadViewTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = CustomUser.objects.create_user(email="user@example.com", username="user@example.com", password="pass1234")
+        self.candidates = [
+            Candidate.objects.create(first_name=f"Ann{i}", last_name=f"Smith{i}", course=1, group="A-1") for i in range(15)
+        ]
+        self.outsider = Candidate.objects.create(first_name="Eve", last_name="Jones", course=2, group="B-2")
+        self.contest = Contest.objects.create(name="Miss Test", ends_at=timezone.now() + timedelta(days=1))
+        self.contest.participants.add(*self.candidates)
+        for i in range(12):
+            Bet.objects.create(
+                user=self.user, candidate=self.candidates[i % 3], contest=self.contest, amount=Decimal(i + 1), coefficient=Decimal("1.50")
+            )
+
+    def _request(self, user, data=None):
+        request = RequestFactory().get("/", data)
+        request.user = user
+
+        async def auser():
+            return user
+
+        request.auser = auser
+        return request
+
+    def _assert_same(self, sync_view, async_view, *args, data=None, user=None):
+        user = user or self.user
+        expected = sync_view(self._request(user, data), *args)
+        # Render the async page from the database, not from fragments the sync view cached.
+        cache.clear()
+        response = async_to_sync(async_view)(self._request(user, data), *args)
+        self.assertEqual(response.status_code, expected.status_code)
+        self.assertEqual(response.get("Location"), expected.get("Location"))
+        # The masked CSRF token differs on every render.
+        self.assertEqual(CSRF_INPUT.sub(b"", response.content), CSRF_INPUT.sub(b"", expected.content))
+        return response
+
+    def test_pages_match_sync_views(self):
+        for data in (None, {"page": "2"}, {"page": "99"}, {"page": "x"}, {"q": "Smith1"}):
+            self._assert_same(views.contest_view, async_views.contest_view, data=data)
+            self._assert_same(views.candidate_list, async_views.candidate_list, data=data)
+        first = self._assert_same(views.bet_view, async_views.bet_view)
+        cursor = unquote(re.search(rb'\?cursor=([^"]+)"', first.content).group(1).decode())
+        second = self._assert_same(views.bet_view, async_views.bet_view, data={"cursor": cursor})
+        self.assertContains(second, "Smith0", count=1)
+        self._assert_same(views.candidate_detail, async_views.candidate_detail, self.candidates[0].pk)
+
+    def test_detail_hides_non_participants(self):
+        for pk in (self.outsider.pk, 10_000):
+            with self.assertRaises(Http404):
+                async_to_sync(async_views.candidate_detail)(self._request(self.user), pk)
+
+    def test_anonymous_users_are_redirected_to_login(self):
+        for view in (views.contest_view, views.bet_view, views.candidate_list):
+            async_view = getattr(async_views, view.__name__)
+            response = self._assert_same(view, async_view, user=AnonymousUser())
+            self.assertEqual(response.status_code, 302)
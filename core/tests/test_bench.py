@@ -0,0 +1,24 @@
+from django.test import SimpleTestCase
+
+from core.bench import RouteStats, percentile
+
+
+class BenchStatsTests(SimpleTestCase):
+    def test_percentile_nearest_rank(self):
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 0.50), 50)
+        self.assertEqual(percentile(values, 0.95), 95)
+        self.assertEqual(percentile(values, 0.99), 99)
+        self.assertEqual(percentile([], 0.5), 0.0)
+
+    def test_route_summary(self):
+        stats = RouteStats()
+        stats.record("bet", 0.010, 10)
+        stats.record("bet", 0.030, 12, ok=False)
+        summary = stats.summary(wall_time=2.0)["bet"]
+        self.assertEqual(summary["requests"], 2)
+        self.assertEqual(summary["errors"], 1)
+        self.assertEqual(summary["throughput_rps"], 1.0)
+        self.assertEqual(summary["p50_ms"], 10.0)
+        self.assertEqual(summary["p99_ms"], 30.0)
+        self.assertEqual(summary["queries_per_request"], 11.0)
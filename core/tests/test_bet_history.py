@@ -0,0 +1,57 @@
+from decimal import Decimal
+from datetime import timedelta
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from core.models import Bet, Candidate, CustomUser
+
+
+class BetHistoryPaginationTests(TestCase):
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(email="user@example.com", username="user@example.com", password="pass1234")
+        candidate = Candidate.objects.create(first_name="Ann", last_name="Smith", course=1, group="A-1")
+        bets = [
+            Bet.objects.create(user=self.user, candidate=candidate, amount=Decimal(i + 1), coefficient=Decimal("1.50"))
+            for i in range(25)
+        ]
+        # Pairs of bets share a timestamp so the id tiebreaker is exercised.
+        base = timezone.now() - timedelta(days=1)
+        for i, bet in enumerate(bets):
+            Bet.objects.filter(pk=bet.pk).update(created_at=base + timedelta(minutes=i // 2))
+        self.expected_ids = list(Bet.objects.order_by("-created_at", "-id").values_list("id", flat=True))
+        self.client.force_login(self.user)
+
+    def _get(self, cursor=None):
+        params = {"cursor": cursor} if cursor else {}
+        return self.client.get(reverse("bet"), params).context["page_obj"]
+
+    def test_walks_all_pages_forward_and_back(self):
+        pages = [self._get()]
+        while pages[-1].has_next:
+            pages.append(self._get(pages[-1].next_cursor))
+        seen = [bet.id for page in pages for bet in page.object_list]
+        self.assertEqual(seen, self.expected_ids)
+        self.assertEqual(len(pages), 3)
+        self.assertFalse(pages[0].has_previous)
+
+        previous = self._get(pages[-1].previous_cursor)
+        self.assertEqual([bet.id for bet in previous.object_list], self.expected_ids[10:20])
+        self.assertTrue(previous.has_next)
+        first = self._get(previous.previous_cursor)
+        self.assertEqual([bet.id for bet in first.object_list], self.expected_ids[:10])
+        self.assertFalse(first.has_previous)
+
+    def test_page_links_carry_cursors(self):
+        response = self.client.get(reverse("bet"))
+        self.assertContains(response, "?cursor=", count=1)
+        self.assertContains(response, "Вперёд ›", count=1)
+
+    def test_no_count_query_and_invalid_cursor(self):
+        with CaptureQueriesContext(connection) as queries:
+            page = self._get("garbage")
+        self.assertEqual([bet.id for bet in page.object_list], self.expected_ids[:10])
+        self.assertFalse(any("COUNT(" in query["sql"] for query in queries.captured_queries))
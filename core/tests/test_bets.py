@@ -1,6 +1,9 @@
 from decimal import Decimal
 from datetime import timedelta
+from io import StringIO
 
+from django.core.management import call_command
+from django.db import IntegrityError, transaction
 from django.test import TestCase
 from django.utils import timezone
 from django.urls import reverse
@@ -75,6 +78,21 @@ class CandidateBetLimitTests(TestCase):
         self.assertContains(response, "Недостаточно средств.")
         self.assertEqual(Bet.objects.count(), 0)
 
+    def test_bet_can_spend_whole_balance(self):
+        self.user.balance = Decimal("50.00")
+        self.user.save(update_fields=["balance"])
+        self.client.force_login(self.user)
+        url = reverse("candidate-detail", args=[self.candidate.id])
+        self.assertContains(self.client.post(url, {"amount": "50"}), "Ставка принята!")
+        self.assertContains(self.client.post(url, {"amount": "0.01"}), "Недостаточно средств.")
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.balance, Decimal("0.00"))
+        self.assertEqual(Bet.objects.count(), 1)
+
+    def test_database_rejects_negative_balance(self):
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            CustomUser.objects.filter(pk=self.user.pk).update(balance=Decimal("-0.01"))
+
 
 class PayoutTests(TestCase):
     def setUp(self):
@@ -128,6 +146,9 @@ class PayoutTests(TestCase):
         )
         self.assertEqual(response.status_code, 302)
         self.user.refresh_from_db()
+        self.assertEqual(self.user.balance, Decimal("1000.00"))
+        call_command("settlement_worker", "--once", stdout=StringIO())
+        self.user.refresh_from_db()
         bet.refresh_from_db()
         self.assertEqual(self.user.balance, Decimal("1100.00"))
         self.assertTrue(bet.paid_out)
@@ -0,0 +1,64 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from core.models import BalanceTransaction, Bet, BetPool, Candidate, Contest, CustomUser, UserBetStats
+
+
+class BetSlipTests(TestCase):
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(email="user@example.com", username="user@example.com", password="pass1234")
+        self.ann = Candidate.objects.create(first_name="Ann", last_name="Smith", course=1, group="A-1")
+        self.eve = Candidate.objects.create(first_name="Eve", last_name="Jones", course=2, group="B-2")
+        self.contest = Contest.objects.create(name="Miss Test", ends_at=timezone.now() + timedelta(days=1))
+        self.contest.participants.add(self.ann, self.eve)
+        self.client.force_login(self.user)
+        self.url = reverse("bet-slip")
+
+    def test_slip_places_all_legs_at_once(self):
+        response = self.client.post(self.url, {f"amount_{self.ann.pk}": "100", f"amount_{self.eve.pk}": "50", "amount_999": "10"})
+        self.assertContains(response, "Принято ставок: 2")
+        self.assertEqual(Bet.objects.filter(user=self.user).count(), 2)
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.balance, Decimal("850.00"))
+        self.assertEqual(BetPool.objects.get(contest=self.contest, candidate=None).total, Decimal("150.00"))
+        self.assertEqual(BetPool.objects.get(contest=self.contest, candidate=self.eve).total, Decimal("50.00"))
+        stats = UserBetStats.objects.get(user=self.user)
+        self.assertEqual((stats.bet_count, stats.total_staked), (2, Decimal("150.00")))
+        self.assertEqual(BalanceTransaction.objects.filter(user=self.user, kind="bet").count(), 2)
+
+    def test_invalid_leg_rejects_whole_slip(self):
+        response = self.client.post(self.url, {f"amount_{self.ann.pk}": "100", f"amount_{self.eve.pk}": "1000.01"})
+        self.assertContains(response, "ставки не оформлены")
+        self.assertContains(response, "Сумма превышает допустимый лимит")
+        self.assertFalse(Bet.objects.exists())
+
+    def test_slip_over_balance_places_nothing(self):
+        self.user.balance = Decimal("120.00")
+        self.user.save(update_fields=["balance"])
+        response = self.client.post(self.url, {f"amount_{self.ann.pk}": "100", f"amount_{self.eve.pk}": "50"})
+        self.assertContains(response, "Недостаточно средств")
+        self.assertFalse(Bet.objects.exists())
+        self.assertFalse(BetPool.objects.exists())
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.balance, Decimal("120.00"))
+
+    def test_slip_queries_do_not_grow_with_legs(self):
+        more = Candidate.objects.bulk_create(
+            [Candidate(first_name=f"C{i}", last_name="Extra", course=1, group="C-1") for i in range(4)]
+        )
+        self.contest.participants.add(*more)
+        every_leg = {f"amount_{candidate.pk}": "10" for candidate in self.contest.participants.all()}
+        self.client.post(self.url, every_leg)
+
+        with CaptureQueriesContext(connection) as one_leg:
+            self.client.post(self.url, {f"amount_{self.ann.pk}": "10"})
+        with CaptureQueriesContext(connection) as six_legs:
+            self.client.post(self.url, every_leg)
+        self.assertEqual(len(six_legs.captured_queries), len(one_leg.captured_queries))
+        self.assertEqual(Bet.objects.count(), 13)
@@ -0,0 +1,52 @@
+from datetime import timedelta
+
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from core.contests import get_current_contest
+from core.models import Bet, Candidate, Contest, CustomUser
+
+
+class CurrentContestCacheTests(TestCase):
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(email="user@example.com", username="user@example.com", password="pass1234")
+        self.candidate = Candidate.objects.create(first_name="Ann", last_name="Smith", course=1, group="A-1")
+        self.contest = Contest.objects.create(name="Miss Test", ends_at=timezone.now() + timedelta(days=1))
+        self.contest.participants.add(self.candidate)
+
+    def test_snapshot_is_cached(self):
+        current = get_current_contest()
+        self.assertEqual(current.contest, self.contest)
+        self.assertEqual(current.participant_ids, {self.candidate.id})
+        self.assertTrue(current.is_open)
+        with self.assertNumQueries(0):
+            self.assertIs(get_current_contest(), current)
+
+    def test_invalidated_on_contest_and_participant_changes(self):
+        get_current_contest()
+        newer = Contest.objects.create(name="Miss Next", ends_at=timezone.now() + timedelta(days=2))
+        self.assertEqual(get_current_contest().contest, newer)
+        newer.participants.add(self.candidate)
+        self.assertEqual(get_current_contest().participant_ids, {self.candidate.id})
+        newer.delete()
+        self.assertEqual(get_current_contest().contest, self.contest)
+
+    def test_candidate_outside_contest_is_not_found(self):
+        outsider = Candidate.objects.create(first_name="Kate", last_name="Brown", course=2, group="B-2")
+        self.client.force_login(self.user)
+        response = self.client.get(reverse("candidate-detail", args=[outsider.id]))
+        self.assertEqual(response.status_code, 404)
+
+    def test_bets_recheck_contest_changed_by_another_process(self):
+        # Queryset writes skip the signals, like a write from another process.
+        self.client.force_login(self.user)
+        get_current_contest()
+        url = reverse("candidate-detail", args=[self.candidate.id])
+        Contest.participants.through.objects.filter(contest=self.contest).delete()
+        self.assertContains(self.client.post(url, {"amount": "10"}), "больше не участвует")
+        Contest.objects.filter(pk=self.contest.pk).update(ends_at=timezone.now() - timedelta(minutes=1))
+        self.assertContains(self.client.post(url, {"amount": "10"}), "Приём ставок завершён")
+        self.assertFalse(Bet.objects.exists())
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.balance, 1000)
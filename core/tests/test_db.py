@@ -0,0 +1,44 @@
+from django.db import OperationalError, connection
+from django.test import SimpleTestCase
+
+from core.db import retry_on_lock
+
+
+class RetryOnLockTests(SimpleTestCase):
+    def _flaky(self, errors):
+        calls = []
+
+        @retry_on_lock(attempts=3, base_delay=0)
+        def write():
+            calls.append(1)
+            if len(calls) <= len(errors):
+                raise errors[len(calls) - 1]
+            return "done"
+
+        return write, calls
+
+    def test_lock_errors_are_retried(self):
+        write, calls = self._flaky([OperationalError("database is locked")] * 2)
+        self.assertEqual(write(), "done")
+        self.assertEqual(len(calls), 3)
+
+    def test_gives_up_after_attempts(self):
+        write, calls = self._flaky([OperationalError("database is locked")] * 3)
+        with self.assertRaises(OperationalError):
+            write()
+        self.assertEqual(len(calls), 3)
+
+    def test_other_errors_and_nested_transactions_are_not_retried(self):
+        write, calls = self._flaky([OperationalError("no such table: core_bet")])
+        with self.assertRaises(OperationalError):
+            write()
+        self.assertEqual(len(calls), 1)
+
+        write, calls = self._flaky([OperationalError("database is locked")])
+        connection.in_atomic_block = True
+        try:
+            with self.assertRaises(OperationalError):
+                write()
+        finally:
+            connection.in_atomic_block = False
+        self.assertEqual(len(calls), 1)
@@ -0,0 +1,58 @@
+import csv
+import io
+import json
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from core.models import Bet, Candidate, Contest, CustomUser
+
+
+class BetExportTests(TestCase):
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(email="user@example.com", username="user@example.com", password="pass1234")
+        other = CustomUser.objects.create_user(email="other@example.com", username="other@example.com", password="pass1234")
+        self.ann = Candidate.objects.create(first_name="Ann", last_name="Smith", course=1, group="A-1")
+        self.eve = Candidate.objects.create(first_name="Eve", last_name="Jones", course=1, group="A-1")
+        finished = Contest.objects.create(name="Осень", ends_at=timezone.now() - timedelta(days=1), winner=self.ann)
+        running = Contest.objects.create(name="Зима", ends_at=timezone.now() + timedelta(days=1))
+        Bet.objects.create(user=self.user, candidate=self.ann, contest=finished, amount=Decimal("10.00"), coefficient=Decimal("2.50"))
+        Bet.objects.create(user=self.user, candidate=self.eve, contest=finished, amount=Decimal("5.00"), coefficient=Decimal("3.00"))
+        Bet.objects.create(user=self.user, candidate=self.eve, contest=running, amount=Decimal("7.00"), coefficient=Decimal("1.50"))
+        Bet.objects.create(user=other, candidate=self.ann, contest=running, amount=Decimal("1.00"), coefficient=Decimal("1.10"))
+        self.client.force_login(self.user)
+
+    def _content(self, response):
+        return b"".join(response.streaming_content).decode()
+
+    def test_csv_has_status_and_payout_like_the_history_page(self):
+        response = self.client.get(reverse("bet-export"), {"format": "csv"})
+        self.assertEqual(response["Content-Type"], "text/csv; charset=utf-8")
+        self.assertIn("attachment", response["Content-Disposition"])
+        content = self._content(response)
+        self.assertTrue(content.startswith("\ufeffcreated_at,candidate,contest,"))
+        rows = list(csv.DictReader(io.StringIO(content.removeprefix("\ufeff"))))
+        self.assertEqual(
+            [(row["candidate"], row["contest"], row["status"], row["payout"]) for row in rows],
+            [("Jones Eve", "Зима", "Ожидает", ""), ("Jones Eve", "Осень", "Проигрыш", "0.00"), ("Smith Ann", "Осень", "Выигрыш", "25.00")],
+        )
+
+    def test_jsonl_streams_one_object_per_bet_from_one_query(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse("bet-export"), {"format": "jsonl"})
+            lines = self._content(response).splitlines()
+        self.assertTrue(response.streaming)
+        self.assertEqual(len([q for q in queries.captured_queries if "core_bet" in q["sql"]]), 1)
+        first = json.loads(lines[-1])
+        self.assertEqual((first["amount"], first["coefficient"], first["payout"]), ("10.00", "2.50", "25.00"))
+        self.assertEqual(len(lines), 3)
+
+    def test_unknown_format_and_anonymous_users_are_rejected(self):
+        self.assertEqual(self.client.get(reverse("bet-export"), {"format": "xml"}).status_code, 400)
+        self.client.logout()
+        self.assertEqual(self.client.get(reverse("bet-export")).status_code, 302)
@@ -0,0 +1,69 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from core.models import Bet, BetPool, Candidate, Contest, CustomUser
+from core.pools import check_pools
+
+
+class ExposureTests(TestCase):
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(email="user@example.com", username="user@example.com", password="pass1234")
+        self.ann = Candidate.objects.create(first_name="Ann", last_name="Smith", course=1, group="A-1")
+        self.eve = Candidate.objects.create(first_name="Eve", last_name="Jones", course=2, group="B-2")
+        self.contest = Contest.objects.create(name="Miss Test", ends_at=timezone.now() + timedelta(days=1))
+        self.contest.participants.add(self.ann, self.eve)
+        self.client.force_login(self.user)
+
+    def _bet(self, candidate, amount):
+        return self.client.post(reverse("candidate-detail", args=[candidate.pk]), {"amount": amount})
+
+    def test_liability_is_kept_with_the_pools(self):
+        self._bet(self.ann, "100")
+        self.client.post(reverse("bet-slip"), {f"amount_{self.ann.pk}": "50", f"amount_{self.eve.pk}": "30"})
+        expected = sum((bet.amount * bet.coefficient for bet in Bet.objects.filter(candidate=self.ann)), Decimal("0"))
+        self.assertEqual(BetPool.objects.get(contest=self.contest, candidate=self.ann).liability, expected)
+        self.assertEqual(check_pools([self.contest.pk]), [])
+        BetPool.objects.filter(candidate=self.eve).update(liability=0)
+        self.assertEqual([row[2] for row in check_pools([self.contest.pk])], ["liability"])
+
+    def test_limit_rejects_slips_that_would_exceed_it(self):
+        self._bet(self.eve, "1")
+        # Set from "another process": the cached current contest still has no limit.
+        Contest.objects.filter(pk=self.contest.pk).update(exposure_limit=Decimal("10.00"))
+        # Odds of 1.10 on Ann: the house would lose 110 - 101 = 9.
+        self.assertContains(self._bet(self.ann, "100"), "Ставка принята")
+        self.assertContains(self._bet(self.ann, "100"), "достигает лимита риска")
+        response = self.client.post(reverse("bet-slip"), {f"amount_{self.ann.pk}": "100", f"amount_{self.eve.pk}": "5"})
+        self.assertContains(response, "ставки не оформлены")
+        # Stakes on others grow the pool and make room under the limit.
+        self.assertContains(self._bet(self.eve, "5"), "Ставка принята")
+        self.assertContains(self._bet(self.ann, "5"), "Ставка принята")
+        self.assertEqual(Bet.objects.count(), 4)
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.balance, Decimal("889.00"))
+        self.assertEqual(check_pools([self.contest.pk]), [])
+
+    def test_slip_landing_on_the_limit_is_rejected(self):
+        Contest.objects.filter(pk=self.contest.pk).update(exposure_limit=Decimal("10.00"))
+        # Odds of 1.10 on Ann: the house would lose 110 - 100 = 10, the limit itself.
+        self.assertContains(self._bet(self.ann, "100"), "достигает лимита риска")
+        Contest.objects.filter(pk=self.contest.pk).update(exposure_limit=Decimal("10.01"))
+        self.assertContains(self._bet(self.ann, "100"), "Ставка принята")
+        self.assertEqual(Bet.objects.count(), 1)
+
+    def test_contest_list_shows_exposure_without_reading_bets(self):
+        self._bet(self.ann, "100")
+        Contest.objects.filter(pk=self.contest.pk).update(exposure_limit=Decimal("10.00"))
+        staff = CustomUser.objects.create_user(email="staff@example.com", username="staff@example.com", password="pass1234", is_staff=True)
+        self.client.force_login(staff)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse("contest-list"))
+        self.assertContains(response, "ставки приостановлены")
+        self.assertContains(response, "110.00")
+        self.assertFalse([query for query in queries if '"core_bet"' in query["sql"]])
@@ -0,0 +1,67 @@
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from core.fragments import fragment_stats
+from core.models import Candidate, Contest, CustomUser
+
+
+class FragmentCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = CustomUser.objects.create_user(email="user@example.com", username="user@example.com", password="pass1234")
+        self.other = CustomUser.objects.create_user(email="other@example.com", username="other@example.com", password="pass1234")
+        self.candidates = [
+            Candidate.objects.create(first_name=f"Ann{i}", last_name="Smith", course=1, group="A-1") for i in range(3)
+        ]
+        self.contest = Contest.objects.create(name="Miss Test", ends_at=timezone.now() + timedelta(days=1))
+        self.contest.participants.add(*self.candidates)
+        self.client.force_login(self.user)
+
+    def _bet(self, candidate, amount="10"):
+        self.client.post(reverse("candidate-detail", args=[candidate.pk]), {"amount": amount})
+
+    def test_grid_is_rendered_once_per_page_and_query(self):
+        self.client.get(reverse("contest"))
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse("contest"))
+        self.assertContains(response, "Smith Ann0")
+        self.assertFalse([q for q in queries.captured_queries if "core_candidate" in q["sql"]])
+        self.client.get(reverse("contest"), {"q": "Ann1"})
+        self.assertEqual(fragment_stats()["candidate-grid"], {"hits": 1, "misses": 2, "hit_ratio": 0.333})
+
+    def test_candidate_edit_refreshes_grid_but_bets_do_not(self):
+        self.client.get(reverse("contest"))
+        self._bet(self.candidates[0])
+        self.client.get(reverse("contest"))
+        self.assertEqual(fragment_stats()["candidate-grid"]["hits"], 1)
+
+        self.candidates[0].first_name = "Eve"
+        self.candidates[0].save()
+        self.assertContains(self.client.get(reverse("contest")), "Smith Eve")
+
+    def test_bet_table_follows_the_users_own_bets(self):
+        self._bet(self.candidates[0], "10")
+        self.assertContains(self.client.get(reverse("bet")), "10.00")
+        self._bet(self.candidates[1], "25")
+        self.assertContains(self.client.get(reverse("bet")), "25.00")
+
+        self.client.force_login(self.other)
+        self.assertContains(self.client.get(reverse("bet")), "Вы ещё не сделали ставок")
+        self.assertEqual(fragment_stats()["bet-table"], {"hits": 0, "misses": 3, "hit_ratio": 0.0})
+
+    def test_junk_request_values_share_the_resolved_entry(self):
+        self.client.get(reverse("contest"))
+        for params in ({"page": "abc"}, {"page": "999"}, {"page": "1", "q": "   "}):
+            self.assertContains(self.client.get(reverse("contest"), params), "Smith Ann0")
+        self.client.get(reverse("contest"), {"q": "Nobody"})
+        self.assertEqual(fragment_stats()["candidate-grid"], {"hits": 3, "misses": 1, "hit_ratio": 0.75})
+
+        self.client.get(reverse("bet"))
+        self.client.get(reverse("bet"), {"cursor": "junk"})
+        self.assertEqual(fragment_stats()["bet-table"], {"hits": 1, "misses": 1, "hit_ratio": 0.5})
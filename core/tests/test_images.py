@@ -0,0 +1,70 @@
+import shutil
+import tempfile
+from io import BytesIO, StringIO
+from datetime import timedelta
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from PIL import Image
+
+from core.contests import contest_catalog_version
+from core.images import variant_name
+from core.models import Candidate, Contest, CustomUser
+
+
+def _jpeg(width, height):
+    buffer = BytesIO()
+    Image.new("RGB", (width, height), "red").save(buffer, "JPEG")
+    return SimpleUploadedFile("photo.jpeg", buffer.getvalue(), content_type="image/jpeg")
+
+
+class PhotoVariantTests(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        override = override_settings(MEDIA_ROOT=self.media_root)
+        override.enable()
+        self.addCleanup(override.disable)
+
+    def test_variants_generated_on_upload(self):
+        candidate = Candidate.objects.create(first_name="Ann", last_name="Smith", course=1, group="A-1", photo=_jpeg(800, 600))
+        candidate.refresh_from_db()
+        self.assertEqual(candidate.photo_variants["widths"], [320, 640])
+        storage = candidate.photo.storage
+        with storage.open(variant_name(candidate.photo.name, 320, "webp")) as variant:
+            self.assertEqual(Image.open(variant).size, (320, 240))
+        self.assertIn("640w", candidate.photo_webp_srcset)
+        self.assertIn(f"{candidate.photo.url} 800w", candidate.photo_jpeg_srcset)
+
+        user = CustomUser.objects.create_user(email="user@example.com", username="user@example.com", password="pass1234")
+        contest = Contest.objects.create(name="Miss Test", ends_at=timezone.now() + timedelta(days=1))
+        contest.participants.add(candidate)
+        self.client.force_login(user)
+        self.assertContains(self.client.get(reverse("contest")), 'type="image/webp"')
+
+    def test_unreadable_photo_does_not_break_saving(self):
+        broken = SimpleUploadedFile("photo.jpeg", b"not an image", content_type="image/jpeg")
+        with self.assertLogs("core.images", "WARNING"):
+            candidate = Candidate.objects.create(first_name="Ann", last_name="Smith", course=1, group="A-1", photo=broken)
+        candidate.refresh_from_db()
+        self.assertEqual(candidate.photo_variants, {})
+        self.assertEqual(candidate.photo_webp_srcset, "")
+
+        candidate.photo.name = "candidates/missing.jpeg"
+        with self.assertLogs("core.images", "WARNING"):
+            candidate.save()
+        self.assertEqual(candidate.photo_variants, {})
+
+    def test_backfill_command(self):
+        candidate = Candidate.objects.create(first_name="Ann", last_name="Smith", course=1, group="A-1", photo=_jpeg(400, 300))
+        Candidate.objects.filter(pk=candidate.pk).update(photo_variants={})
+        version = contest_catalog_version()
+        out = StringIO()
+        call_command("generate_thumbnails", "--workers", "1", stdout=out)
+        self.assertNotEqual(contest_catalog_version(), version)
+        self.assertIn("Generated variants for 1 photos", out.getvalue())
+        candidate.refresh_from_db()
+        self.assertEqual(candidate.photo_variants["widths"], [320])
@@ -0,0 +1,88 @@
+from decimal import Decimal
+from datetime import timedelta
+from unittest import mock
+
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from core.jobs import claim_job, enqueue_settlement, fail_job, run_job
+from core.models import Bet, Candidate, Contest, CustomUser, SettlementJob
+from core.settlement import settle_chunk
+
+
+class SettlementJobTests(TestCase):
+    def setUp(self):
+        self.admin = CustomUser.objects.create_user(
+            email="admin@example.com", username="admin@example.com", password="pass1234", is_staff=True
+        )
+        self.user = CustomUser.objects.create_user(email="user@example.com", username="user@example.com", password="pass1234")
+        self.candidate = Candidate.objects.create(first_name="Ann", last_name="Smith", course=1, group="A-1")
+        self.contest = Contest.objects.create(
+            name="Miss Test",
+            ends_at=timezone.now() - timedelta(days=1),
+            winner=self.candidate,
+        )
+        self.contest.participants.add(self.candidate)
+        for _ in range(3):
+            Bet.objects.create(
+                user=self.user,
+                candidate=self.candidate,
+                contest=self.contest,
+                amount=Decimal("10.00"),
+                coefficient=Decimal("2.00"),
+            )
+
+    def test_enqueue_does_not_duplicate_active_job(self):
+        job = enqueue_settlement(self.contest)
+        self.assertEqual(enqueue_settlement(self.contest), job)
+        self.assertEqual(SettlementJob.objects.count(), 1)
+
+    def test_failed_job_is_retried_with_backoff(self):
+        enqueue_settlement(self.contest)
+        job = claim_job("worker-1")
+        self.assertIsNone(claim_job("worker-2"))
+        fail_job(job, "boom")
+        job.refresh_from_db()
+        self.assertEqual(job.status, SettlementJob.Status.PENDING)
+        self.assertGreater(job.run_at, timezone.now())
+        self.assertIsNone(claim_job("worker-1"))
+
+    def test_stale_job_resumes_from_checkpoint(self):
+        enqueue_settlement(self.contest)
+        job = claim_job("worker-1")
+        chunks = [settle_chunk, RuntimeError("crash")]
+
+        def crash_on_second_chunk(*args, **kwargs):
+            step = chunks.pop(0)
+            if isinstance(step, Exception):
+                raise step
+            return step(*args, **kwargs)
+
+        with mock.patch("core.jobs.settle_chunk", side_effect=crash_on_second_chunk):
+            with self.assertRaises(RuntimeError):
+                run_job(job, chunk_size=1)
+        job.refresh_from_db()
+        self.assertEqual(job.bets_settled, 1)
+        SettlementJob.objects.filter(pk=job.pk).update(locked_at=timezone.now() - timedelta(hours=1))
+
+        resumed = claim_job("worker-2")
+        self.assertEqual(resumed.pk, job.pk)
+        run_job(resumed, chunk_size=1)
+        resumed.refresh_from_db()
+        self.assertEqual(resumed.status, SettlementJob.Status.DONE)
+        self.assertEqual(resumed.bets_settled, 3)
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.balance, Decimal("1060.00"))
+
+    def test_contest_list_shows_job_status(self):
+        enqueue_settlement(self.contest)
+        self.client.force_login(self.admin)
+        response = self.client.get(reverse("contest-list"))
+        self.assertContains(response, "В очереди")
+
+        SettlementJob.objects.filter(contest=self.contest).update(status=SettlementJob.Status.FAILED)
+        SettlementJob.objects.create(contest=self.contest, status=SettlementJob.Status.DONE)
+        response = self.client.get(reverse("contest-list"))
+        self.assertContains(response, "Завершено")
+        self.assertNotContains(response, "Ошибка")
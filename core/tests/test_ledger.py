@@ -0,0 +1,59 @@
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from core.ledger import adjust_balance, ledger_balances, reconcile_balances, take_snapshots
+from core.models import BalanceSnapshot, BalanceTransaction, Candidate, Contest, CustomUser
+from core.settlement import settle_contest
+
+
+class BalanceLedgerTests(TestCase):
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(email="user@example.com", username="user@example.com", password="pass1234")
+        self.candidate = Candidate.objects.create(first_name="Ann", last_name="Smith", course=1, group="A-1")
+        self.contest = Contest.objects.create(name="Miss Test", ends_at=timezone.now() + timedelta(days=1))
+        self.contest.participants.add(self.candidate)
+        self.client.force_login(self.user)
+
+    def _bet(self, amount):
+        self.client.post(reverse("candidate-detail", args=[self.candidate.id]), {"amount": amount})
+
+    def test_bets_and_payouts_are_logged(self):
+        self._bet("50")
+        self._bet("30")
+        Contest.objects.filter(pk=self.contest.pk).update(winner=self.candidate, ends_at=timezone.now() - timedelta(minutes=1))
+        self.contest.refresh_from_db()
+        settle_contest(self.contest)
+        kinds = list(BalanceTransaction.objects.filter(user=self.user).order_by("id").values_list("kind", flat=True))
+        self.assertEqual(kinds, ["opening", "bet", "bet", "payout", "payout"])
+        self.user.refresh_from_db()
+        self.assertEqual(ledger_balances([self.user.pk]), {self.user.pk: self.user.balance})
+        self.assertEqual(reconcile_balances([self.user.pk]), [])
+
+    def test_snapshot_plus_later_deltas(self):
+        self._bet("100")
+        self.assertEqual(take_snapshots(), 1)
+        self.assertEqual(BalanceSnapshot.objects.get().balance, Decimal("900.00"))
+        self.assertEqual(take_snapshots(), 0)
+        self._bet("25")
+        self.assertTrue(adjust_balance(self.user, Decimal("5.00"), "bonus"))
+        self.assertFalse(adjust_balance(self.user, Decimal("-10000.00")))
+        self.assertEqual(ledger_balances([self.user.pk]), {self.user.pk: Decimal("880.00")})
+        self.assertEqual(self.user.balance, Decimal("880.00"))
+
+    def test_reconcile_command_reports_and_fixes_drift(self):
+        CustomUser.objects.filter(pk=self.user.pk).update(balance=Decimal("1234.00"))
+        with self.assertRaises(CommandError):
+            call_command("reconcile_balances", stdout=StringIO(), stderr=StringIO())
+        call_command("reconcile_balances", "--fix", stdout=StringIO(), stderr=StringIO())
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.balance, Decimal("1234.00"))
+        adjustment = BalanceTransaction.objects.get(user=self.user, kind=BalanceTransaction.Kind.ADJUSTMENT)
+        self.assertEqual(adjustment.amount, Decimal("234.00"))
+        self.assertEqual(reconcile_balances([self.user.pk]), [])
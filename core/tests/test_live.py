@@ -0,0 +1,65 @@
+import asyncio
+from datetime import timedelta
+from decimal import Decimal
+
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from core.betslip import place_slip
+from core.live import OddsBroadcaster, odds_events
+from core.models import Candidate, Contest, CustomUser
+
+
+class LiveOddsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = CustomUser.objects.create_user(email="user@example.com", username="user@example.com", password="pass1234")
+        self.candidate = Candidate.objects.create(first_name="Ann", last_name="Smith", course=1, group="A-1")
+        self.contest = Contest.objects.create(name="Miss Test", ends_at=timezone.now() + timedelta(days=1))
+        self.contest.participants.add(self.candidate)
+
+    def test_wsgi_request_gets_one_snapshot(self):
+        url = reverse("api-contest-live")
+        self.assertEqual(self.client.get(url).status_code, 401)
+        self.client.force_login(self.user)
+        response = self.client.get(url)
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        body = b"".join(response.streaming_content).decode()
+        self.assertIn("event: odds", body)
+        self.assertIn(f'"{self.candidate.pk}":"1.10"', body)
+
+    async def test_stream_pushes_changes_and_heartbeats(self):
+        broadcaster = OddsBroadcaster(poll_interval=0.01)
+        events = odds_events(broadcaster, heartbeat=0.2)
+        self.assertTrue((await anext(events)).startswith("retry:"))
+        first = await anext(events)
+        self.assertIn(f'"{self.candidate.pk}":"1.10"', first)
+
+        await sync_to_async(place_slip)(self.user.pk, self.contest, {self.candidate.pk: Decimal("100")})
+        second = await anext(events)
+        self.assertTrue(second.startswith("event: odds"))
+        self.assertNotEqual(second.splitlines()[1], first.splitlines()[1])
+        self.assertEqual(await anext(events), ": heartbeat\n\n")
+
+        await events.aclose()
+        self.assertEqual(broadcaster.subscribers, set())
+        await asyncio.sleep(0.05)
+        self.assertTrue(broadcaster._task.done())
+
+
+class OddsBroadcasterTests(SimpleTestCase):
+    def test_slow_subscriber_keeps_only_newest_snapshot(self):
+        broadcaster = OddsBroadcaster()
+        slow, fast = asyncio.Queue(maxsize=1), asyncio.Queue(maxsize=1)
+        broadcaster.subscribers.update({slow, fast})
+        broadcaster.publish("one")
+        fast.get_nowait()
+        broadcaster.publish("two")
+        broadcaster.publish("three")
+        self.assertEqual(slow.get_nowait(), "three")
+        self.assertEqual(slow.qsize(), 0)
+        self.assertEqual(broadcaster.skipped, 3)
+        self.assertEqual(broadcaster.latest, "three")
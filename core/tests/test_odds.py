@@ -0,0 +1,43 @@
+from decimal import Decimal
+from datetime import timedelta
+
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from core.models import Candidate, Contest, CustomUser
+from core.odds import OddsCache, odds_cache
+
+
+class OddsCacheTests(TestCase):
+    def setUp(self):
+        odds_cache.clear()
+        self.user = CustomUser.objects.create_user(email="user@example.com", username="user@example.com", password="pass1234")
+        self.candidate = Candidate.objects.create(first_name="Ann", last_name="Smith", course=1, group="A-1")
+        self.other = Candidate.objects.create(first_name="Kate", last_name="Brown", course=2, group="B-2")
+        self.contest = Contest.objects.create(name="Miss Test", ends_at=timezone.now() + timedelta(days=1))
+        self.contest.participants.add(self.candidate, self.other)
+
+    def test_odds_served_from_cache_until_bet_committed(self):
+        self.client.force_login(self.user)
+        url = reverse("candidate-detail", args=[self.other.id])
+        self.client.get(url)
+        with self.assertNumQueries(3):
+            response = self.client.get(url)
+        self.assertEqual(response.context["coefficient"], Decimal("1.10"))
+        self.assertEqual(odds_cache.stats()["hits"], 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse("candidate-detail", args=[self.candidate.id]), {"amount": "200"})
+        response = self.client.get(url)
+        self.assertEqual(response.context["coefficient"], Decimal("2.00"))
+        self.assertEqual(odds_cache.stats()["misses"], 3)
+
+    def test_lru_eviction(self):
+        cache = OddsCache(max_size=1)
+        cache.get(self.candidate, self.contest)
+        cache.get(self.other, self.contest)
+        cache.get(self.candidate, self.contest)
+        self.assertEqual(cache.stats()["evictions"], 2)
+        self.assertEqual(cache.stats()["size"], 1)
+        self.assertEqual(cache.hits, 0)
@@ -0,0 +1,57 @@
+from decimal import Decimal
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from core.models import Bet, BetPool, Candidate, Contest, CustomUser
+from core.pools import check_pools, get_pool_totals
+
+
+class BetPoolTests(TestCase):
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(
+            email="user@example.com",
+            username="user@example.com",
+            password="pass1234",
+        )
+        self.candidate = Candidate.objects.create(first_name="Ann", last_name="Smith", course=1, group="A-1")
+        self.other = Candidate.objects.create(first_name="Kate", last_name="Brown", course=2, group="B-2")
+        self.contest = Contest.objects.create(name="Miss Test", ends_at=timezone.now() + timedelta(days=1))
+        self.contest.participants.add(self.candidate, self.other)
+
+    def test_bet_updates_pools(self):
+        self.client.force_login(self.user)
+        self.client.post(reverse("candidate-detail", args=[self.candidate.id]), {"amount": "50"})
+        self.client.post(reverse("candidate-detail", args=[self.other.id]), {"amount": "30"})
+        self.client.post(reverse("candidate-detail", args=[self.candidate.id]), {"amount": "20"})
+        self.assertEqual(get_pool_totals(self.contest, self.candidate), (Decimal("100.00"), Decimal("70.00")))
+        self.assertEqual(get_pool_totals(self.contest, self.other), (Decimal("100.00"), Decimal("30.00")))
+        self.assertEqual(check_pools([self.contest.id]), [])
+
+    def test_check_detects_drift_and_rebuild_fixes_it(self):
+        Bet.objects.create(
+            user=self.user,
+            candidate=self.candidate,
+            contest=self.contest,
+            amount=Decimal("40.00"),
+            coefficient=Decimal("1.50"),
+        )
+        with self.assertRaises(CommandError):
+            call_command("check_pools", stdout=StringIO(), stderr=StringIO())
+        call_command("rebuild_pools", stdout=StringIO())
+        call_command("check_pools", stdout=StringIO())
+        self.assertEqual(BetPool.objects.get(contest=self.contest, candidate=None).total, Decimal("40.00"))
+
+    def test_deleting_a_candidate_takes_her_bets_out_of_the_contest_pool(self):
+        self.client.force_login(self.user)
+        self.client.post(reverse("candidate-detail", args=[self.candidate.id]), {"amount": "50"})
+        self.client.post(reverse("candidate-detail", args=[self.other.id]), {"amount": "30"})
+        self.client.post(reverse("candidate-detail", args=[self.candidate.id]), {"amount": "20"})
+        self.candidate.delete()
+        self.assertEqual(check_pools([self.contest.id]), [])
+        self.assertEqual(get_pool_totals(self.contest, self.other), (Decimal("30.00"), Decimal("30.00")))
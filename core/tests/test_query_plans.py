@@ -0,0 +1,24 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from core.management.commands.explain_hot_queries import full_scans
+from core.seeding import generate_dataset
+
+
+class HotQueryPlanTests(TestCase):
+    def test_hot_queries_use_indexes(self):
+        # On empty tables SQLite may prefer a scan; plans only mean something with rows to skip.
+        generate_dataset(users=50, candidates=30, contests=2, participants=10, bets=2000, batch_size=500)
+        out = StringIO()
+        call_command("explain_hot_queries", stdout=out)
+        self.assertIn("No full table scans", out.getvalue())
+
+    def test_full_scan_detection(self):
+        self.assertEqual(full_scans("2 0 0 SCAN core_bet"), ["core_bet"])
+        self.assertEqual(full_scans("5 0 0 SCAN core_contest USING INDEX contest_ends_at_idx"), [])
+        # SQLite before 3.36 prints "SCAN TABLE".
+        self.assertEqual(full_scans("0 0 0 SCAN TABLE core_bet AS T0"), ["core_bet"])
+        self.assertEqual(full_scans("0 0 0 SCAN TABLE core_bet USING INDEX bet_user_created_id_idx"), [])
+        self.assertEqual(full_scans("Seq Scan on core_bet  (cost=0.00..1.00 rows=1 width=8)"), ["core_bet"])
@@ -0,0 +1,58 @@
+import csv
+import io
+import json
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from core.models import Bet, Candidate, Contest, CustomUser
+
+
+class ContestReportTests(TestCase):
+    def setUp(self):
+        self.staff = CustomUser.objects.create_user(email="staff@example.com", username="staff@example.com", password="pass1234", is_staff=True)
+        user = CustomUser.objects.create_user(email="user@example.com", username="user@example.com", password="pass1234")
+        ann = Candidate.objects.create(first_name="Ann", last_name="Smith", course=1, group="A-1")
+        eve = Candidate.objects.create(first_name="Eve", last_name="Jones", course=1, group="A-1")
+        self.contest = Contest.objects.create(name="Осень", ends_at=timezone.now() + timedelta(days=1))
+        other = Contest.objects.create(name="Зима", ends_at=timezone.now() + timedelta(days=2))
+        for candidate, amount, coefficient in [(ann, "10.00", "2.00"), (ann, "5.00", "3.00"), (eve, "40.00", "1.50")]:
+            Bet.objects.create(user=user, candidate=candidate, contest=self.contest, amount=Decimal(amount), coefficient=Decimal(coefficient))
+        Bet.objects.create(user=user, candidate=eve, contest=other, amount=Decimal("99.00"), coefficient=Decimal("2.00"))
+        self.client.force_login(self.staff)
+        self.url = reverse("contest-report", args=[self.contest.pk])
+
+    def _content(self, response):
+        return b"".join(response.streaming_content).decode()
+
+    def test_csv_lists_bets_then_per_candidate_summary(self):
+        bets_part, summary_part = self._content(self.client.get(self.url)).removeprefix("\ufeff").split("\r\n\r\n")
+        bets = list(csv.DictReader(io.StringIO(bets_part)))
+        self.assertEqual([(row["user"], row["candidate"], row["potential_payout"]) for row in bets], [
+            ("user@example.com", "Smith Ann", "20.00"),
+            ("user@example.com", "Smith Ann", "15.00"),
+            ("user@example.com", "Jones Eve", "60.00"),
+        ])
+        summary = list(csv.DictReader(io.StringIO(summary_part)))
+        self.assertEqual([(row["candidate"], row["bets"], row["pool"], row["liability"]) for row in summary], [
+            ("Jones Eve", "1", "40.00", "60.00"),
+            ("Smith Ann", "2", "15.00", "35.00"),
+            ("Итого", "3", "55.00", "60.00"),
+        ])
+
+    def test_jsonl_footer_comes_from_one_grouped_query(self):
+        with CaptureQueriesContext(connection) as queries:
+            lines = [json.loads(line) for line in self._content(self.client.get(self.url, {"format": "jsonl"})).splitlines()]
+        self.assertEqual([line["type"] for line in lines], ["bet"] * 3 + ["summary"] * 2 + ["total"])
+        bet_queries = [q["sql"] for q in queries.captured_queries if "core_bet" in q["sql"]]
+        self.assertEqual(len(bet_queries), 2)
+        self.assertIn("GROUP BY", bet_queries[1])
+
+    def test_only_staff_can_download(self):
+        self.client.force_login(CustomUser.objects.get(email="user@example.com"))
+        self.assertRedirects(self.client.get(self.url), reverse("home"), fetch_redirect_response=False)
@@ -0,0 +1,55 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from core.models import Candidate, Contest, CustomUser
+from core.search import fts_available, search_candidates
+
+
+class CandidateSearchTests(TestCase):
+    def setUp(self):
+        self.anna = Candidate.objects.create(
+            first_name="Анна", last_name="Иванова", course=2, group="КН-21", info="Активистка"
+        )
+        self.maria = Candidate.objects.create(
+            first_name="Мария", last_name="Петрова", course=3, group="ПМИ-31", info="Подруга Анны Ивановой, Иванова по маме"
+        )
+
+    def _search(self, query):
+        return list(search_candidates(Candidate.objects.all(), query))
+
+    def test_fts_index_is_used_on_sqlite(self):
+        self.assertTrue(fts_available())
+
+    def test_prefix_match_and_ranking(self):
+        self.assertEqual(self._search("петр"), [self.maria])
+        self.assertEqual(self._search("анна иванова"), [self.anna])
+        self.assertEqual(set(self._search("иванов")), {self.anna, self.maria})
+        self.assertEqual(self._search("иванов")[0], self.anna)
+
+    def test_index_follows_updates_and_deletes(self):
+        self.anna.last_name = "Сидорова"
+        self.anna.save()
+        self.assertEqual(self._search("сидор"), [self.anna])
+        self.assertEqual(self._search("кн"), [self.anna])
+        self.anna.delete()
+        self.assertEqual(self._search("сидор"), [])
+
+    def test_fts_operators_in_query_are_literal(self):
+        self.assertEqual(self._search('петрова" OR NEAR('), [])
+        self.assertEqual(self._search('"петрова*'), [self.maria])
+
+    def test_fallback_without_fts(self):
+        with mock.patch("core.search.fts_available", return_value=False):
+            self.assertEqual(self._search("етров"), [self.maria])
+
+    def test_contest_page_search(self):
+        user = CustomUser.objects.create_user(email="user@example.com", username="user@example.com", password="pass1234")
+        contest = Contest.objects.create(name="Miss Test", ends_at=timezone.now() + timedelta(days=1))
+        contest.participants.add(self.anna, self.maria)
+        self.client.force_login(user)
+        response = self.client.get(reverse("contest"), {"q": "петр"})
+        self.assertEqual([c["id"] for c in response.context["candidates"]], [self.maria.id])
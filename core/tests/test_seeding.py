@@ -0,0 +1,40 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from core.models import Bet, Contest
+from core.pools import check_pools
+from core.seeding import generate_dataset
+from core.stats import reconcile_user_stats
+
+
+class GenerateDatasetTests(TestCase):
+    def test_dataset_is_consistent(self):
+        counts = generate_dataset(users=20, candidates=12, contests=3, participants=6, bets=500, seed=7, batch_size=100)
+        self.assertEqual(counts, {"users": 20, "candidates": 12, "contests": 3, "bets": 500})
+        contest_ids = list(Contest.objects.values_list("id", flat=True))
+        self.assertEqual(check_pools(contest_ids), [])
+        self.assertEqual(reconcile_user_stats(list(Bet.objects.values_list("user_id", flat=True).distinct())), [])
+        for contest in Contest.objects.all():
+            participant_ids = set(contest.participants.values_list("id", flat=True))
+            self.assertTrue(set(contest.bets.values_list("candidate_id", flat=True)) <= participant_ids)
+            self.assertFalse(contest.bets.filter(created_at__gt=contest.ends_at).exists())
+        open_contest = Contest.objects.get(winner__isnull=True)
+        self.assertFalse(open_contest.bets.filter(paid_out=True).exists())
+
+    def test_same_seed_gives_same_bets(self):
+        def snapshot():
+            return list(Bet.objects.order_by("id").values_list("amount", "coefficient", "paid_out"))
+
+        generate_dataset(users=5, candidates=4, contests=2, participants=3, bets=50, seed=3)
+        first = snapshot()
+        Bet.objects.all().delete()
+        generate_dataset(users=5, candidates=4, contests=2, participants=3, bets=50, seed=3)
+        self.assertEqual(snapshot(), first)
+
+    def test_command_reports_progress(self):
+        out = StringIO()
+        call_command("seed_candidates", "--generate", "--users", "3", "--candidates", "3", "--bets", "40", "--batch-size", "10", stdout=out)
+        self.assertIn("bets: 40/40", out.getvalue())
+        self.assertEqual(Bet.objects.count(), 40)
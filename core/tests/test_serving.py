@@ -0,0 +1,86 @@
+import gzip
+import json
+import shutil
+import tempfile
+from pathlib import Path
+
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.management import call_command
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from core.serving import IMMUTABLE_CACHE_CONTROL, STATIC_CACHE_CONTROL, StaticFilesMiddleware
+
+CSS = "body { color: #222; }\n" * 40
+
+
+class StaticPipelineTests(SimpleTestCase):
+    def setUp(self):
+        self.source = Path(tempfile.mkdtemp())
+        self.root = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.source, ignore_errors=True)
+        self.addCleanup(shutil.rmtree, self.root, ignore_errors=True)
+        (self.source / "site.css").write_text(CSS)
+        override = override_settings(STATIC_ROOT=self.root, STATICFILES_DIRS=[self.source])
+        override.enable()
+        self.addCleanup(override.disable)
+        call_command("collectstatic", interactive=False, verbosity=0)
+        self.hashed = json.loads((self.root / "staticfiles.json").read_text())["paths"]["site.css"]
+        self.middleware = StaticFilesMiddleware(lambda request: HttpResponse("view", status=404))
+
+    def _get(self, path, **headers):
+        return self.middleware(RequestFactory().get(path, headers=headers))
+
+    def test_collectstatic_writes_hashed_gzip_copies(self):
+        self.assertNotEqual(self.hashed, "site.css")
+        self.assertEqual(gzip.decompress((self.root / f"{self.hashed}.gz").read_bytes()).decode(), CSS)
+        self.assertEqual(staticfiles_storage.url("site.css"), f"/static/{self.hashed}")
+
+    def test_serves_gzip_copy_with_immutable_caching(self):
+        response = self._get(f"/static/{self.hashed}", accept_encoding="gzip, br")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(response["Cache-Control"], IMMUTABLE_CACHE_CONTROL)
+        self.assertIn("Accept-Encoding", response["Vary"])
+        self.assertEqual(gzip.decompress(b"".join(response.streaming_content)).decode(), CSS)
+
+        plain = self._get(f"/static/{self.hashed}")
+        self.assertNotIn("Content-Encoding", plain)
+        self.assertEqual(b"".join(plain.streaming_content).decode(), CSS)
+        self.assertEqual(self._get(f"/static/{self.hashed}", if_none_match=plain["ETag"]).status_code, 304)
+
+    def test_unhashed_names_are_revalidated_and_missing_files_fall_through(self):
+        self.assertEqual(self._get("/static/site.css")["Cache-Control"], STATIC_CACHE_CONTROL)
+        self.assertEqual(self._get("/static/missing.css").content, b"view")
+        self.assertEqual(self._get("/static/../settings.py").content, b"view")
+
+
+class MediaRangeTests(SimpleTestCase):
+    def setUp(self):
+        self.media_root = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        (self.media_root / "candidates").mkdir()
+        self.data = bytes(range(256)) * 40
+        (self.media_root / "candidates" / "photo.jpg").write_bytes(self.data)
+        override = override_settings(MEDIA_ROOT=self.media_root)
+        override.enable()
+        self.addCleanup(override.disable)
+
+    def test_byte_ranges(self):
+        url = "/media/candidates/photo.jpg"
+        full = self.client.get(url)
+        self.assertEqual(full.status_code, 200)
+        self.assertEqual(full["Accept-Ranges"], "bytes")
+        self.assertEqual(b"".join(full.streaming_content), self.data)
+
+        part = self.client.get(url, headers={"range": "bytes=100-1099"})
+        self.assertEqual(part.status_code, 206)
+        self.assertEqual(part["Content-Range"], f"bytes 100-1099/{len(self.data)}")
+        self.assertEqual(b"".join(part.streaming_content), self.data[100:1100])
+
+        suffix = self.client.get(url, headers={"range": "bytes=-10"})
+        self.assertEqual(b"".join(suffix.streaming_content), self.data[-10:])
+        self.assertEqual(self.client.get(url, headers={"range": f"bytes={len(self.data)}-"}).status_code, 416)
+        stale = self.client.get(url, headers={"range": "bytes=0-9", "if-range": '"stale"'})
+        self.assertEqual(stale.status_code, 200)
+        self.assertEqual(self.client.get("/media/candidates/../../etc/passwd").status_code, 404)
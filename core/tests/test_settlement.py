@@ -0,0 +1,55 @@
+from decimal import Decimal
+from datetime import timedelta
+
+from django.test import TestCase
+from django.utils import timezone
+
+from core.models import Bet, Candidate, Contest, CustomUser
+from core.settlement import settle_contest
+
+
+class SettlementTests(TestCase):
+    def setUp(self):
+        self.alice = CustomUser.objects.create_user(email="alice@example.com", username="alice@example.com", password="pass1234")
+        self.bob = CustomUser.objects.create_user(email="bob@example.com", username="bob@example.com", password="pass1234")
+        self.winner = Candidate.objects.create(first_name="Ann", last_name="Smith", course=1, group="A-1")
+        self.loser = Candidate.objects.create(first_name="Kate", last_name="Brown", course=2, group="B-2")
+        self.contest = Contest.objects.create(
+            name="Miss Test",
+            ends_at=timezone.now() - timedelta(days=1),
+            winner=self.winner,
+        )
+        self.contest.participants.add(self.winner, self.loser)
+        for user, candidate, amount, coefficient in [
+            (self.alice, self.winner, "50.00", "2.00"),
+            (self.alice, self.winner, "10.00", "1.55"),
+            (self.bob, self.winner, "20.00", "3.00"),
+            (self.bob, self.loser, "100.00", "1.20"),
+        ]:
+            Bet.objects.create(
+                user=user,
+                candidate=candidate,
+                contest=self.contest,
+                amount=Decimal(amount),
+                coefficient=Decimal(coefficient),
+            )
+
+    def test_settlement_credits_each_user_once_per_chunk(self):
+        report = settle_contest(self.contest, chunk_size=2)
+        self.assertEqual(report.bets_settled, 3)
+        self.assertEqual(report.users_credited, 2)
+        self.assertEqual(report.total_paid, Decimal("175.50"))
+        self.alice.refresh_from_db()
+        self.bob.refresh_from_db()
+        self.assertEqual(self.alice.balance, Decimal("1115.50"))
+        self.assertEqual(self.bob.balance, Decimal("1060.00"))
+        self.assertFalse(Bet.objects.filter(candidate=self.winner, paid_out=False).exists())
+        self.assertFalse(Bet.objects.get(candidate=self.loser).paid_out)
+
+    def test_settlement_is_idempotent(self):
+        settle_contest(self.contest)
+        report = settle_contest(self.contest)
+        self.assertEqual(report.bets_settled, 0)
+        self.assertEqual(report.total_paid, Decimal("0.00"))
+        self.alice.refresh_from_db()
+        self.assertEqual(self.alice.balance, Decimal("1115.50"))
@@ -0,0 +1,65 @@
+from decimal import Decimal
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from core.models import Bet, Candidate, Contest, CustomUser, UserBetStats
+from core.settlement import settle_contest
+from core.stats import reconcile_user_stats
+
+
+class UserBetStatsTests(TestCase):
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(email="user@example.com", username="user@example.com", password="pass1234")
+        self.candidate = Candidate.objects.create(first_name="Ann", last_name="Smith", course=1, group="A-1")
+        self.contest = Contest.objects.create(name="Miss Test", ends_at=timezone.now() + timedelta(days=1))
+        self.contest.participants.add(self.candidate)
+        self.client.force_login(self.user)
+
+    def _bet(self, amount):
+        self.client.post(reverse("candidate-detail", args=[self.candidate.id]), {"amount": amount})
+
+    def test_stats_follow_bets_and_settlement(self):
+        self._bet("50")
+        self._bet("30")
+        stats = UserBetStats.objects.get(user=self.user)
+        self.assertEqual(stats.bet_count, 2)
+        self.assertEqual(stats.total_staked, Decimal("80.00"))
+        self.assertEqual(stats.last_bet, Bet.objects.order_by("-id").first())
+
+        Contest.objects.filter(pk=self.contest.pk).update(ends_at=timezone.now() - timedelta(minutes=1), winner=self.candidate)
+        self.contest.refresh_from_db()
+        report = settle_contest(self.contest)
+        stats.refresh_from_db()
+        self.assertEqual(stats.total_won, report.total_paid)
+
+        response = self.client.get(reverse("profile"))
+        self.assertEqual(response.context["bets_count"], 2)
+        self.assertEqual(response.context["total_won"], report.total_paid)
+        call_command("reconcile_user_stats", stdout=StringIO())
+
+    def test_reconcile_detects_and_fixes_drift(self):
+        self._bet("50")
+        UserBetStats.objects.filter(user=self.user).update(bet_count=7)
+        with self.assertRaises(CommandError):
+            call_command("reconcile_user_stats", stdout=StringIO(), stderr=StringIO())
+        call_command("reconcile_user_stats", "--fix", stdout=StringIO(), stderr=StringIO())
+        self.assertEqual(UserBetStats.objects.get(user=self.user).bet_count, 1)
+        call_command("reconcile_user_stats", stdout=StringIO())
+
+    def test_deleted_bets_leave_the_stats(self):
+        other = Candidate.objects.create(first_name="Kate", last_name="Brown", course=2, group="B-2")
+        self.contest.participants.add(other)
+        self.client.post(reverse("candidate-detail", args=[other.id]), {"amount": "20"})
+        self._bet("50")
+        self._bet("30")
+        self.candidate.delete()
+        stats = UserBetStats.objects.get(user=self.user)
+        self.assertEqual((stats.bet_count, stats.total_staked), (1, Decimal("20.00")))
+        self.assertEqual(stats.last_bet, Bet.objects.get(candidate=other))
+        self.assertEqual(reconcile_user_stats([self.user.id]), [])
@@ -1,19 +1,25 @@
+from django.conf import settings
 from django.urls import path
-from . import views
+from . import api, async_views, views
+
+# Read-only pages can be served by async views, see ASYNC_READ_VIEWS in settings.
+read_views = async_views if settings.ASYNC_READ_VIEWS else views
 
 urlpatterns = [
     path('', views.index, name='home'),
-    path('contest/', views.contest_view, name='contest'),
+    path('contest/', read_views.contest_view, name='contest'),
     path('login/', views.login_view, name='login'),
     path('register/', views.register_view, name='register'),
     path('logout/', views.logout_view, name='logout'),
     path('profile/', views.profile_view, name='profile'),
-    path('bet/', views.bet_view, name='bet'),
-    path('candidates/', views.candidate_list, name='candidate-list'),
+    path('bet/', read_views.bet_view, name='bet'),
+    path('bet/slip/', views.bet_slip, name='bet-slip'),
+    path('bet/export/', views.bet_export, name='bet-export'),
+    path('candidates/', read_views.candidate_list, name='candidate-list'),
     path('candidates/new/', views.candidate_create, name='candidate-create'),
     path('candidates/<int:pk>/edit/', views.candidate_update, name='candidate-update'),
     path('candidates/<int:pk>/delete/', views.candidate_delete, name='candidate-delete'),
-    path('candidates/<int:pk>/', views.candidate_detail, name='candidate-detail'),
+    path('candidates/<int:pk>/', read_views.candidate_detail, name='candidate-detail'),
     path('users/', views.user_list, name='user-list'),
     path('users/new/', views.user_create, name='user-create'),
     path('users/<int:pk>/edit/', views.user_update, name='user-update'),
@@ -22,4 +28,7 @@ urlpatterns = [
     path('contests/new/', views.contest_create, name='contest-create'),
     path('contests/<int:pk>/edit/', views.contest_update, name='contest-update'),
     path('contests/<int:pk>/delete/', views.contest_delete, name='contest-delete'),
+    path('contests/<int:pk>/report/', views.contest_report, name='contest-report'),
+    path('api/contest/', api.contest_candidates, name='api-contest'),
+    path('api/contest/live/', api.live_odds, name='api-contest-live'),
 ]
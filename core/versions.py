@@ -0,0 +1,78 @@
+import time
+from functools import partial
+
+from django.core.cache import cache
+from django.db import transaction
+
+
+def get_version(key):
+    """Return a shared version counter from the cache.
+
+    A missing counter (first use or eviction) is seeded with a timestamp so
+    it never goes back to a value that entries cached earlier still carry.
+    """
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, time.time_ns(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def get_version_modified(key):
+    """Return when a version was last bumped, as a Unix timestamp.
+
+    Like the counter, a missing value is seeded with the current time.
+    """
+    modified = cache.get(_modified_key(key))
+    if modified is None:
+        cache.add(_modified_key(key), time.time(), timeout=None)
+        modified = cache.get(_modified_key(key))
+    return modified
+
+
+def _modified_key(key):
+    return f"{key}:modified"
+
+
+def bump_version(key):
+    cache.set(_modified_key(key), time.time(), timeout=None)
+    try:
+        return cache.incr(key)
+    except ValueError:
+        version = time.time_ns()
+        cache.set(key, version, timeout=None)
+        return version
+
+
+def bump_version_on_commit(key):
+    """Bump a version now and again after the current transaction commits.
+
+    The first bump stops readers trusting entries cached before the write,
+    the second drops anything they re-cached from pre-commit data meanwhile.
+    """
+    bump_version(key)
+    transaction.on_commit(partial(bump_version, key))
+
+
+def contest_version_key(contest_id):
+    return f"contest-version:{contest_id}"
+
+
+def get_contest_version(contest_id):
+    return get_version(contest_version_key(contest_id))
+
+
+def bump_contest_version(contest_id):
+    return bump_version_on_commit(contest_version_key(contest_id))
+
+
+def user_bets_version_key(user_id):
+    return f"user-bets-version:{user_id}"
+
+
+def get_user_bets_version(user_id):
+    return get_version(user_bets_version_key(user_id))
+
+
+def bump_user_bets_version(user_id):
+    return bump_version_on_commit(user_bets_version_key(user_id))
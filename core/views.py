@@ -3,15 +3,33 @@ from decimal import Decimal, InvalidOperation
 from django.contrib.auth import authenticate, login, logout, get_user_model, update_session_auth_hash
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.forms import PasswordChangeForm
+from django.core.cache import cache
 from django.core.paginator import Paginator
-from django.db import transaction
-from django.db.models import Sum, Q
+from django.db import OperationalError
+from django.db.models import OuterRef, Subquery
 from django.shortcuts import render, get_object_or_404, redirect
-from django.http import HttpResponseForbidden
+from django.template.loader import render_to_string
+from django.http import Http404, HttpResponseBadRequest, HttpResponseForbidden
 from django.utils import timezone
 
 from .forms import CandidateForm, RegistrationForm, ProfileForm, AdminUserForm, ContestForm
-from .models import Candidate, Bet, Contest
+from .betslip import BET_LIMIT, BettingClosed, parse_slip, place_slip
+from .contests import contest_catalog_version, get_current_contest
+from .db import is_lock_error
+from .exports import EXPORT_CHUNK_SIZE, EXPORT_FORMATS, export_lines, export_response
+from .fragments import FRAGMENT_TIMEOUT, cached_fragment, fragment_key
+from .jobs import enqueue_settlement
+from .models import Candidate, Bet, Contest, SettlementJob
+from .odds import calculate_coefficients, get_coefficient
+from .pagination import cursor_position, keyset_paginate
+from .pools import BettingSuspended, contest_exposures
+from .reports import contest_report_lines
+from .search import search_candidates
+from .stats import get_user_stats
+from .versions import get_user_bets_version
+
+CANDIDATES_PER_PAGE = 12
+
 
 def _serialize_candidate(candidate):
     try:
@@ -23,82 +41,113 @@ def _serialize_candidate(candidate):
         "display_name": f"{candidate.last_name} {candidate.first_name}",
         "info": candidate.info,
         "photo_url": photo_url,
+        "photo_webp_srcset": candidate.photo_webp_srcset if photo_url else "",
+        "photo_jpeg_srcset": candidate.photo_jpeg_srcset if photo_url else "",
     }
 
 
-def _get_current_contest():
-    return Contest.objects.order_by("-ends_at").first()
+def _bet_result(bet):
+    """``(status, payout)`` of a bet with its contest loaded."""
+    contest = bet.contest
+    if contest and contest.winner_id:
+        if bet.candidate_id == contest.winner_id:
+            return "Выигрыш", (bet.amount * bet.coefficient).quantize(Decimal("0.01"))
+        return "Проигрыш", Decimal("0.00")
+    return "Ожидает", None
 
 
-def _apply_payouts(contest):
-    if not contest or not contest.winner_id:
-        return
-    if contest.ends_at > timezone.now():
-        return
-    with transaction.atomic():
-        bets = (
-            Bet.objects.select_for_update()
-            .filter(contest=contest, candidate=contest.winner, paid_out=False)
-            .select_related("user")
-        )
-        if not bets.exists():
-            return
-        for bet in bets:
-            payout = (bet.amount * bet.coefficient).quantize(Decimal("0.01"))
-            bet.user.balance = bet.user.balance + payout
-            bet.user.save(update_fields=["balance"])
-            bet.paid_out = True
-            bet.save(update_fields=["paid_out"])
-
-
-def _calculate_coefficient(candidate, contest):
-    """Calculate a simple dynamic coefficient based on the bet pool."""
-    if not contest:
-        return Decimal("1.10")
-    pool_total = Bet.objects.filter(contest=contest).aggregate(total=Sum("amount")).get("total") or Decimal("0")
-    candidate_total = (
-        candidate.bets.filter(contest=contest).aggregate(total=Sum("amount")).get("total") or Decimal("0")
+def _serialize_bet(bet):
+    status, payout = _bet_result(bet)
+    return {
+        "id": bet.id,
+        "candidate_id": bet.candidate_id,
+        "candidate_name": f"{bet.candidate.last_name} {bet.candidate.first_name}",
+        "amount": bet.amount,
+        "coefficient": bet.coefficient,
+        "created_at": bet.created_at,
+        "status": status,
+        "payout": payout,
+    }
+
+
+def _render_candidate_grid(candidates, page_obj, search_query):
+    # Shared by every user, so rendered without the request and its user-specific context.
+    return render_to_string(
+        "partials/candidate_grid.html",
+        {"candidates": candidates, "page_obj": page_obj, "search_query": search_query},
     )
-    # Smoothing to reduce volatility and avoid huge odds for empty pools.
-    smoothing = Decimal("200")
-    smoothed_coeff = (pool_total + smoothing) / (candidate_total + smoothing)
-    coeff = max(Decimal("1.10"), min(smoothed_coeff, Decimal("10.00")))
-    return coeff.quantize(Decimal("0.01"))
 
 
-def index(request):
-    contest = _get_current_contest()
-    return render(request, "HomePage.html", {"contest": contest})
+def _bet_table_parts(user_id, cursor):
+    # Candidate names and contest winners come from the catalog; stakes from the user's bets.
+    # Keyed on the decoded position so a forged or stale cursor shares the first page's entry.
+    return (user_id, get_user_bets_version(user_id), contest_catalog_version(), cursor_position(cursor))
 
 
-@login_required
-def contest_view(request):
-    contest = _get_current_contest()
-    contest_is_open = bool(contest and contest.ends_at > timezone.now())
-    search_query = (request.GET.get("q") or "").strip()
+def _render_bet_table(bets, page_obj):
+    return render_to_string("partials/bet_table.html", {"bets": bets, "page_obj": page_obj})
+
+
+def _contest_candidates(contest, search_query):
     if contest:
         candidates_qs = contest.participants.all().order_by("id")
     else:
         candidates_qs = Candidate.objects.none()
     if search_query:
-        candidates_qs = candidates_qs.filter(
-            Q(first_name__icontains=search_query)
-            | Q(last_name__icontains=search_query)
-            | Q(patronymic__icontains=search_query)
-            | Q(info__icontains=search_query)
-            | Q(group__icontains=search_query)
-        )
-    paginator = Paginator(candidates_qs, 12)
-    page_number = request.GET.get("page") or 1
-    page_obj = paginator.get_page(page_number)
-    candidates = [_serialize_candidate(c) for c in page_obj.object_list]
+        candidates_qs = search_candidates(candidates_qs, search_query)
+    return candidates_qs
+
+
+def _search_query(value):
+    return " ".join((value or "").split())
+
+
+def _grid_page(contest, search_query, page_number, version):
+    """``(number, count)``: the page ``Paginator.get_page`` serves and how many candidates match.
+
+    The count is cached under the catalog version, so fragment keys use the
+    resolved page instead of whatever ``page`` the request carried.
+    """
+    count = cache.get_or_set(
+        fragment_key("candidate-count", version, search_query),
+        lambda: _contest_candidates(contest, search_query).count(),
+        FRAGMENT_TIMEOUT,
+    )
+    paginator = Paginator(range(count), CANDIDATES_PER_PAGE)
+    return paginator.get_page(page_number).number, count
+
+
+def index(request):
+    contest = get_current_contest().contest
+    return render(request, "HomePage.html", {"contest": contest})
+
+
+@login_required
+def contest_view(request):
+    current = get_current_contest()
+    contest = current.contest
+    contest_is_open = current.is_open
+    search_query = _search_query(request.GET.get("q"))
+    version = contest_catalog_version()
+    page_number, count = _grid_page(contest, search_query, request.GET.get("page"), version)
+
+    def render_grid():
+        candidates_qs = _contest_candidates(contest, search_query)
+        page_obj = Paginator(candidates_qs, CANDIDATES_PER_PAGE).get_page(page_number)
+        candidates = [_serialize_candidate(c) for c in page_obj.object_list]
+        return _render_candidate_grid(candidates, page_obj, search_query)
+
+    if search_query and not count:
+        # Searches that match nothing are not worth an entry each.
+        candidate_grid = render_grid()
+    else:
+        candidate_grid = cached_fragment("candidate-grid", (version, page_number, search_query), render_grid)
     return render(
         request,
         "MainPage.html",
         {
-            "candidates": candidates,
+            "candidate_grid": candidate_grid,
             "search_query": search_query,
-            "page_obj": page_obj,
             "contest": contest,
             "contest_is_open": contest_is_open,
         },
@@ -170,8 +219,7 @@ def profile_view(request):
         .select_related("candidate", "contest")
         .order_by("-created_at")
     )
-    stats = bets_qs.aggregate(total_amount=Sum("amount"))
-    last_bet = bets_qs.first()
+    stats = get_user_stats(user)
     success_profile = None
     success_password = None
 
@@ -209,25 +257,17 @@ def profile_view(request):
 
     bet_results = []
     for bet in bets_qs[:5]:
-        contest = bet.contest
-        status = "Ожидает"
-        payout = None
-        if contest and contest.winner_id:
-            if bet.candidate_id == contest.winner_id:
-                status = "Выигрыш"
-                payout = (bet.amount * bet.coefficient).quantize(Decimal("0.01"))
-            else:
-                status = "Проигрыш"
-                payout = Decimal("0.00")
+        status, payout = _bet_result(bet)
         bet_results.append({"bet": bet, "status": status, "payout": payout})
 
     context = {
         "user_obj": user,
         "bets": bet_results,
-        "bets_count": bets_qs.count(),
-        "total_amount": stats.get("total_amount") or Decimal("0"),
+        "bets_count": stats.bet_count,
+        "total_amount": stats.total_staked,
+        "total_won": stats.total_won,
         "balance": user.balance,
-        "last_bet": last_bet,
+        "last_bet": stats.last_bet,
         "profile_form": profile_form,
         "password_form": password_form,
         "success_profile": success_profile,
@@ -239,35 +279,53 @@ def profile_view(request):
 
 @login_required
 def bet_view(request):
-    bets_qs = Bet.objects.filter(user=request.user).select_related("candidate", "contest").order_by("-created_at")
-    paginator = Paginator(bets_qs, 10)
-    page_number = request.GET.get("page") or 1
-    page_obj = paginator.get_page(page_number)
-    bet_items = []
-    for bet in page_obj.object_list:
-        status = "Ожидает"
-        payout = None
-        contest = bet.contest
-        if contest and contest.winner_id:
-            if bet.candidate_id == contest.winner_id:
-                status = "Выигрыш"
-                payout = (bet.amount * bet.coefficient).quantize(Decimal("0.01"))
-            else:
-                status = "Проигрыш"
-                payout = Decimal("0.00")
-        bet_items.append(
-            {
-                "id": bet.id,
-                "candidate_id": bet.candidate_id,
-                "candidate_name": f"{bet.candidate.last_name} {bet.candidate.first_name}",
-                "amount": bet.amount,
-                "coefficient": bet.coefficient,
-                "created_at": bet.created_at,
-                "status": status,
-                "payout": payout,
-            }
+    cursor = request.GET.get("cursor")
+
+    def render_table():
+        bets_qs = Bet.objects.filter(user=request.user).select_related("candidate", "contest")
+        page_obj = keyset_paginate(bets_qs, cursor, 10)
+        return _render_bet_table([_serialize_bet(bet) for bet in page_obj.object_list], page_obj)
+
+    bet_table = cached_fragment("bet-table", _bet_table_parts(request.user.pk, cursor), render_table)
+    return render(request, "BetPage.html", {"bet_table": bet_table})
+
+
+BET_EXPORT_FIELDS = ["created_at", "candidate", "contest", "amount", "coefficient", "status", "payout"]
+
+
+def _bet_export_rows(bets):
+    for bet in bets:
+        status, payout = _bet_result(bet)
+        yield {
+            "created_at": timezone.localtime(bet.created_at).isoformat(timespec="seconds"),
+            "candidate": f"{bet.candidate.last_name} {bet.candidate.first_name}",
+            "contest": bet.contest.name if bet.contest else "",
+            "amount": bet.amount,
+            "coefficient": bet.coefficient,
+            "status": status,
+            "payout": payout,
+        }
+
+
+@login_required
+def bet_export(request):
+    """Download the user's whole bet history, newest first, as CSV or JSONL."""
+    export_format = request.GET.get("format", "csv")
+    if export_format not in EXPORT_FORMATS:
+        return HttpResponseBadRequest("Формат выгрузки: csv или jsonl.")
+    bets = (
+        Bet.objects.filter(user=request.user)
+        .select_related("candidate", "contest")
+        .only(
+            "created_at", "amount", "coefficient", "candidate__first_name", "candidate__last_name",
+            "contest__name", "contest__winner",
         )
-    return render(request, "BetPage.html", {"bets": bet_items, "page_obj": page_obj})
+        .order_by("-created_at", "-id")
+        .iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    )
+    filename = f"bets-{timezone.localdate():%Y-%m-%d}"
+    lines = export_lines(BET_EXPORT_FIELDS, _bet_export_rows(bets), export_format)
+    return export_response(request, lines, export_format, filename)
 
 
 @login_required
@@ -281,17 +339,17 @@ def candidate_list(request):
 
 @login_required
 def candidate_detail(request, pk):
-    contest = _get_current_contest()
-    if contest:
-        candidate = get_object_or_404(Candidate, pk=pk, contests=contest)
-    else:
-        candidate = get_object_or_404(Candidate, pk=pk)
+    current = get_current_contest()
+    contest = current.contest
+    if contest and pk not in current.participant_ids:
+        raise Http404
+    candidate = get_object_or_404(Candidate, pk=pk)
     error = None
     message = None
     amount_value = ""
-    coefficient = _calculate_coefficient(candidate, contest)
-    bet_limit = Decimal("1000")
-    contest_is_open = bool(contest and contest.ends_at > timezone.now())
+    coefficient = get_coefficient(candidate, contest)
+    bet_limit = BET_LIMIT
+    contest_is_open = current.is_open
 
     if request.method == "POST":
         amount_value = (request.POST.get("amount") or "").strip()
@@ -312,22 +370,21 @@ def candidate_detail(request, pk):
                 elif amount > bet_limit:
                     error = f"Сумма превышает допустимый лимит ({bet_limit} BYN)."
                 else:
-                    with transaction.atomic():
-                        User = get_user_model()
-                        user_locked = User.objects.select_for_update().get(pk=request.user.pk)
-                        if user_locked.balance < amount:
+                    try:
+                        bets = place_slip(request.user.pk, contest, {candidate.pk: amount})
+                    except BettingClosed as exc:
+                        error = str(exc)
+                    except BettingSuspended:
+                        error = "Ставка достигает лимита риска по этой участнице."
+                    except OperationalError as exc:
+                        if not is_lock_error(exc):
+                            raise
+                        error = "Сервис перегружен, попробуйте ещё раз."
+                    else:
+                        if bets is None:
                             error = "Недостаточно средств."
                         else:
-                            coefficient = _calculate_coefficient(candidate, contest)
-                            Bet.objects.create(
-                                user=user_locked,
-                                candidate=candidate,
-                                contest=contest,
-                                amount=amount,
-                                coefficient=coefficient,
-                            )
-                            user_locked.balance = user_locked.balance - amount
-                            user_locked.save(update_fields=["balance"])
+                            coefficient = bets[0].coefficient
                             message = "Ставка принята!"
                             amount_value = ""
 
@@ -347,6 +404,70 @@ def candidate_detail(request, pk):
     )
 
 
+@login_required
+def bet_slip(request):
+    current = get_current_contest()
+    contest = current.contest
+    candidates = list(Candidate.objects.filter(pk__in=current.participant_ids).order_by("last_name", "first_name"))
+    error = None
+    message = None
+    values = {}
+    leg_errors = {}
+
+    if request.method == "POST":
+        values = {candidate.pk: (request.POST.get(f"amount_{candidate.pk}") or "").strip() for candidate in candidates}
+        legs, leg_errors = parse_slip(values)
+        if not contest:
+            error = "Конкурс пока не создан. Ставки недоступны."
+        elif not current.is_open:
+            error = "Приём ставок завершён."
+        elif leg_errors:
+            error = "Исправьте суммы в купоне, ставки не оформлены."
+        elif not legs:
+            error = "Введите сумму хотя бы для одной участницы."
+        else:
+            try:
+                bets = place_slip(request.user.pk, contest, legs)
+            except BettingClosed as exc:
+                error = str(exc)
+            except BettingSuspended as exc:
+                leg_errors = {candidate_id: "Достигнут лимит риска по участнице." for candidate_id in exc.candidate_ids}
+                error = "Купон достигает лимита риска по части участниц, ставки не оформлены."
+            except OperationalError as exc:
+                if not is_lock_error(exc):
+                    raise
+                error = "Сервис перегружен, попробуйте ещё раз."
+            else:
+                if bets is None:
+                    error = "Недостаточно средств для всех ставок купона."
+                else:
+                    message = f"Принято ставок: {len(bets)} на сумму {sum(legs.values())} BYN."
+                    values = {}
+
+    coefficients = calculate_coefficients([candidate.pk for candidate in candidates], contest)
+    rows = [
+        {
+            "candidate": candidate,
+            "coefficient": coefficients[candidate.pk],
+            "value": values.get(candidate.pk, ""),
+            "error": leg_errors.get(candidate.pk),
+        }
+        for candidate in candidates
+    ]
+    return render(
+        request,
+        "BetSlipPage.html",
+        {
+            "rows": rows,
+            "error": error,
+            "message": message,
+            "bet_limit": BET_LIMIT,
+            "contest": contest,
+            "contest_is_open": current.is_open,
+        },
+    )
+
+
 @login_required
 def candidate_create(request):
     if not request.user.is_staff:
@@ -450,10 +571,30 @@ def user_delete(request, pk):
 def contest_list(request):
     if not request.user.is_staff:
         return redirect("home")
-    contests = Contest.objects.order_by("-ends_at")
+    latest_job = SettlementJob.objects.filter(contest=OuterRef("pk")).order_by("-id").values("id")[:1]
+    contests = list(
+        Contest.objects.select_related("winner").annotate(latest_job_id=Subquery(latest_job)).order_by("-ends_at")
+    )
+    jobs = SettlementJob.objects.in_bulk([contest.latest_job_id for contest in contests if contest.latest_job_id])
+    for contest in contests:
+        contest.settlement_job = jobs.get(contest.latest_job_id)
+    contest_exposures(contests)
     return render(request, "contests/list.html", {"contests": contests})
 
 
+@login_required
+def contest_report(request, pk):
+    """Stream every bet of a contest with a per-candidate summary, for staff audits."""
+    if not request.user.is_staff:
+        return redirect("home")
+    contest = get_object_or_404(Contest, pk=pk)
+    export_format = request.GET.get("format", "csv")
+    if export_format not in EXPORT_FORMATS:
+        return HttpResponseBadRequest("Формат выгрузки: csv или jsonl.")
+    lines = contest_report_lines(contest, export_format)
+    return export_response(request, lines, export_format, f"contest-{contest.pk}-report")
+
+
 @login_required
 def contest_create(request):
     if not request.user.is_staff:
@@ -462,7 +603,7 @@ def contest_create(request):
         form = ContestForm(request.POST)
         if form.is_valid():
             contest = form.save()
-            _apply_payouts(contest)
+            enqueue_settlement(contest)
             return redirect("contest-list")
     else:
         form = ContestForm()
@@ -478,7 +619,7 @@ def contest_update(request, pk):
         form = ContestForm(request.POST, instance=contest)
         if form.is_valid():
             contest = form.save()
-            _apply_payouts(contest)
+            enqueue_settlement(contest)
             return redirect("contest-list")
     else:
         form = ContestForm(instance=contest)